@@ -4,9 +4,14 @@ import tempfile
 import base64
 import json
 import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, replace
 from typing import Optional
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
@@ -14,9 +19,12 @@ import soundfile as sf
 import numpy as np
 
 # Import your modules (assumes speech_therapy_ml is the working package)
-from asr import get_asr, VADConfig, VADStreamer  # your asr package
-from scoring.aligner import WhisperXAligner
-from scoring.scorer import Scorer
+from asr import get_asr_pool, default_pool_size, VADConfig, VADSegmenter, ASRBatcher, BatchConfig, ResultCache  # your asr package
+from asr import ASRCascade, CascadeConfig, TrimConfig, trim_silence, AudioBuffer
+from scoring.aligner import WhisperXAligner, WhisperTimestampAligner, FORCED_MIN_CONFIDENCE
+from scoring.align_batching import AlignBatcher, AlignBatchConfig
+from scoring.scorer import Scorer, ScorerConfig
+from scoring.pool import default_workers as default_scorer_workers
 from scoring.feedback import FeedbackGenerator
 from scoring.azure_tts import AzureTTS
 
@@ -33,31 +41,171 @@ app.add_middleware(
 
 # Globals initialized at startup
 ASR = None
+ASR_BATCHER = None
+RESULT_CACHE = None
 ALIGNER = None
+ALIGN_BATCHER = None
+WORD_TIMER = None
+
+# Word timings: "whisperx" (ASR, then wav2vec2 CTC alignment) or "whisper" (faster-whisper
+# word_timestamps in the ASR decode; wav2vec2 is then only loaded if a request asks for it).
+ALIGN_BACKENDS = ("whisperx", "whisper")
+ALIGN_BACKEND = os.getenv("ALIGN_BACKEND", "whisperx")
 SCORER = None
 FEEDBACK_GEN = None
 AZURE_TTS = None
 
+# Per-component warm-up state reported by /ready.
+# state: pending -> loading -> warming -> ready | failed; load_s / warmup_s in seconds
+READINESS = {name: {"state": "pending", "load_s": None, "warmup_s": None, "error": None}
+             for name in ("asr", "aligner", "scorer")}
+
+def _warm_component(name: str, load, warm):
+    """Run load() then warm(obj) for one component, recording state and timings. Returns obj or None."""
+    entry = READINESS[name]
+    try:
+        entry["state"] = "loading"
+        t0 = time.perf_counter()
+        obj = load()
+        entry["load_s"] = round(time.perf_counter() - t0, 3)
+        entry["state"] = "warming"
+        t0 = time.perf_counter()
+        warm(obj)
+        entry["warmup_s"] = round(time.perf_counter() - t0, 3)
+        entry["state"] = "ready"
+        print(f"[api] {name} ready (load {entry['load_s']}s, warm-up {entry['warmup_s']}s)")
+        return obj
+    except Exception as e:
+        entry["state"] = "failed"
+        entry["error"] = f"{type(e).__name__}: {e}"
+        print(f"[api] {name} failed to warm up:", e)
+        return None
+
+def _cpu_split():
+    """(cores for ASR threads, scorer worker processes): SCORER_WORKERS (default half the cores) scoring
+    processes get a core each and the ASR replicas share what is left, so the two pools don't oversubscribe."""
+    cores = os.cpu_count() or 1
+    workers = int(os.getenv("SCORER_WORKERS", str(default_scorer_workers())))
+    return max(1, cores - workers), workers
+
+def _warm_scorer(scorer):
+    # scoring processes, each warmed with one dummy attempt; an attempt running past SCORER_ATTEMPT_TIMEOUT_S
+    # (default 60, 0 disables) fails and its worker is replaced. SCORER_WORKERS=0 scores in the API process on a thread
+    _, workers = _cpu_split()
+    if workers > 0:
+        timeout = float(os.getenv("SCORER_ATTEMPT_TIMEOUT_S", "60"))
+        scorer.start_pool(workers, attempt_timeout_s=timeout if timeout > 0 else None).warm_up()
+        return
+    # one pass through score_utterance pulls in librosa and compiles the pyin/numba paths
+    sr = 16000
+    audio = np.random.default_rng(0).normal(0.0, 0.01, sr).astype(np.float32)
+    aligned = {"segments": [{"words": [{"word": "hello", "start": 0.1, "end": 0.6, "score": 0.9}]}]}
+    scorer.score_utterance("hello", aligned, audio, sr, None, False)
+
+def _new_scorer():
+    # PITCH_BACKEND=pyin|yin|nccf (nccf/yin: much lower real-time factor, far fewer voiced frames; see scoring/pitch.py);
+    # per-user F0 profiles (narrowed pitch search) persist in SPEAKER_PROFILE_PATH when set;
+    # acoustic_score needs the template bank built by `python -m scoring.build_templates` (TEMPLATE_BANK_PATH)
+    return Scorer(azure_tts=AZURE_TTS, sample_rate=16000, cfg=ScorerConfig(
+        pitch_backend=os.getenv("PITCH_BACKEND", "pyin"),
+        speaker_capacity=int(os.getenv("SPEAKER_PROFILE_CAPACITY", "1024")),
+        speaker_store_path=os.getenv("SPEAKER_PROFILE_PATH") or None,
+        template_bank_path=os.getenv("TEMPLATE_BANK_PATH") or None,
+    ))
+
+def _new_aligner():
+    # one align model per language, LRU-bounded by count (ALIGN_MAX_MODELS) and parameter memory (ALIGN_MAX_MEMORY_MB)
+    max_mb = os.getenv("ALIGN_MAX_MEMORY_MB")
+    return WhisperXAligner(device=None,
+                           max_models=int(os.getenv("ALIGN_MAX_MODELS", "2")),
+                           max_memory_mb=float(max_mb) if max_mb else None)
+
+def _warm_aligner(aligner):
+    # ALIGN_PRELOAD_LANGUAGES=en,hi loads every listed language; English also gets a dummy alignment.
+    # With ALIGN_BACKEND=whisper nothing is preloaded unless listed explicitly.
+    default = "en" if ALIGN_BACKEND == "whisperx" else ""
+    languages = [l.strip() for l in os.getenv("ALIGN_PRELOAD_LANGUAGES", default).split(",") if l.strip()]
+    if "en" in languages:
+        aligner.warm_up("en")
+    aligner.preload([l for l in languages if l != "en"])
+
+def _warm_up_models():
+    """Load ASR replicas and the align model concurrently, push a dummy input through every stage,
+    and publish each global only once it is warm (endpoints answer 503 until then)."""
+    global ASR, ASR_BATCHER, ALIGNER, ALIGN_BATCHER, SCORER, WORD_TIMER
+
+    def load_asr():
+        # Load the heavy model once per replica; ASR_POOL_SIZE unset -> sized from the cores the scorer leaves,
+        # and the replicas' CPU threads split those cores between them
+        asr_cores, _ = _cpu_split()
+        pool_size = int(os.getenv("ASR_POOL_SIZE") or default_pool_size(cores=asr_cores))
+        threads = max(1, asr_cores // pool_size)
+        if os.getenv("ASR_CASCADE", "0") == "1":
+            # base/beam-1 first, small/beam-5 only for low-confidence or off-script results
+            return ASRCascade.from_config(CascadeConfig(), pool_size=pool_size, cpu_threads_per_replica=threads)
+        return get_asr_pool(size=pool_size, cpu_threads_per_replica=threads)
+
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        asr_f = ex.submit(_warm_component, "asr", load_asr, lambda pool: pool.warm_up())
+        aligner_f = ex.submit(_warm_component, "aligner", _new_aligner, _warm_aligner)
+        scorer_f = ex.submit(_warm_component, "scorer", _new_scorer, _warm_scorer)
+
+        pool = asr_f.result()
+        if pool is not None:
+            ASR = pool
+            # Concurrent /transcribe and /score requests share decoder calls through the batcher
+            ASR_BATCHER = ASRBatcher(ASR, BatchConfig(
+                max_batch_size=int(os.getenv("ASR_MAX_BATCH_SIZE", "8")),
+                max_wait_ms=float(os.getenv("ASR_MAX_WAIT_MS", "10")),
+                max_concurrent_batches=ASR.size,
+            ))
+            WORD_TIMER = WhisperTimestampAligner(ASR)
+        aligner = aligner_f.result()
+        if aligner is not None:
+            # Concurrent /score requests share wav2vec2 forward passes (one align_batch call per batch)
+            ALIGN_BATCHER = AlignBatcher(aligner, AlignBatchConfig(
+                max_batch_size=int(os.getenv("ALIGN_MAX_BATCH_SIZE", "8")),
+                max_wait_ms=float(os.getenv("ALIGN_MAX_WAIT_MS", "10")),
+            ))
+        ALIGNER = aligner
+        SCORER = scorer_f.result()
+    print("[api] Warm-up complete.")
+
 @app.on_event("startup")
 def startup_event():
-    global ASR, ALIGNER, SCORER, FEEDBACK_GEN, AZURE_TTS
-    print("[api] Warm starting models...")
-    # Load the heavy model once (singleton)
-    ASR = get_asr()  # uses your singleton; this loads faster-whisper
-    ALIGNER = WhisperXAligner(device=None)
+    global RESULT_CACHE, FEEDBACK_GEN, AZURE_TTS
+    # Retries / re-submits of identical audio skip ASR + alignment (RESULT_CACHE_SIZE=0 disables)
+    cache_size = int(os.getenv("RESULT_CACHE_SIZE", "256"))
+    if cache_size > 0:
+        disk_max_rows = int(os.getenv("RESULT_CACHE_MAX_ROWS", "10000"))
+        disk_max_mb = float(os.getenv("RESULT_CACHE_MAX_MB", "256"))
+        RESULT_CACHE = ResultCache(capacity=cache_size, disk_path=os.getenv("RESULT_CACHE_PATH") or None,
+                                   disk_max_rows=disk_max_rows if disk_max_rows > 0 else None,
+                                   disk_max_bytes=int(disk_max_mb * 2**20) if disk_max_mb > 0 else None)
     try:
         AZURE_TTS = AzureTTS()
     except Exception as e:
         print("[api] AzureTTS not configured:", e)
         AZURE_TTS = None
-    SCORER = Scorer(azure_tts=AZURE_TTS, sample_rate=16000)
     try:
         FEEDBACK_GEN = FeedbackGenerator(azure_tts=AZURE_TTS)
     except Exception as e:
         print("[api] FeedbackGenerator not configured (Azure OpenAI may be missing):", e)
         FEEDBACK_GEN = None
+    # Models load in the background so /ready can report progress; route traffic on /ready.
+    # MODEL_WARMUP_BLOCKING=1 keeps the old behaviour of finishing startup only when warm.
+    print("[api] Warm starting models...")
+    if os.getenv("MODEL_WARMUP_BLOCKING", "0") == "1":
+        _warm_up_models()
+    else:
+        threading.Thread(target=_warm_up_models, name="model-warmup", daemon=True).start()
     print("[api] Startup complete.")
 
+@app.on_event("shutdown")
+def shutdown_event():
+    if SCORER is not None:
+        SCORER.close()
+
 # Pydantic model for /feedback POST
 class FeedbackRequest(BaseModel):
     scoring_result: dict
@@ -80,6 +228,83 @@ def _load_audio_for_numpy(path: str):
         data = data[:, 0]
     return data, sr
 
+def _load_audio_buffer(path: str):
+    """Return (buf, sr): the request's single AudioBuffer (float32 mono 16 kHz, read-only) and its rate.
+    Every stage takes it as-is; resampled / int16 variants are cached on the buffer."""
+    data, sr = _load_audio_for_numpy(path)
+    buf = AudioBuffer.from_array(data, sr)
+    return buf, buf.sample_rate
+
+# Uploads longer than Whisper's window are split into VAD utterances and batched
+LONG_UPLOAD_S = 30.0
+LONG_UPLOAD_VAD = VADConfig(max_utterance_s=25.0)
+
+# /score trims leading/trailing silence before ASR, alignment and pitch tracking (TRIM_SILENCE=0 disables);
+# TRIM_MAX_PAUSE_MS also shortens long internal pauses. Reported word times stay in upload time.
+TRIM_SILENCE = os.getenv("TRIM_SILENCE", "1") == "1"
+TRIM_CFG = TrimConfig(max_pause_ms=float(os.environ["TRIM_MAX_PAUSE_MS"]) if os.getenv("TRIM_MAX_PAUSE_MS") else None)
+
+def _audio_key(audio_np: np.ndarray, sr: int, language: str = "en", expected_text: Optional[str] = None) -> Optional[str]:
+    if RESULT_CACHE is None:
+        return None
+    cfg = ASR.cfg
+    if expected_text and getattr(ASR, "uses_expected_text", False):
+        # the cascade's output depends on the prompt it was gated against
+        cfg = {"asr": asdict(cfg), "expected_text": expected_text}
+    return ResultCache.audio_key(audio_np, sr, cfg, language)
+
+async def _transcribe(audio_np: np.ndarray, sr: int, cache_key: Optional[str] = None, expected_text: Optional[str] = None):
+    """ASR (cached by audio key when enabled). Returns (text, segments)."""
+    if cache_key is not None:
+        hit = RESULT_CACHE.get_transcription(cache_key)
+        if hit is not None:
+            return hit
+    text, segments = await _transcribe_uncached(audio_np, sr, expected_text)
+    if cache_key is not None:
+        RESULT_CACHE.put_transcription(cache_key, text, segments)
+    return text, segments
+
+async def _align(asr_segments: list, audio_np: np.ndarray, sr: int, language: str = "en", audio_key: Optional[str] = None) -> dict:
+    """WhisperX alignment (cached by audio key + segments when enabled)."""
+    key = ResultCache.alignment_key(audio_key, asr_segments, language) if audio_key is not None else None
+    if key is not None:
+        hit = RESULT_CACHE.get_alignment(key)
+        if hit is not None:
+            return hit
+    # batched with concurrent requests (and, for long uploads, across this upload's segments)
+    aligned = await ALIGN_BATCHER.align(asr_segments, audio_np, sr, language)
+    if key is not None:
+        RESULT_CACHE.put_alignment(key, aligned)
+    return aligned
+
+async def _transcribe_with_words(audio_np: np.ndarray, sr: int, cache_key: Optional[str] = None, expected_text: Optional[str] = None):
+    """ALIGN_BACKEND=whisper path: one decode with word timestamps. Returns (text, aligned_result)."""
+    if cache_key is not None:
+        hit = RESULT_CACHE.get("asr_words", cache_key)
+        if hit is not None:
+            return hit[0], hit[1]
+    text, _, aligned = await asyncio.to_thread(WORD_TIMER.transcribe_aligned, audio_np, sr, expected_text)
+    if cache_key is not None:
+        RESULT_CACHE.put("asr_words", cache_key, [text, aligned])
+    return text, aligned
+
+async def _transcribe_uncached(audio_np: np.ndarray, sr: int, expected_text: Optional[str] = None):
+    """ASR through the batcher; long uploads go through VADSegmenter first. Returns (text, segments).
+    expected_text only reaches the cascade gate for single-window uploads (it can't be split per utterance)."""
+    if len(audio_np) / float(sr) <= LONG_UPLOAD_S:
+        return await ASR_BATCHER.transcribe(audio_np, sr, expected_text)
+
+    segmenter = VADSegmenter(LONG_UPLOAD_VAD)
+    utts = await asyncio.to_thread(lambda: list(segmenter.segment_array(audio_np, sample_rate=sr)))
+    results = await asyncio.gather(*(ASR_BATCHER.transcribe(u.audio, LONG_UPLOAD_VAD.sample_rate) for u in utts))
+    segments = []
+    for u, (_, segs) in zip(utts, results):
+        # utterance-relative times -> upload times
+        for seg in segs:
+            segments.append({**seg, "start": seg["start"] + u.start_s, "end": seg["end"] + u.start_s})
+    text = " ".join(seg["text"] for seg in segments).strip()
+    return text, segments
+
 # ---- Endpoints ----
 
 @app.post("/transcribe")
@@ -88,14 +313,14 @@ async def transcribe(audio: UploadFile = File(...)):
     Simple transcribe endpoint: returns text and segments.
     Accepts multipart/form-data with key 'audio' (wav file).
     """
-    if ASR is None:
+    if ASR_BATCHER is None:
         raise HTTPException(status_code=503, detail="ASR model not loaded yet")
 
     tmp_path = await _save_upload_to_tempfile(audio)
     try:
-        audio_np, sr = _load_audio_for_numpy(tmp_path)
-        # run blocking ASR in thread
-        text, segments = await asyncio.to_thread(ASR.transcribe_numpy, audio_np, sr)
+        buf, sr = _load_audio_buffer(tmp_path)
+        # ASR runs in a worker thread, batched with concurrent requests
+        text, segments = await _transcribe(buf, sr, _audio_key(buf, sr))
         return {"text": text, "segments": segments}
     finally:
         try:
@@ -103,27 +328,73 @@ async def transcribe(audio: UploadFile = File(...)):
         except Exception:
             pass
 
+async def _score_utterance(expected, aligned, buf, sr, asr_text, time_map, user_id):
+    """Score on the scorer pool's worker processes (scales with cores), or on a thread without a pool."""
+    if SCORER.pool is None:
+        return await asyncio.to_thread(SCORER.score_utterance, expected, aligned, buf, sr, asr_text, False, time_map, user_id)
+    return await asyncio.wrap_future(SCORER.pool.submit(expected, aligned, buf, sr, asr_text, False, time_map, user_id))
+
 @app.post("/score")
-async def score(expected: str = Form(...), audio: UploadFile = File(...)):
+async def score(expected: str = Form(...), audio: UploadFile = File(...), mode: str = Form("asr"),
+                aligner: Optional[str] = Form(None), user_id: Optional[str] = Form(None)):
     """
     Score an audio recording against `expected` sentence.
     Returns the full scoring JSON.
-    Usage: multipart/form-data keys: expected (string), audio (file .wav)
+    Usage: multipart/form-data keys: expected (string), audio (file .wav), mode ("asr" | "forced", optional),
+           aligner ("whisperx" | "whisper", optional; defaults to ALIGN_BACKEND),
+           user_id (optional; narrows pitch tracking to that speaker's F0 profile and updates it)
+    mode="forced" aligns `expected` directly onto the audio and only runs ASR when that looks unreliable.
+    aligner="whisper" takes word timings from the Whisper decode and skips the wav2vec2 pass.
     """
-    if any(x is None for x in (ASR, ALIGNER, SCORER)):
+    if mode not in ("asr", "forced"):
+        raise HTTPException(status_code=422, detail="mode must be 'asr' or 'forced'")
+    backend = aligner or ALIGN_BACKEND
+    if backend not in ALIGN_BACKENDS:
+        raise HTTPException(status_code=422, detail="aligner must be 'whisperx' or 'whisper'")
+    # only the models this request uses: the whisper path scores without the wav2vec2 aligner
+    needed = [ASR_BATCHER, SCORER]
+    if backend == "whisperx":
+        needed += [ALIGNER, ALIGN_BATCHER]
+    else:
+        needed.append(WORD_TIMER)
+    if mode == "forced":
+        needed.append(ALIGNER)
+    if any(x is None for x in needed):
         raise HTTPException(status_code=503, detail="Models not ready")
 
     tmp_path = await _save_upload_to_tempfile(audio)
     try:
-        audio_np, sr = _load_audio_for_numpy(tmp_path)  # float32 in [-1..1]
-        # 1) ASR
-        asr_text, asr_segments = await asyncio.to_thread(ASR.transcribe_numpy, audio_np, sr)
-        # 2) Align
-        aligned = await asyncio.to_thread(ALIGNER.align_segments, asr_segments, audio_np, sr, "en")
+        buf, sr = _load_audio_buffer(tmp_path)  # one float32 16 kHz buffer for every stage
+        time_map, trim_meta = None, None
+        if TRIM_SILENCE:
+            # everything downstream sees the trimmed audio; the scorer maps word times back
+            trim = trim_silence(buf, sr, TRIM_CFG)
+            if trim.trimmed:
+                buf, trim_meta = AudioBuffer.from_array(trim.audio, sr), trim.meta()  # view, no copy
+                # the mapping only needs the kept spans; without the audio it pickles cheaply to a scorer worker
+                time_map = replace(trim, audio=trim.audio[:0]).to_original_s
+        if mode == "forced":
+            # 0) Forced alignment of the expected text (no Whisper decode)
+            aligned, confidence = await asyncio.to_thread(ALIGNER.force_align, expected, buf, sr, "en")
+            if confidence >= FORCED_MIN_CONFIDENCE:
+                result = await _score_utterance(expected, aligned, buf, sr, None, time_map, user_id)
+                result["_meta"] = {"asr_text": None, "mode": "forced", "forced_confidence": round(confidence, 3), "trim": trim_meta}
+                return result
+        audio_key = _audio_key(buf, sr, "en", expected)
+        if backend == "whisper":
+            # 1+2) one decode gives the text and the word timings (cache hit skips it)
+            asr_text, aligned = await _transcribe_with_words(buf, sr, audio_key, expected)
+        else:
+            # 1) ASR (cache hit skips it)
+            asr_text, asr_segments = await _transcribe(buf, sr, audio_key, expected)
+            # 2) Align (cache hit skips it)
+            aligned = await _align(asr_segments, buf, sr, "en", audio_key)
         # 3) Score
-        result = await asyncio.to_thread(SCORER.score_utterance, expected, aligned, audio_np, sr, asr_text, False)
+        result = await _score_utterance(expected, aligned, buf, sr, asr_text, time_map, user_id)
         # include asr_text metadata
-        result["_meta"] = {"asr_text": asr_text}
+        result["_meta"] = {"asr_text": asr_text, "trim": trim_meta, "aligner": backend}
+        if mode == "forced":
+            result["_meta"].update({"mode": "forced_fallback_asr", "forced_confidence": round(confidence, 3)})
         return result
     finally:
         try:
@@ -161,6 +432,39 @@ async def feedback(req: FeedbackRequest):
 
     return {"text": text, "audio_base64": audio_b64}
 
+@app.get("/stats")
+async def stats():
+    """ASR load (per-replica in-flight/queued calls; per-stage escalation rates with ASR_CASCADE=1),
+    ASR / alignment batcher counters, result-cache hit/miss counters, which align models are loaded, and the scorer's speaker F0 profile use,
+    phoneme index hits / G2P guesses and acoustic template use (per worker, with scorer_pool load, when SCORER_WORKERS > 0)."""
+    if ASR is None or ASR_BATCHER is None:
+        raise HTTPException(status_code=503, detail="ASR model not loaded yet")
+    out = {
+        "asr_pool": ASR.stats(),
+        "asr_batcher": ASR_BATCHER.stats,
+        "result_cache": RESULT_CACHE.stats() if RESULT_CACHE is not None else None,
+        "aligner": ALIGNER.stats() if ALIGNER is not None else None,
+        "align_batcher": ALIGN_BATCHER.stats if ALIGN_BATCHER is not None else None,
+    }
+    if SCORER is not None and SCORER.pool is not None:
+        out["scorer_pool"] = SCORER.pool.stats()
+        out["scorer_workers"] = await asyncio.to_thread(SCORER.pool.worker_stats)
+    elif SCORER is not None:
+        out["speaker_profiles"] = SCORER.speakers.stats()
+        out["phonemes"] = SCORER.phonemes.stats()
+        out["templates"] = SCORER.templates.stats() if SCORER.templates is not None else None
+    return out
+
+@app.get("/ready")
+async def ready():
+    """
+    Readiness probe: 200 once ASR, aligner and scorer are loaded and warmed, 503 before that.
+    Body: {"ready": bool, "components": {name: {"state", "load_s", "warmup_s", "error"}}}
+    """
+    components = {name: dict(entry) for name, entry in READINESS.items()}
+    is_ready = all(c["state"] == "ready" for c in components.values())
+    return JSONResponse(status_code=200 if is_ready else 503, content={"ready": is_ready, "components": components})
+
 @app.get("/")
 async def root():
     return {"status": "ok", "note": "SpeechTherapy ML API"}
\ No newline at end of file
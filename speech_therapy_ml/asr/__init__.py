@@ -1,2 +1,11 @@
-from .asr import get_asr, ASRModel, VADStreamer, VADConfig
-__all__ = ["get_asr", "ASRModel", "VADStreamer", "VADConfig"]
\ No newline at end of file
+from .asr import get_asr, ASRModel, VADStreamer, VADConfig, VADSegmenter, Utterance, PartialHypothesis, PartialTranscriber
+from .batching import ASRBatcher, BatchConfig
+from .pool import ASRPool, get_asr_pool, default_pool_size
+from .cache import ResultCache
+from .cascade import ASRCascade, CascadeConfig
+from .trim import TrimConfig, TrimResult, trim_silence
+from .audio import AudioBuffer
+__all__ = ["get_asr", "ASRModel", "VADStreamer", "VADConfig", "VADSegmenter", "Utterance", "PartialHypothesis", "PartialTranscriber",
+           "ASRBatcher", "BatchConfig",
+           "ASRPool", "get_asr_pool", "default_pool_size", "ResultCache",
+           "ASRCascade", "CascadeConfig", "TrimConfig", "TrimResult", "trim_silence", "AudioBuffer"]
\ No newline at end of file
@@ -4,10 +4,18 @@ speech_therapy_ml/asr/asr.py
 ASRModel:
   - Singleton wrapper for faster-whisper
   - .transcribe_numpy(np.int16 or float32, sr) -> (text, segments)
+  - .transcribe_batch([np.int16 or float32, ...], sr) -> [(text, segments), ...]
+  - *_scored variants also return decoder confidence {avg_logprob, no_speech_prob} (see asr/cascade.py)
+
+VADSegmenter:
+  - WebRTC VAD utterance segmentation over arrays, files or async byte streams
+  - Yields Utterance(audio int16, start_s, end_s)
 
 VADStreamer:
-  - WebRTC VAD-based in-memory utterance segmentation
+  - WebRTC VAD-based in-memory utterance segmentation (microphone front-end for VADSegmenter)
   - Calls a callback with np.int16 audio for each utterance
+  - Optionally streams PartialHypothesis updates (committed + tentative text) while speech continues,
+    decoded on a background thread; on_utterance then also gets the final hypothesis
 """
 
 from __future__ import annotations
@@ -17,17 +25,19 @@ warnings.filterwarnings("ignore", category=UserWarning, module="ctranslate2")  #
 import os
 import sys
 import queue
+import threading
 import time
+import zlib
 from dataclasses import dataclass
 from collections import deque
-from typing import Callable, Optional, List, Dict, Tuple
+from typing import AsyncIterator, Callable, Iterable, Iterator, Optional, List, Dict, Tuple
 
 import numpy as np
-import sounddevice as sd
-import webrtcvad
 
-# Prefer faster-whisper
-from faster_whisper import WhisperModel
+from .audio import AudioBuffer
+
+# Heavy / device-bound deps (faster_whisper, webrtcvad, sounddevice) are imported at point of use,
+# so `import asr` stays cheap on headless servers and in CLI tools.
 
 # ---------- Utilities ----------
 
@@ -39,12 +49,15 @@ def _cuda_available() -> bool:
         return False
 
 def _to_float32_mono(audio: np.ndarray) -> np.ndarray:
-    """Convert int16/float32 mono to float32 in [-1, 1]."""
+    """Convert int16/float32 mono to float32 in [-1, 1]. float32 input and AudioBuffers are not copied."""
+    audio = np.asarray(audio)
     if audio.ndim > 1:
         audio = audio[:, 0]
     if audio.dtype == np.int16:
-        return (audio.astype(np.float32) / 32768.0).clip(-1.0, 1.0)
-    return audio.astype(np.float32)
+        x = audio.astype(np.float32)
+        x /= 32768.0  # int16 / 32768 is already within [-1, 1)
+        return x
+    return audio.astype(np.float32, copy=False)
 
 def _rms_db(audio_float32: np.ndarray, eps: float = 1e-9) -> float:
     """Root-mean-square in dBFS."""
@@ -55,6 +68,36 @@ def _rms_db(audio_float32: np.ndarray, eps: float = 1e-9) -> float:
 
 # ---------- ASR Model (singleton) ----------
 
+# faster-whisper's transcribe() defaults; transcribe_batch applies the same rules to decide when a
+# batched decode is redone by transcribe_numpy (which has the temperature fallback)
+COMPRESSION_RATIO_THRESHOLD = 2.4
+LOG_PROB_THRESHOLD = -1.0
+NO_SPEECH_THRESHOLD = 0.6
+TIME_PRECISION_S = 0.02  # one Whisper timestamp token step
+
+def _compression_ratio(text: str) -> float:
+    b = text.encode("utf-8")
+    return len(b) / len(zlib.compress(b)) if b else 0.0
+
+def _split_timestamped(tokenizer, tokens: List[int], duration: float) -> List[Dict]:
+    """Segments from a decode with timestamp tokens: text between a start and an end timestamp."""
+    ts_begin = tokenizer.timestamp_begin
+    segs: List[Dict] = []
+    text_tokens: List[int] = []
+    start = 0.0
+    for t in tokens:
+        if t < ts_begin:
+            text_tokens.append(t)
+            continue
+        ts = min(duration, (t - ts_begin) * TIME_PRECISION_S)
+        if text_tokens:  # closes a segment
+            segs.append({"start": start, "end": max(start, ts), "text": tokenizer.decode(text_tokens).strip()})
+            text_tokens = []
+        start = ts
+    if text_tokens:  # no closing timestamp: runs to the end of the audio
+        segs.append({"start": start, "end": duration, "text": tokenizer.decode(text_tokens).strip()})
+    return [seg for seg in segs if seg["text"]]
+
 @dataclass
 class ASRConfig:
     model_size: str = "small"          # tiny/base/small/medium
@@ -64,6 +107,8 @@ class ASRConfig:
     compute_type_cuda: str = "int8_float16"  # good perf on consumer GPUs
     beam_size: int = 5
     vad_filter: bool = False           # we do VAD ourselves
+    cpu_threads: int = 0               # intra-op threads per model (0 -> CTranslate2 default / OMP_NUM_THREADS)
+    num_workers: int = 1               # concurrent generate() calls a single model can run
 
 class ASRModel:
     """Faster-Whisper wrapper with a clean return contract."""
@@ -72,13 +117,21 @@ class ASRModel:
         compute_type = cfg.compute_type_cuda if d == "cuda" else cfg.compute_type_cpu
         print(f"[ASR] Loading faster-whisper '{cfg.model_size}' on {d} (compute_type={compute_type}) ...")
         self.cfg = cfg
-        self.model = WhisperModel(cfg.model_size, device=d, compute_type=compute_type)
+        from faster_whisper import WhisperModel  # Prefer faster-whisper
+        self.model = WhisperModel(cfg.model_size, device=d, compute_type=compute_type,
+                                  cpu_threads=cfg.cpu_threads, num_workers=cfg.num_workers)
 
-    def transcribe_numpy(self, audio: np.ndarray, sample_rate: int) -> Tuple[str, List[Dict]]:
+    def transcribe_numpy(self, audio: np.ndarray, sample_rate: int, word_timestamps: bool = False) -> Tuple[str, List[Dict]]:
         """
         Transcribe in-memory audio.
         Returns (text, segments[{start, end, text}])
+        With word_timestamps=True each segment also carries words[{word, start, end, probability}].
         """
+        text, segs, _ = self.transcribe_numpy_scored(audio, sample_rate, word_timestamps=word_timestamps)
+        return text, segs
+
+    def transcribe_numpy_scored(self, audio: np.ndarray, sample_rate: int, word_timestamps: bool = False) -> Tuple[str, List[Dict], Dict]:
+        """transcribe_numpy plus decoder confidence: duration-weighted avg_logprob and max no_speech_prob over segments."""
         x = _to_float32_mono(audio)
         # faster-whisper accepts NumPy arrays as input in recent versions; if your local version misbehaves,
         # replace this with a small WAV write-and-read fallback.
@@ -87,10 +140,88 @@ class ASRModel:
             beam_size=self.cfg.beam_size,
             language=self.cfg.language,
             vad_filter=self.cfg.vad_filter,
+            word_timestamps=word_timestamps,
         )
-        segs = [{"start": float(s.start), "end": float(s.end), "text": s.text.strip()} for s in segments]
+        segs, logprobs, weights, no_speech = [], [], [], 0.0
+        for s in segments:
+            seg = {"start": float(s.start), "end": float(s.end), "text": s.text.strip()}
+            if word_timestamps:
+                seg["words"] = [{"word": w.word.strip(), "start": float(w.start), "end": float(w.end),
+                                 "probability": float(w.probability)} for w in (s.words or [])]
+            segs.append(seg)
+            logprobs.append(float(s.avg_logprob))
+            weights.append(max(1e-3, float(s.end) - float(s.start)))
+            no_speech = max(no_speech, float(s.no_speech_prob))
         text = " ".join(s["text"] for s in segs).strip()
-        return text, segs
+        conf = {"avg_logprob": float(np.average(logprobs, weights=weights)) if logprobs else None,
+                "no_speech_prob": no_speech if segs else 1.0}
+        return text, segs, conf
+
+    def transcribe_batch(self, audios: List[np.ndarray], sample_rate: int) -> List[Tuple[str, List[Dict]]]:
+        """
+        Transcribe several independent utterances with a single encoder + decoder call.
+        Returns one (text, segments) pair per input, in input order; segments come from the decoded
+        timestamp tokens, as in transcribe_numpy. Utterances longer than Whisper's 30 s window, a
+        batch of one, and decodes that trip the compression-ratio / avg-logprob thresholds go through
+        transcribe_numpy instead (temperature fallback), so results match the unbatched path.
+        """
+        return [(text, segs) for text, segs, _ in self.transcribe_batch_scored(audios, sample_rate)]
+
+    def transcribe_batch_scored(self, audios: List[np.ndarray], sample_rate: int) -> List[Tuple[str, List[Dict], Dict]]:
+        """transcribe_batch plus per-item decoder confidence {avg_logprob, no_speech_prob}."""
+        from faster_whisper.audio import pad_or_trim
+        from faster_whisper.tokenizer import Tokenizer
+        from faster_whisper.transcribe import get_suppressed_tokens
+
+        results: List[Optional[Tuple[str, List[Dict], Dict]]] = [None] * len(audios)
+        xs = [_to_float32_mono(a) for a in audios]
+        window = self.model.feature_extractor.n_samples  # 30 s of samples
+        batch_idx = []
+        for i, x in enumerate(xs):
+            if x.size == 0:
+                results[i] = ("", [], {"avg_logprob": None, "no_speech_prob": 1.0})
+            elif x.size > window:
+                results[i] = self.transcribe_numpy_scored(x, sample_rate)
+            else:
+                batch_idx.append(i)
+        if len(batch_idx) <= 1:  # nothing to share a decoder call with
+            for i in batch_idx:
+                results[i] = self.transcribe_numpy_scored(xs[i], sample_rate)
+            return results
+
+        # same feature pipeline as faster-whisper's batched mode: log-mel, drop last frame, pad to 3000
+        features = np.stack([pad_or_trim(self.model.feature_extractor(xs[i])[..., :-1]) for i in batch_idx])
+        tokenizer = Tokenizer(self.model.hf_tokenizer, self.model.model.is_multilingual,
+                              task="transcribe", language=self.cfg.language)
+        prompt = self.model.get_prompt(tokenizer, previous_tokens=[], without_timestamps=False)
+        encoder_output = self.model.encode(features)
+        outputs = self.model.model.generate(
+            encoder_output,
+            [list(prompt) for _ in batch_idx],
+            beam_size=self.cfg.beam_size,
+            max_length=self.model.max_length,
+            suppress_blank=True,
+            suppress_tokens=list(get_suppressed_tokens(tokenizer, [-1])),
+            return_scores=True,
+            return_no_speech_prob=True,
+        )
+        for i, out in zip(batch_idx, outputs):
+            tokens = out.sequences_ids[0]
+            # CTranslate2 scores are length-normalised (length_penalty=1); recover faster-whisper's avg_logprob
+            avg_logprob = float(out.scores[0] * len(tokens) / (len(tokens) + 1))
+            no_speech = float(out.no_speech_prob)
+            conf = {"avg_logprob": avg_logprob, "no_speech_prob": no_speech}
+            if no_speech > NO_SPEECH_THRESHOLD and avg_logprob < LOG_PROB_THRESHOLD:
+                results[i] = ("", [], conf)  # silence: transcribe_numpy skips this window too
+                continue
+            text_tokens = [t for t in tokens if t < tokenizer.timestamp_begin]
+            if (_compression_ratio(tokenizer.decode(text_tokens).strip()) > COMPRESSION_RATIO_THRESHOLD
+                    or avg_logprob < LOG_PROB_THRESHOLD):
+                results[i] = self.transcribe_numpy_scored(xs[i], sample_rate)
+                continue
+            segs = _split_timestamped(tokenizer, tokens, xs[i].size / float(sample_rate))
+            results[i] = (" ".join(seg["text"] for seg in segs).strip(), segs, conf)
+        return results
 
 # Singleton accessor
 __ASR_SINGLETON: Optional[ASRModel] = None
@@ -100,6 +231,148 @@ def get_asr() -> ASRModel:
         __ASR_SINGLETON = ASRModel()
     return __ASR_SINGLETON
 
+# ---------- Streaming partial hypotheses ----------
+
+@dataclass
+class PartialHypothesis:
+    committed: str           # stable prefix; never revised once emitted
+    tentative: str           # latest unconfirmed tail; may change on the next pass
+    is_final: bool = False   # True once the utterance has ended
+
+    @property
+    def text(self) -> str:
+        return f"{self.committed} {self.tentative}".strip()
+
+def _norm_word(w: str) -> str:
+    return "".join(c for c in w.lower() if c.isalnum())
+
+class PartialTranscriber:
+    """
+    Re-decodes a growing utterance buffer and commits words once two consecutive passes agree
+    (local agreement). Each pass only decodes audio after the last committed word, so the final
+    decode at end-of-utterance covers just the uncommitted tail.
+    """
+    def __init__(self, asr, sample_rate: int = 16000):
+        self.asr = asr
+        self.sample_rate = sample_rate
+        self.reset()
+
+    def reset(self):
+        self._committed: List[str] = []
+        self._committed_until_s = 0.0
+        self._previous: List[Dict] = []
+
+    def _decode_tail(self, audio: np.ndarray) -> List[Dict]:
+        start = int(self._committed_until_s * self.sample_rate)
+        tail = audio[start:]
+        if tail.size == 0:
+            return []
+        _, segs = self.asr.transcribe_numpy(tail, self.sample_rate, word_timestamps=True)
+        words = []
+        for seg in segs:
+            for w in seg.get("words", []):
+                if _norm_word(w["word"]):
+                    words.append({"word": w["word"], "end": w["end"] + self._committed_until_s})
+        return words
+
+    def update(self, audio: np.ndarray) -> PartialHypothesis:
+        """Decode the uncommitted part of `audio` (the whole utterance so far) and return the new hypothesis."""
+        words = self._decode_tail(audio)
+        agreed = 0
+        for prev, cur in zip(self._previous, words):
+            if _norm_word(prev["word"]) != _norm_word(cur["word"]):
+                break
+            agreed += 1
+        if agreed:
+            self._committed.extend(w["word"] for w in words[:agreed])
+            self._committed_until_s = words[agreed - 1]["end"]
+        self._previous = words[agreed:]
+        return PartialHypothesis(" ".join(self._committed), " ".join(w["word"] for w in self._previous))
+
+    def finalize(self, audio: np.ndarray) -> PartialHypothesis:
+        """Decode the uncommitted tail of the finished utterance and reset for the next one."""
+        tail = [w["word"] for w in self._decode_tail(audio)]
+        hyp = PartialHypothesis(" ".join(self._committed + tail), "", is_final=True)
+        self.reset()
+        return hyp
+
+class _PartialWorker:
+    """
+    Runs a PartialTranscriber on its own thread so the VAD frame loop never waits for a decode.
+    Only the newest partial request is kept: one that arrives while a decode runs replaces the
+    waiting one (the older buffer is stale by then). Utterance ends and resets are never dropped and
+    run in order; an utterance end discards the partial still waiting for that utterance.
+    """
+    def __init__(self, partials: PartialTranscriber, on_partial: Callable[[PartialHypothesis], None],
+                 on_utterance: Callable[[np.ndarray, PartialHypothesis], None]):
+        self.partials = partials
+        self.on_partial = on_partial
+        self.on_utterance = on_utterance
+        self.dropped = 0
+        self._cond = threading.Condition()
+        self._pending: Optional[np.ndarray] = None
+        self._jobs: deque = deque()  # ("final", audio) / ("reset", None)
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="vad-partials", daemon=True)
+        self._thread.start()
+
+    def update(self, audio: np.ndarray):
+        """Request a partial decode of the utterance so far (audio is copied; the caller's buffer moves on)."""
+        with self._cond:
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = np.array(audio)
+            self._cond.notify()
+
+    def finalize(self, audio: np.ndarray):
+        with self._cond:
+            self._drop_pending()
+            self._jobs.append(("final", audio))
+            self._cond.notify()
+
+    def reset(self):
+        with self._cond:
+            self._drop_pending()
+            self._jobs.append(("reset", None))
+            self._cond.notify()
+
+    def _drop_pending(self):
+        if self._pending is not None:
+            self.dropped += 1
+            self._pending = None
+
+    def close(self):
+        """Finish queued utterance ends (waiting partials are dropped) and stop the thread."""
+        with self._cond:
+            self._drop_pending()
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._jobs and self._pending is None and not self._closed:
+                    self._cond.wait()
+                if self._jobs:
+                    kind, audio = self._jobs.popleft()
+                elif self._pending is not None:
+                    kind, audio = "partial", self._pending
+                    self._pending = None
+                else:
+                    return
+            try:
+                if kind == "partial":
+                    self.on_partial(self.partials.update(audio))
+                elif kind == "final":
+                    hyp = self.partials.finalize(audio)
+                    self.on_partial(hyp)
+                    self.on_utterance(audio, hyp)
+                else:
+                    self.partials.reset()
+            except Exception as e:  # a failed decode / callback must not end the stream
+                print(f"[ASR] partial {kind} failed: {e!r}", file=sys.stderr)
+
 # ---------- VAD Streamer (in-memory) ----------
 
 @dataclass
@@ -113,18 +386,53 @@ class VADConfig:
     min_utterance_ms: int = 300              # drop micro-blips < 300ms
     min_rms_db: float = -45.0                # drop ultra-low energy
     normalize_peak: bool = False             # simple peak normalization
+    partial_stride_ms: int = 600             # re-decode cadence while speaking (when on_partial is set)
 
-class VADStreamer:
+@dataclass
+class Utterance:
+    audio: np.ndarray      # int16 mono at VADConfig.sample_rate
+    start_s: float         # position of the first sample in the source stream
+    end_s: float           # position just after the last sample
+
+class VADSegmenter:
     """
-    Produces utterance-level numpy int16 audio via WebRTC VAD.
-    Call .start(on_utterance=callback). Ctrl+C to stop.
+    Source-agnostic WebRTC VAD utterance segmentation.
+    Feed int16 frames of cfg.frame_ms with .push(frame) (returns an Utterance when one closes) and call
+    .flush() at end of stream, or use .segment_array / .segment_file / .segment_bytes.
+    VAD runs once per frame; the pre-roll ring keeps each frame's speech flag and a running voiced
+    count, and utterance audio is written into a preallocated int16 arena so that finalizing is a
+    slice rather than a concatenate.
     """
-    def __init__(self, cfg: VADConfig = VADConfig(), input_device: Optional[int | str] = None):
+    def __init__(self, cfg: VADConfig = VADConfig()):
         assert cfg.frame_ms in (10, 20, 30), "frame_ms must be 10/20/30 for WebRTC VAD"
         self.cfg = cfg
-        self.input_device = input_device
-        self.vad = webrtcvad.Vad(cfg.aggressiveness)
-        self._stop = False
+        self.frame_len = int(cfg.sample_rate * cfg.frame_ms / 1000)  # samples per frame (mono)
+        self._end_silence_frames = int(cfg.end_silence_ms / cfg.frame_ms)
+        self._max_frames = int(cfg.max_utterance_s * 1000 / cfg.frame_ms)
+        self._min_frames = max(1, int(cfg.min_utterance_ms / cfg.frame_ms))
+        self._ring = deque(maxlen=int(cfg.pre_roll_ms / cfg.frame_ms))  # (frame, is_speech)
+        self._arena_frames = max(self._max_frames, self._ring.maxlen, 1)
+        self.reset()
+
+    def reset(self):
+        import webrtcvad
+        self.vad = webrtcvad.Vad(self.cfg.aggressiveness)  # WebRTC VAD keeps internal state
+        self._ring.clear()
+        self._ring_voiced = 0
+        self._arena = np.empty(self._arena_frames * self.frame_len, dtype=np.int16)
+        self._n_frames = 0
+        self._frames_seen = 0
+        self._silence_count = 0
+        self.triggered = False
+
+    @property
+    def n_frames(self) -> int:
+        """Frames buffered for the utterance in progress (0 when not triggered)."""
+        return self._n_frames
+
+    def in_progress(self) -> np.ndarray:
+        """View of the utterance audio buffered so far (valid until the next push)."""
+        return self._arena[:self._n_frames * self.frame_len]
 
     def _normalize(self, audio: np.ndarray) -> np.ndarray:
         if not self.cfg.normalize_peak or audio.size == 0:
@@ -137,18 +445,149 @@ class VADStreamer:
         out = np.clip(audio.astype(np.float32) * gain, -32768, 32767).astype(np.int16)
         return out
 
-    def start(self, on_utterance: Callable[[np.ndarray], None]):
+    def _close(self) -> Optional[Utterance]:
+        # the returned slice owns this arena; start a fresh one
+        n = self._n_frames
+        utt = self._arena[:n * self.frame_len]
+        self._arena = np.empty(self._arena_frames * self.frame_len, dtype=np.int16)
+        start_frame = self._frames_seen - n
+        self.triggered = False
+        self._n_frames = 0
+        self._silence_count = 0
+
+        utt = self._normalize(utt)
+        # basic gating
+        if n < self._min_frames or _rms_db(_to_float32_mono(utt)) < self.cfg.min_rms_db:
+            return None
+        frame_s = self.cfg.frame_ms / 1000.0
+        return Utterance(audio=utt, start_s=round(start_frame * frame_s, 3), end_s=round(self._frames_seen * frame_s, 3))
+
+    def push(self, frame: np.ndarray) -> Optional[Utterance]:
+        """Consume one int16 frame; returns the finished Utterance if this frame closed one (and it passed gating)."""
+        is_speech = self.vad.is_speech(frame.tobytes(), self.cfg.sample_rate)
+        self._frames_seen += 1
+        fl = self.frame_len
+
+        if not self.triggered:
+            ring = self._ring
+            if len(ring) == ring.maxlen and ring:
+                self._ring_voiced -= ring[0][1]
+            ring.append((frame, is_speech))
+            self._ring_voiced += is_speech
+            # trigger when >60% of ring frames are voiced
+            if ring.maxlen and len(ring) == ring.maxlen and self._ring_voiced > 0.6 * len(ring):
+                self.triggered = True
+                for k, (f, _) in enumerate(ring):
+                    self._arena[k * fl:(k + 1) * fl] = f
+                self._n_frames = len(ring)
+                self._silence_count = 0
+                ring.clear()
+                self._ring_voiced = 0
+            return None
+
+        self._arena[self._n_frames * fl:(self._n_frames + 1) * fl] = frame
+        self._n_frames += 1
+        if is_speech:
+            self._silence_count = 0
+        else:
+            self._silence_count += 1
+        if self._silence_count > self._end_silence_frames or self._n_frames >= self._max_frames:
+            return self._close()
+        return None
+
+    def flush(self) -> Optional[Utterance]:
+        """End of stream: close the utterance in progress (if any)."""
+        if not self.triggered:
+            return None
+        return self._close()
+
+    # ----- sources -----
+
+    def _as_int16(self, audio: np.ndarray, sample_rate: Optional[int]) -> np.ndarray:
+        if isinstance(audio, AudioBuffer) and audio.sample_rate == self.cfg.sample_rate:
+            return audio.int16  # cached on the buffer
+        a = np.asarray(audio)
+        if a.ndim > 1:
+            a = a[:, 0]
+        if sample_rate is not None and sample_rate != self.cfg.sample_rate:
+            import librosa
+            a = librosa.resample(_to_float32_mono(a), orig_sr=sample_rate, target_sr=self.cfg.sample_rate)
+        if a.dtype != np.int16:
+            a = (np.clip(a.astype(np.float32), -1.0, 1.0) * 32767.0).astype(np.int16)
+        return a
+
+    def segment_array(self, audio: np.ndarray, sample_rate: Optional[int] = None) -> Iterator[Utterance]:
+        """Yield utterances from an in-memory int16 or float [-1, 1] signal (resampled if sample_rate differs).
+        Each source call starts from a fresh state; one segmenter serves one stream at a time."""
+        self.reset()
+        a = self._as_int16(audio, sample_rate)
+        fl = self.frame_len
+        for i in range(len(a) // fl):  # trailing partial frame is dropped, as with the microphone
+            utt = self.push(a[i * fl:(i + 1) * fl])
+            if utt is not None:
+                yield utt
+        utt = self.flush()
+        if utt is not None:
+            yield utt
+
+    def segment_file(self, path: str) -> Iterator[Utterance]:
+        """Yield utterances from an audio file readable by soundfile."""
+        import soundfile as sf
+        data, sr = sf.read(path, dtype="int16", always_2d=False)
+        yield from self.segment_array(data, sample_rate=sr)
+
+    async def segment_bytes(self, chunks: AsyncIterator[bytes]) -> AsyncIterator[Utterance]:
+        """Yield utterances from raw little-endian int16 PCM at cfg.sample_rate arriving in arbitrary-size chunks."""
+        self.reset()
+        frame_bytes = self.frame_len * 2
+        pending = b""
+        async for chunk in chunks:
+            pending += chunk
+            n = len(pending) // frame_bytes
+            for k in range(n):
+                frame = np.frombuffer(pending, dtype="<i2", count=self.frame_len, offset=k * frame_bytes)
+                utt = self.push(frame.astype(np.int16))
+                if utt is not None:
+                    yield utt
+            pending = pending[n * frame_bytes:]
+        utt = self.flush()
+        if utt is not None:
+            yield utt
+
+class VADStreamer:
+    """
+    Produces utterance-level numpy int16 audio via WebRTC VAD.
+    Call .start(on_utterance=callback). Ctrl+C to stop.
+    Pass on_partial=callback to also receive PartialHypothesis updates while the user is speaking.
+    Partial decodes then run on a background thread (the frame loop never waits for one), and
+    on_utterance is called there as on_utterance(audio, final_hypothesis): the utterance is already
+    transcribed and does not need another decode.
+    """
+    def __init__(self, cfg: VADConfig = VADConfig(), input_device: Optional[int | str] = None, asr=None):
+        self.segmenter = VADSegmenter(cfg)
+        self.cfg = cfg
+        self.input_device = input_device
+        self.asr = asr  # used for partials; defaults to get_asr() when on_partial is given
+        self._stop = False
+
+    @property
+    def vad(self):
+        """The segmenter's webrtcvad.Vad (kept for callers of the pre-VADSegmenter attribute)."""
+        return self.segmenter.vad
+
+    def start(self, on_utterance: Callable[..., None],
+              on_partial: Optional[Callable[[PartialHypothesis], None]] = None):
+        try:
+            import sounddevice as sd
+        except Exception as e:
+            raise ImportError("VADStreamer needs 'sounddevice' (and a PortAudio input device). "
+                              "Use VADSegmenter for arrays/files/byte streams. Error: " + str(e))
         print("[ASR] VAD streaming started. Press Ctrl+C to stop.")
+        # a previous session may have stopped mid-utterance; don't carry its trigger state / pre-roll over
+        self.segmenter.reset()
+        self._stop = False
         sr = self.cfg.sample_rate
-        frame_len = int(sr * self.cfg.frame_ms / 1000)  # samples per frame (mono)
-        end_silence_frames = int(self.cfg.end_silence_ms / self.cfg.frame_ms)
-        max_frames = int(self.cfg.max_utterance_s * 1000 / self.cfg.frame_ms)
-        min_frames = max(1, int(self.cfg.min_utterance_ms / self.cfg.frame_ms))
-
-        ring = deque(maxlen=int(self.cfg.pre_roll_ms / self.cfg.frame_ms))
-        triggered = False
-        voiced_frames: List[np.ndarray] = []
-        silence_count = 0
+        frame_len = self.segmenter.frame_len
 
         q: "queue.Queue[np.ndarray]" = queue.Queue()
 
@@ -157,6 +596,13 @@ class VADStreamer:
                 print("[InputStream]:", status, file=sys.stderr)
             q.put(indata.copy())
 
+        def mic_frames():
+            while not self._stop:
+                frame = q.get()
+                if frame is None:
+                    continue
+                yield frame.squeeze().astype(np.int16)
+
         with sd.InputStream(
             samplerate=sr,
             blocksize=frame_len,
@@ -166,46 +612,45 @@ class VADStreamer:
             device=self.input_device,
         ):
             try:
-                while not self._stop:
-                    frame = q.get()
-                    if frame is None:
-                        continue
-                    frame = frame.squeeze().astype(np.int16)
-                    is_speech = self.vad.is_speech(frame.tobytes(), sr)
-
-                    if not triggered:
-                        ring.append(frame)
-                        # trigger when >60% of ring frames are voiced
-                        if len(ring) == ring.maxlen:
-                            voiced = sum(1 for f in ring if self.vad.is_speech(f.tobytes(), sr))
-                            if voiced > 0.6 * len(ring):
-                                triggered = True
-                                voiced_frames = list(ring)
-                                silence_count = 0
-                                ring.clear()
-                    else:
-                        voiced_frames.append(frame)
-                        if is_speech:
-                            silence_count = 0
-                        else:
-                            silence_count += 1
-
-                        if silence_count > end_silence_frames or len(voiced_frames) >= max_frames:
-                            # finalize utterance
-                            utt = np.concatenate(voiced_frames, axis=0).astype(np.int16)
-                            utt = self._normalize(utt)
-                            # basic gating
-                            f32 = _to_float32_mono(utt)
-                            if len(voiced_frames) >= min_frames and _rms_db(f32) >= self.cfg.min_rms_db:
-                                on_utterance(utt)
-                            # reset
-                            triggered = False
-                            voiced_frames = []
-                            silence_count = 0
+                self._segment(mic_frames(), on_utterance, on_partial)
             except KeyboardInterrupt:
                 print("[ASR] VAD streaming stopped by user.")
             finally:
                 self._stop = True
 
+    def _segment(self, frames: Iterable[np.ndarray], on_utterance: Callable[..., None],
+                 on_partial: Optional[Callable[[PartialHypothesis], None]] = None):
+        """Drive the segmenter over int16 frames, requesting partial decodes while an utterance is open."""
+        seg = self.segmenter
+        stride_frames = max(1, int(self.cfg.partial_stride_ms / self.cfg.frame_ms))
+        worker = None
+        if on_partial is not None:
+            worker = _PartialWorker(PartialTranscriber(self.asr or get_asr(), sample_rate=self.cfg.sample_rate),
+                                    on_partial, on_utterance)
+        next_partial_at = stride_frames
+        was_triggered = False
+
+        try:
+            for frame in frames:
+                utt = seg.push(frame)
+                if utt is not None:
+                    if worker is not None:
+                        worker.finalize(utt.audio)  # decodes the tail, then on_utterance(audio, hyp)
+                    else:
+                        on_utterance(utt.audio)
+                elif seg.triggered:
+                    if not was_triggered:
+                        next_partial_at = seg.n_frames + stride_frames
+                    elif worker is not None and seg.n_frames >= next_partial_at:
+                        # still speaking: re-decode the uncommitted part of the buffer (off this thread)
+                        worker.update(seg.in_progress())
+                        next_partial_at = seg.n_frames + stride_frames
+                elif was_triggered and worker is not None:
+                    worker.reset()  # utterance closed but dropped by gating
+                was_triggered = seg.triggered
+        finally:
+            if worker is not None:
+                worker.close()
+
     def stop(self):
         self._stop = True
\ No newline at end of file
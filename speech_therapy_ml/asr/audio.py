@@ -0,0 +1,112 @@
+"""
+speech_therapy_ml/asr/audio.py
+
+AudioBuffer:
+  - One normalized waveform per request: float32, mono, 16 kHz, read-only
+  - Passes zero-copy through ASR, alignment and scoring (np.asarray(buf) is the samples)
+  - Caches derived representations: .at_rate(sr) resampled variants, .int16 (for WebRTC VAD)
+
+Usage:
+  buf = AudioBuffer.from_array(audio_np, sr)       # the only conversion / resample
+  text, segments = asr.transcribe_numpy(buf, buf.sample_rate)
+  aligned = aligner.align_segments(segments, buf, buf.sample_rate)
+  result = scorer.score_utterance(expected, aligned, buf, buf.sample_rate)
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Optional
+
+import numpy as np
+
+TARGET_SR = 16000
+
+
+def _readonly(a: np.ndarray) -> np.ndarray:
+    v = a.view()
+    v.flags.writeable = False
+    return v
+
+
+class AudioBuffer:
+    """Read-only float32 mono samples at `sample_rate`, plus lazily cached variants."""
+    __slots__ = ("samples", "sample_rate", "_variants", "_int16")
+
+    def __init__(self, samples: np.ndarray, sample_rate: int = TARGET_SR):
+        # callers go through from_array; this just adopts an already-normalized array
+        self.samples = _readonly(samples)
+        self.sample_rate = sample_rate
+        self._variants: Dict[int, np.ndarray] = {sample_rate: self.samples}
+        self._int16: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_array(cls, audio, sample_rate: int, target_sr: int = TARGET_SR) -> "AudioBuffer":
+        """Normalize int16/float, mono/multi-channel audio at any rate. Float32 mono input already at
+        target_sr (and other AudioBuffers) is adopted without copying."""
+        if isinstance(audio, AudioBuffer):
+            if audio.sample_rate == target_sr:
+                return audio
+            return cls(audio.at_rate(target_sr), target_sr)
+        a = np.asarray(audio)
+        if a.ndim > 1:
+            a = a[:, 0]
+        if a.dtype == np.int16:
+            a = a.astype(np.float32)
+            a *= 1.0 / 32768.0
+        else:
+            a = a.astype(np.float32, copy=False)
+        if sample_rate != target_sr:
+            import librosa
+            a = librosa.resample(a, orig_sr=sample_rate, target_sr=target_sr).astype(np.float32, copy=False)
+        return cls(a, target_sr)
+
+    def at_rate(self, sample_rate: int) -> np.ndarray:
+        """Samples resampled to `sample_rate` (computed once, then cached)."""
+        v = self._variants.get(sample_rate)
+        if v is None:
+            import librosa
+            v = _readonly(librosa.resample(self.samples, orig_sr=self.sample_rate, target_sr=sample_rate).astype(np.float32, copy=False))
+            self._variants[sample_rate] = v
+        return v
+
+    @property
+    def int16(self) -> np.ndarray:
+        """Samples as int16 PCM (computed once, then cached)."""
+        if self._int16 is None:
+            self._int16 = _readonly((np.clip(self.samples, -1.0, 1.0) * 32767.0).astype(np.int16))
+        return self._int16
+
+    def slice(self, start: int, end: int) -> "AudioBuffer":
+        """Zero-copy sub-range [start, end) in samples (cached variants are not carried over)."""
+        return AudioBuffer(self.samples[start:end], self.sample_rate)
+
+    @property
+    def duration_s(self) -> float:
+        return len(self.samples) / float(self.sample_rate)
+
+    # ndarray interop: np.asarray(buf), len(buf), buf.ndim / dtype / shape
+    def __array__(self, dtype=None, copy=None):
+        if dtype is not None and np.dtype(dtype) != self.samples.dtype:
+            return self.samples.astype(dtype)
+        if copy:
+            return self.samples.copy()
+        return self.samples
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    @property
+    def ndim(self) -> int:
+        return 1
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.samples.dtype
+
+    @property
+    def shape(self) -> tuple:
+        return self.samples.shape
+
+    @property
+    def size(self) -> int:
+        return self.samples.size
@@ -0,0 +1,119 @@
+"""
+speech_therapy_ml/asr/batching.py
+
+ASRBatcher:
+  - Async micro-batching front-end for anything with .transcribe_batch(audios, sr)
+  - Collects concurrent requests for up to max_wait_ms (or max_batch_size items)
+  - Runs each batch through one decoder call in a worker thread and resolves every caller
+  - With an ASRPool backend, up to max_concurrent_batches batches decode in parallel
+  - With an ASRCascade backend, each request's expected_text is passed through to the gate
+
+Usage (inside a running event loop):
+  batcher = ASRBatcher(get_asr(), BatchConfig(max_batch_size=8, max_wait_ms=10))
+  text, segments = await batcher.transcribe(audio_np, 16000)
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass
+class BatchConfig:
+    max_batch_size: int = 8        # upper bound on utterances per decoder call
+    max_wait_ms: float = 10.0      # how long the first request waits for company
+    max_concurrent_batches: int = 1  # batches in flight at once (set to ASRPool size)
+
+
+class ASRBatcher:
+    """Queues transcription requests and flushes them as batches."""
+    def __init__(self, asr, cfg: BatchConfig = BatchConfig()):
+        assert cfg.max_batch_size >= 1, "max_batch_size must be >= 1"
+        self.asr = asr
+        self.cfg = cfg
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._running: set = set()  # strong refs to in-flight batch tasks
+        self.stats: Dict[str, int] = {"requests": 0, "batches": 0, "largest_batch": 0}
+
+    def start(self):
+        """Start the collector task on the running loop (called lazily by transcribe)."""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(max(1, self.cfg.max_concurrent_batches))
+            self._worker = asyncio.get_running_loop().create_task(self._collect())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def transcribe(self, audio: np.ndarray, sample_rate: int, expected_text: Optional[str] = None) -> Tuple[str, List[Dict]]:
+        """Same contract as ASRModel.transcribe_numpy, but shares decoder calls with concurrent callers.
+        expected_text is only used by backends that gate on it (ASRCascade)."""
+        self.start()
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((audio, sample_rate, fut, expected_text))
+        return await fut
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        max_wait_s = self.cfg.max_wait_ms / 1000.0
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + max_wait_s
+            while len(batch) < self.cfg.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # wait for a free slot, then keep collecting the next batch while this one decodes
+            await self._slots.acquire()
+            task = loop.create_task(self._run_batch(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _run_batch(self, batch: list):
+        try:
+            await self._decode(batch)
+        finally:
+            self._slots.release()
+
+    async def _decode(self, batch: list):
+        # callers that went away (client disconnect) don't need a decode
+        batch = [item for item in batch if not item[2].done()]
+        # faster-whisper expects one sample rate per call; group just in case
+        by_sr: Dict[int, list] = {}
+        for item in batch:
+            by_sr.setdefault(item[1], []).append(item)
+
+        for sr, items in by_sr.items():
+            self.stats["requests"] += len(items)
+            self.stats["batches"] += 1
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(items))
+            audios = [item[0] for item in items]
+            try:
+                if getattr(self.asr, "uses_expected_text", False):
+                    results = await asyncio.to_thread(self.asr.transcribe_batch, audios, sr, [item[3] for item in items])
+                else:
+                    results = await asyncio.to_thread(self.asr.transcribe_batch, audios, sr)
+            except Exception as e:
+                for _, _, fut, _ in items:
+                    if not fut.done():
+                        fut.set_exception(e)
+                continue
+            for (_, _, fut, _), res in zip(items, results):
+                if not fut.done():
+                    fut.set_result(res)
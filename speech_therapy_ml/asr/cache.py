@@ -0,0 +1,194 @@
+"""
+speech_therapy_ml/asr/cache.py
+
+ResultCache:
+  - Content-addressed cache for transcription (text, segments) and alignment results
+  - Keys: hash of the PCM samples + sample rate + ASRConfig + language
+  - Bounded in-memory LRU, optional SQLite file tier that survives restarts
+  - The file tier is bounded too (disk_max_rows / disk_max_bytes): past either limit the least recently
+    used rows are deleted down to 90% of it (freed pages are reused; the file does not shrink)
+  - .stats() -> hit/miss counters
+
+Usage:
+  cache = ResultCache(capacity=256, disk_path="models/results.sqlite3", disk_max_bytes=256 * 2**20)
+  key = ResultCache.audio_key(audio_np, sr, asr.cfg, "en")
+  hit = cache.get_transcription(key)
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+DISK_LOW_WATER = 0.9  # eviction trims the file tier to this fraction of its limits, not to just under them
+
+
+def _json_default(o):
+    # whisperx results can carry numpy scalars
+    if isinstance(o, np.generic):
+        return o.item()
+    if isinstance(o, np.ndarray):
+        return o.tolist()
+    if hasattr(o, "to_json"):  # scoring.gop.CTCEmissions in aligned results
+        return o.to_json()
+    raise TypeError(f"not JSON serializable: {type(o).__name__}")
+
+
+class ResultCache:
+    def __init__(self, capacity: int = 256, disk_path: Optional[str] = None,
+                 disk_max_rows: Optional[int] = 10000, disk_max_bytes: Optional[int] = 256 * 2**20):
+        """disk_max_rows / disk_max_bytes: limits of the SQLite tier (None = unbounded); bytes count stored JSON."""
+        self.capacity = max(1, capacity)
+        self.disk_max_rows = disk_max_rows
+        self.disk_max_bytes = disk_max_bytes
+        self._mem: "OrderedDict[Tuple[str, str], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._touched: Dict[Tuple[str, str], float] = {}  # memory hits whose disk row's `accessed` is stale
+        self._disk_rows = 0
+        self._disk_bytes = 0
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS results (kind TEXT, key TEXT, value TEXT, PRIMARY KEY (kind, key))")
+            cols = {row[1] for row in self._db.execute("PRAGMA table_info(results)")}
+            if "accessed" not in cols:  # files written before the tier was bounded
+                self._db.execute("ALTER TABLE results ADD COLUMN size INTEGER")
+                self._db.execute("ALTER TABLE results ADD COLUMN accessed REAL")
+                self._db.execute("UPDATE results SET size = length(value), accessed = 0")
+            self._db.execute("CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)")
+            self._db.commit()
+            self._disk_rows, self._disk_bytes = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        self._counters = {"hits": 0, "disk_hits": 0, "misses": 0, "puts": 0, "disk_evictions": 0}
+
+    # ----- keys -----
+
+    @staticmethod
+    def audio_key(audio: np.ndarray, sample_rate: int, asr_cfg: Any = None, language: str = "en") -> str:
+        """Hash of the raw samples (dtype + bytes) plus everything that changes the ASR output."""
+        a = np.ascontiguousarray(audio)
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f"{a.dtype.str}|{a.shape}|{sample_rate}|{language}|".encode())
+        if asr_cfg is not None:
+            cfg = asdict(asr_cfg) if is_dataclass(asr_cfg) else asr_cfg
+            h.update(json.dumps(cfg, sort_keys=True, default=str).encode())
+        h.update(a.reshape(-1).view(np.uint8))  # hash the buffer in place (same digest as tobytes())
+        return h.hexdigest()
+
+    @staticmethod
+    def alignment_key(audio_key: str, segments: List[Dict], language: str = "en") -> str:
+        """Alignment depends on the audio and on the segments being aligned."""
+        h = hashlib.blake2b(digest_size=20)
+        h.update(f"{audio_key}|{language}|".encode())
+        h.update(json.dumps(segments, sort_keys=True, default=_json_default).encode())
+        return h.hexdigest()
+
+    # ----- generic get/put -----
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        with self._lock:
+            value = self._mem.get((kind, key))
+            if value is not None:
+                self._mem.move_to_end((kind, key))
+                self._counters["hits"] += 1
+                if self._db is not None:
+                    self._touched[(kind, key)] = time.time()  # written with the next put, not per hit
+                return copy.deepcopy(value)
+            if self._db is not None:
+                row = self._db.execute("SELECT value FROM results WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+                if row is not None:
+                    value = json.loads(row[0])
+                    self._remember(kind, key, value)
+                    self._counters["disk_hits"] += 1
+                    self._touched[(kind, key)] = time.time()
+                    return copy.deepcopy(value)
+            self._counters["misses"] += 1
+            return None
+
+    def put(self, kind: str, key: str, value: Any):
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._remember(kind, key, value)
+            self._counters["puts"] += 1
+            if self._db is not None:
+                self._put_disk(kind, key, json.dumps(value, default=_json_default))
+
+    def _put_disk(self, kind: str, key: str, text: str):
+        """Caller holds the lock."""
+        db = self._db
+        if self._touched:
+            db.executemany("UPDATE results SET accessed = ? WHERE kind = ? AND key = ?",
+                           [(t, k, key_) for (k, key_), t in self._touched.items()])
+            self._touched.clear()
+        old = db.execute("SELECT size FROM results WHERE kind = ? AND key = ?", (kind, key)).fetchone()
+        if old is not None:
+            self._disk_rows -= 1
+            self._disk_bytes -= old[0] or 0
+        size = len(text.encode())
+        db.execute("INSERT OR REPLACE INTO results (kind, key, value, size, accessed) VALUES (?, ?, ?, ?, ?)",
+                   (kind, key, text, size, time.time()))
+        self._disk_rows += 1
+        self._disk_bytes += size
+        if ((self.disk_max_rows is not None and self._disk_rows > self.disk_max_rows)
+                or (self.disk_max_bytes is not None and self._disk_bytes > self.disk_max_bytes)):
+            self._evict_disk()
+        db.commit()
+
+    def _evict_disk(self):
+        """Delete least recently used rows until both counts are at DISK_LOW_WATER of their limits."""
+        max_rows = int(self.disk_max_rows * DISK_LOW_WATER) if self.disk_max_rows is not None else None
+        max_bytes = int(self.disk_max_bytes * DISK_LOW_WATER) if self.disk_max_bytes is not None else None
+        victims = []
+        rows, nbytes = self._disk_rows, self._disk_bytes
+        for rowid, size in self._db.execute("SELECT rowid, size FROM results ORDER BY accessed"):
+            if (max_rows is None or rows <= max_rows) and (max_bytes is None or nbytes <= max_bytes):
+                break
+            victims.append((rowid,))
+            rows -= 1
+            nbytes -= size or 0
+        self._db.executemany("DELETE FROM results WHERE rowid = ?", victims)
+        self._disk_rows, self._disk_bytes = rows, nbytes
+        self._counters["disk_evictions"] += len(victims)
+
+    def _remember(self, kind: str, key: str, value: Any):
+        self._mem[(kind, key)] = value
+        self._mem.move_to_end((kind, key))
+        while len(self._mem) > self.capacity:
+            self._mem.popitem(last=False)
+
+    # ----- typed helpers -----
+
+    def get_transcription(self, key: str) -> Optional[Tuple[str, List[Dict]]]:
+        hit = self.get("asr", key)
+        return (hit[0], hit[1]) if hit is not None else None
+
+    def put_transcription(self, key: str, text: str, segments: List[Dict]):
+        self.put("asr", key, [text, segments])
+
+    def get_alignment(self, key: str) -> Optional[Dict]:
+        return self.get("align", key)
+
+    def put_alignment(self, key: str, aligned: Dict):
+        self.put("align", key, aligned)
+
+    def stats(self) -> Dict:
+        with self._lock:
+            out = dict(self._counters)
+            out["entries"] = len(self._mem)
+            out["capacity"] = self.capacity
+            out["disk"] = self._db is not None
+            if self._db is not None:
+                out["disk_rows"] = self._disk_rows
+                out["disk_bytes"] = self._disk_bytes
+        lookups = out["hits"] + out["disk_hits"] + out["misses"]
+        out["hit_rate"] = round((out["hits"] + out["disk_hits"]) / lookups, 3) if lookups else 0.0
+        return out
@@ -0,0 +1,141 @@
+"""
+speech_therapy_ml/asr/cascade.py
+
+ASRCascade:
+  - Decodes with a cheap model first (base, beam 1) and re-decodes with the next stage
+    (small, beam 5) only when the cheap result looks weak
+  - Gate: avg_logprob, no_speech_prob and, when the caller knows it, word agreement with expected_text
+  - Same contract as ASRModel / ASRPool (.transcribe_numpy / .transcribe_batch), plus expected text
+  - .stats() reports how often each stage escalated
+
+Usage:
+  cascade = ASRCascade.from_config(CascadeConfig(), pool_size=1)
+  text, segments = cascade.transcribe_numpy(audio_np, 16000, expected_text="ship sheep")
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .asr import ASRConfig, _norm_word
+from .pool import ASRPool
+
+
+def _default_stages() -> Tuple[ASRConfig, ...]:
+    return (ASRConfig(model_size="base", beam_size=1), ASRConfig())
+
+
+@dataclass
+class CascadeConfig:
+    stages: Tuple[ASRConfig, ...] = field(default_factory=_default_stages)  # cheapest first
+    min_avg_logprob: float = -0.6          # escalate below this
+    max_no_speech_prob: float = 0.5        # escalate above this (model unsure there was speech)
+    min_expected_agreement: float = 0.75   # escalate below this word-level match ratio vs expected_text
+
+
+def expected_agreement(text: str, expected_text: str) -> float:
+    """Word-level similarity (0..1) between a hypothesis and the expected sentence, ignoring case/punctuation."""
+    hyp = [w for w in (_norm_word(t) for t in text.split()) if w]
+    ref = [w for w in (_norm_word(t) for t in expected_text.split()) if w]
+    if not ref:
+        return 1.0
+    return SequenceMatcher(None, ref, hyp, autojunk=False).ratio()
+
+
+class ASRCascade:
+    """Runs each utterance through `stages` backends in order, stopping at the first confident result."""
+    uses_expected_text = True  # ASRBatcher forwards expected_texts to transcribe_batch
+
+    def __init__(self, backends: List, cfg: CascadeConfig = CascadeConfig()):
+        assert backends, "ASRCascade needs at least one stage"
+        self.backends = backends
+        self.cfg = cfg
+        self._lock = threading.Lock()
+        # per stage: utterances decoded there, and how many of those went on to the next stage
+        self._decoded = [0] * len(backends)
+        self._escalated = [0] * len(backends)
+
+    @classmethod
+    def from_config(cls, cfg: CascadeConfig = CascadeConfig(), pool_size: int = 1,
+                    cpu_threads_per_replica: Optional[int] = None) -> "ASRCascade":
+        """One ASRPool of `pool_size` replicas per stage."""
+        return cls([ASRPool(pool_size, stage_cfg, cpu_threads_per_replica) for stage_cfg in cfg.stages], cfg)
+
+    @property
+    def size(self) -> int:
+        # the first stage takes all the traffic; size the batcher on it
+        return getattr(self.backends[0], "size", 1)
+
+    def _weak(self, text: str, conf: Dict, expected_text: Optional[str]) -> bool:
+        if conf.get("no_speech_prob", 1.0) > self.cfg.max_no_speech_prob:
+            return True
+        if not text or conf.get("avg_logprob") is None or conf["avg_logprob"] < self.cfg.min_avg_logprob:
+            return True
+        if expected_text and expected_agreement(text, expected_text) < self.cfg.min_expected_agreement:
+            return True
+        return False
+
+    def _count(self, stage: int, decoded: int, escalated: int):
+        with self._lock:
+            self._decoded[stage] += decoded
+            self._escalated[stage] += escalated
+
+    def transcribe_numpy(self, audio: np.ndarray, sample_rate: int, word_timestamps: bool = False,
+                         expected_text: Optional[str] = None) -> Tuple[str, List[Dict]]:
+        last = len(self.backends) - 1
+        for stage, backend in enumerate(self.backends):
+            text, segs, conf = backend.transcribe_numpy_scored(audio, sample_rate, word_timestamps=word_timestamps)
+            escalate = stage < last and self._weak(text, conf, expected_text)
+            self._count(stage, 1, int(escalate))
+            if not escalate:
+                return text, segs
+
+    def transcribe_batch(self, audios: List[np.ndarray], sample_rate: int,
+                         expected_texts: Optional[List[Optional[str]]] = None) -> List[Tuple[str, List[Dict]]]:
+        """Each stage decodes only the items the previous stage was unsure about, as one batch."""
+        expected_texts = expected_texts or [None] * len(audios)
+        results: List[Optional[Tuple[str, List[Dict]]]] = [None] * len(audios)
+        pending = list(range(len(audios)))
+        last = len(self.backends) - 1
+        for stage, backend in enumerate(self.backends):
+            if not pending:
+                break
+            scored = backend.transcribe_batch_scored([audios[i] for i in pending], sample_rate)
+            weak = []
+            for i, (text, segs, conf) in zip(pending, scored):
+                results[i] = (text, segs)
+                if stage < last and self._weak(text, conf, expected_texts[i]):
+                    weak.append(i)
+            self._count(stage, len(pending), len(weak))
+            pending = weak
+        return results
+
+    def warm_up(self, seconds: float = 1.0, sample_rate: int = 16000):
+        for backend in self.backends:
+            if hasattr(backend, "warm_up"):
+                backend.warm_up(seconds, sample_rate)
+
+    def stats(self) -> Dict:
+        """Per-stage model, decode count and escalation rate, plus each stage's pool load."""
+        with self._lock:
+            decoded = list(self._decoded)
+            escalated = list(self._escalated)
+        stages = []
+        for stage, backend in enumerate(self.backends):
+            stage_cfg = self.cfg.stages[stage] if stage < len(self.cfg.stages) else None
+            entry = {
+                "model_size": stage_cfg.model_size if stage_cfg else None,
+                "beam_size": stage_cfg.beam_size if stage_cfg else None,
+                "decoded": decoded[stage],
+                "escalated": escalated[stage],
+                "escalation_rate": round(escalated[stage] / decoded[stage], 3) if decoded[stage] else 0.0,
+            }
+            if hasattr(backend, "stats"):
+                entry["pool"] = backend.stats()
+            stages.append(entry)
+        return {"stages": stages}
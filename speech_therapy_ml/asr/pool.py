@@ -0,0 +1,121 @@
+"""
+speech_therapy_ml/asr/pool.py
+
+ASRPool:
+  - N independent ASRModel replicas (each its own CTranslate2 model + thread budget)
+  - Same contract as ASRModel: .transcribe_numpy / .transcribe_batch
+  - Least-loaded dispatch; .stats() reports in-flight and queued work per replica
+  - .warm_up() runs one dummy decode through every replica before real traffic
+
+CTranslate2 releases the GIL while decoding, so replicas driven from Python threads
+(asyncio.to_thread, ASRBatcher) run truly in parallel on separate cores.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import replace
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .asr import ASRConfig, ASRModel, _cuda_available
+
+
+def default_pool_size(cpu_threads_per_replica: int = 2, cores: Optional[int] = None) -> int:
+    """Replica count that fills `cores` (default: all of the machine's) at `cpu_threads_per_replica` each (1 on GPU)."""
+    if _cuda_available():
+        return 1
+    cores = cores or os.cpu_count() or 1
+    return max(1, cores // max(1, cpu_threads_per_replica))
+
+
+class ASRPool:
+    """Holds `size` ASRModel replicas and routes each call to the least-loaded one."""
+    def __init__(self, size: int = 1, cfg: ASRConfig = ASRConfig(), cpu_threads_per_replica: Optional[int] = None):
+        assert size >= 1, "ASRPool size must be >= 1"
+        if cpu_threads_per_replica is None:
+            cpu_threads_per_replica = cfg.cpu_threads or max(1, (os.cpu_count() or 1) // size)
+        self.cfg = replace(cfg, cpu_threads=cpu_threads_per_replica)
+        print(f"[ASR] Building pool of {size} replica(s), {cpu_threads_per_replica} CPU thread(s) each ...")
+        # model loads are mostly file I/O and native init; overlap them
+        with ThreadPoolExecutor(max_workers=size) as ex:
+            self.replicas: List[ASRModel] = list(ex.map(lambda _: ASRModel(self.cfg), range(size)))
+        self._lock = threading.Lock()
+        self._in_flight = [0] * size
+        self._completed = [0] * size
+
+    @classmethod
+    def from_cores(cls, cfg: ASRConfig = ASRConfig(), cpu_threads_per_replica: int = 2,
+                   cores: Optional[int] = None) -> "ASRPool":
+        """Size the pool from `cores` (default os.cpu_count())."""
+        return cls(default_pool_size(cpu_threads_per_replica, cores), cfg, cpu_threads_per_replica)
+
+    @property
+    def size(self) -> int:
+        return len(self.replicas)
+
+    @contextmanager
+    def _lease(self):
+        with self._lock:
+            idx = min(range(len(self.replicas)), key=lambda i: self._in_flight[i])
+            self._in_flight[idx] += 1
+        try:
+            yield self.replicas[idx]
+        finally:
+            with self._lock:
+                self._in_flight[idx] -= 1
+                self._completed[idx] += 1
+
+    def transcribe_numpy(self, audio: np.ndarray, sample_rate: int, word_timestamps: bool = False) -> Tuple[str, List[Dict]]:
+        with self._lease() as model:
+            return model.transcribe_numpy(audio, sample_rate, word_timestamps=word_timestamps)
+
+    def transcribe_batch(self, audios: List[np.ndarray], sample_rate: int) -> List[Tuple[str, List[Dict]]]:
+        with self._lease() as model:
+            return model.transcribe_batch(audios, sample_rate)
+
+    def transcribe_numpy_scored(self, audio: np.ndarray, sample_rate: int, word_timestamps: bool = False) -> Tuple[str, List[Dict], Dict]:
+        with self._lease() as model:
+            return model.transcribe_numpy_scored(audio, sample_rate, word_timestamps=word_timestamps)
+
+    def transcribe_batch_scored(self, audios: List[np.ndarray], sample_rate: int) -> List[Tuple[str, List[Dict], Dict]]:
+        with self._lease() as model:
+            return model.transcribe_batch_scored(audios, sample_rate)
+
+    def warm_up(self, seconds: float = 1.0, sample_rate: int = 16000):
+        """Decode a short low-level noise clip on every replica (in parallel) so the first request
+        doesn't pay for CTranslate2 buffer allocation and mel-filter setup."""
+        audio = np.random.default_rng(0).normal(0.0, 0.01, int(seconds * sample_rate)).astype(np.float32)
+        with ThreadPoolExecutor(max_workers=self.size) as ex:
+            list(ex.map(lambda m: m.transcribe_batch([audio], sample_rate), self.replicas))
+
+    def stats(self) -> Dict:
+        """Snapshot of load: calls running or waiting per replica, and total queued behind busy replicas."""
+        with self._lock:
+            in_flight = list(self._in_flight)
+            completed = list(self._completed)
+        return {
+            "replicas": len(in_flight),
+            "cpu_threads_per_replica": self.cfg.cpu_threads,
+            "in_flight": in_flight,
+            "queue_depth": sum(max(0, n - self.cfg.num_workers) for n in in_flight),
+            "completed": completed,
+        }
+
+
+# Singleton accessor (mirrors asr.get_asr)
+__ASR_POOL_SINGLETON: Optional[ASRPool] = None
+def get_asr_pool(size: Optional[int] = None, cfg: ASRConfig = ASRConfig(),
+                 cpu_threads_per_replica: Optional[int] = None) -> ASRPool:
+    """Process-wide pool; `size=None` sizes it from the number of cores on first call."""
+    global __ASR_POOL_SINGLETON
+    if __ASR_POOL_SINGLETON is None:
+        if size is None:
+            __ASR_POOL_SINGLETON = ASRPool.from_cores(cfg, cpu_threads_per_replica or 2)
+        else:
+            __ASR_POOL_SINGLETON = ASRPool(size, cfg, cpu_threads_per_replica)
+    return __ASR_POOL_SINGLETON
@@ -4,6 +4,7 @@ CLI smoke tests for the hardened ASR foundation.
 Examples:
   python asr/record_example.py --mode batch --duration 4
   python asr/record_example.py --mode vad
+  python asr/record_example.py --mode vad --partials
   python asr/record_example.py --list-devices
   python asr/record_example.py --mode vad --input-device 1
   python asr/record_example.py --mode batch --duration 3 --out test.wav
@@ -44,10 +45,12 @@ def record_batch(duration_s: int = 4, sample_rate: int = 16000, out_file: str =
         print("SEGMENTS:", segs)
 
 
-def stream_vad(input_device=None):
+def stream_vad(input_device=None, partials: bool = False):
     asr = get_asr()
 
-    def on_utt(audio_int16: np.ndarray):
+    def on_utt(audio_int16: np.ndarray, hyp=None):
+        if hyp is not None:
+            return  # final text already printed by on_partial
         text, segs = asr.transcribe_numpy(audio_int16, sample_rate=16000)
         if not text.strip():
             return
@@ -55,6 +58,13 @@ def stream_vad(input_device=None):
         print("-> text:", text)
         print("-> segments:", segs)
 
+    def on_partial(hyp):
+        if hyp.is_final:
+            print("\n[UTTERANCE]")
+            print("-> text:", hyp.committed)
+        else:
+            print(f"\r[PARTIAL] {hyp.committed} | {hyp.tentative}", end="", flush=True)
+
     cfg = VADConfig(
         sample_rate=16000,
         frame_ms=30,
@@ -66,7 +76,8 @@ def stream_vad(input_device=None):
         min_rms_db=-45.0,
         normalize_peak=False,
     )
-    VADStreamer(cfg, input_device=input_device).start(on_utterance=on_utt)
+    VADStreamer(cfg, input_device=input_device, asr=asr).start(on_utterance=on_utt,
+                                                             on_partial=on_partial if partials else None)
 
 
 if __name__ == "__main__":
@@ -76,6 +87,7 @@ if __name__ == "__main__":
     parser.add_argument("--list-devices", action="store_true")
     parser.add_argument("--input-device", type=str, default=None, help="Device index or name")
     parser.add_argument("--out", type=str, default=None, help="Optional path to save .wav file")
+    parser.add_argument("--partials", action="store_true", help="Print partial transcripts while speaking (vad mode)")
     args = parser.parse_args()
 
     if args.list_devices:
@@ -85,4 +97,4 @@ if __name__ == "__main__":
     if args.mode == "batch":
         record_batch(duration_s=args.duration, out_file=args.out)
     else:
-        stream_vad(input_device=args.input_device)
+        stream_vad(input_device=args.input_device, partials=args.partials)
@@ -0,0 +1,125 @@
+"""
+speech_therapy_ml/asr/trim.py
+
+trim_silence:
+  - Frame-energy (RMS dBFS) leading/trailing silence trimming, fully vectorized
+  - Optionally shortens internal pauses longer than max_pause_ms
+  - Returns TrimResult: trimmed audio + the kept spans, so times measured on the trimmed
+    audio map back to the original recording (.to_original_s)
+
+Usage:
+  trim = trim_silence(audio_np, 16000)
+  ... ASR / align / score on trim.audio ...
+  result = scorer.score_utterance(expected, aligned, trim.audio, 16000, time_map=trim.to_original_s)
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+
+@dataclass
+class TrimConfig:
+    frame_ms: float = 20.0
+    relative_db: float = -35.0       # frames this far below the loudest frame count as silence
+    floor_db: float = -60.0          # ... and so do frames below this absolute level
+    pad_ms: float = 200.0            # silence kept around the speech (onsets / releases are quiet)
+    max_pause_ms: Optional[float] = None  # collapse longer internal pauses to this (at least 2 * pad_ms)
+
+
+@dataclass
+class TrimResult:
+    audio: np.ndarray        # trimmed audio (a view of the input unless pauses were collapsed)
+    sample_rate: int
+    original_len: int        # samples in the original recording
+    spans: np.ndarray        # (k, 2) [start, end) sample spans of the original that were kept, in order
+
+    @property
+    def offset(self) -> int:
+        """Samples dropped from the start of the original recording."""
+        return int(self.spans[0, 0]) if len(self.spans) else 0
+
+    @property
+    def trimmed(self) -> bool:
+        return len(self.audio) != self.original_len
+
+    def to_original_s(self, t, end: bool = False):
+        """Map time(s) on the trimmed audio to the original recording. Accepts a scalar or array.
+        end=True resolves a time that falls exactly on a collapsed pause to the earlier span."""
+        t = np.asarray(t, dtype=np.float64)
+        if len(self.spans) <= 1:
+            out = t + self.offset / float(self.sample_rate)
+        else:
+            lengths = self.spans[:, 1] - self.spans[:, 0]
+            starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))  # span starts on the trimmed axis
+            s = t * self.sample_rate
+            idx = np.searchsorted(starts, s, side="left" if end else "right") - 1
+            idx = np.clip(idx, 0, len(self.spans) - 1)
+            out = (self.spans[idx, 0] + (s - starts[idx])) / float(self.sample_rate)
+        return float(out) if out.ndim == 0 else out
+
+    def meta(self) -> dict:
+        sr = float(self.sample_rate)
+        return {"offset_s": round(self.offset / sr, 3),
+                "kept_s": round(len(self.audio) / sr, 3),
+                "original_s": round(self.original_len / sr, 3)}
+
+
+def _frame_db(audio: np.ndarray, frame: int) -> np.ndarray:
+    # full frames are a reshaped view and einsum sums squares without a full-size temporary;
+    # only the short zero-padded tail is copied (float input is never copied)
+    scale = 1.0 / 32768.0 if audio.dtype == np.int16 else 1.0
+    n_full = len(audio) // frame
+    frames = audio[:n_full * frame].reshape(n_full, frame)
+    if audio.dtype != np.float32:
+        frames = frames.astype(np.float32)
+    energy = np.einsum("ij,ij->i", frames, frames)
+    if len(audio) > n_full * frame:
+        tail = audio[n_full * frame:].astype(np.float32)
+        energy = np.append(energy, np.dot(tail, tail))
+    rms = np.sqrt(energy / frame) * scale
+    return 20.0 * np.log10(rms + 1e-9)
+
+
+def trim_silence(audio: np.ndarray, sample_rate: int, cfg: TrimConfig = TrimConfig()) -> TrimResult:
+    """Trim leading/trailing (and optionally long internal) silence. All-silent input is returned untouched."""
+    audio = np.asarray(audio)
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    n = len(audio)
+    whole = TrimResult(audio, sample_rate, n, np.array([[0, n]], dtype=np.int64))
+    frame = max(1, int(sample_rate * cfg.frame_ms / 1000))
+    if n < frame:
+        return whole
+
+    db = _frame_db(audio, frame)
+    speech = db > max(cfg.floor_db, float(db.max()) + cfg.relative_db)
+    if not speech.any():
+        return whole
+    idx = np.flatnonzero(speech)
+    pad = int(cfg.pad_ms / cfg.frame_ms)
+    first, last = max(0, idx[0] - pad), min(len(db), idx[-1] + 1 + pad)  # frame range [first, last)
+
+    # speech runs as frame ranges; gaps between consecutive runs are the internal pauses
+    keep_starts, keep_ends = np.array([first]), np.array([last])
+    if cfg.max_pause_ms is not None:
+        breaks = np.flatnonzero(np.diff(idx) > 1)
+        gap_start = idx[breaks] + 1       # first silent frame of each pause
+        gap_end = idx[breaks + 1]         # first speech frame after it
+        keep = max(2 * pad, int(cfg.max_pause_ms / cfg.frame_ms))
+        long_gap = (gap_end - gap_start) > keep
+        # keep `keep` frames of each long pause, split evenly either side of the cut
+        cut_start = gap_start[long_gap] + keep // 2
+        cut_end = gap_end[long_gap] - (keep - keep // 2)
+        keep_starts = np.concatenate(([first], cut_end))
+        keep_ends = np.concatenate((cut_start, [last]))
+
+    spans = np.stack([keep_starts * frame, np.minimum(keep_ends * frame, n)], axis=1).astype(np.int64)
+    if len(spans) == 1:
+        out = audio[spans[0, 0]:spans[0, 1]]
+    else:
+        out = np.concatenate([audio[s:e] for s, e in spans])
+    return TrimResult(out, sample_rate, n, spans)
@@ -0,0 +1,86 @@
+"""
+Utterances/sec of WhisperXAligner.align_batch vs batch size on CPU, and agreement with align_segments.
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.align_batch --wav api/test.wav --utterances 32 --batch-sizes 1 4 8 16
+
+The wav is transcribed once; --utterances items are cut from it at different offsets/lengths so
+the batch has realistic length spread. "single" aligns them one align_segments call at a time.
+The agreement line is the largest word start/end/score difference between the two paths.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import soundfile as sf
+
+from asr import get_asr
+from scoring.aligner import WhisperXAligner
+
+
+def _items(audio, sr, n, rng):
+    asr = get_asr()
+    items = []
+    for _ in range(n):
+        # 60-100% of the clip, starting somewhere in the first 20%
+        start = int(rng.uniform(0.0, 0.2) * len(audio))
+        length = int(rng.uniform(0.6, 1.0) * (len(audio) - start))
+        clip = audio[start:start + length]
+        _, segments = asr.transcribe_numpy(clip, sr)
+        items.append((segments, clip, sr))
+    return items
+
+
+def _words(result):
+    return [w for seg in result.get("segments", []) for w in seg.get("words", [])]
+
+
+def _max_diff(a, b):
+    worst = 0.0
+    for ra, rb in zip(a, b):
+        wa, wb = _words(ra), _words(rb)
+        if [w.get("word") for w in wa] != [w.get("word") for w in wb]:
+            return float("inf")
+        for x, y in zip(wa, wb):
+            for k in ("start", "end", "score"):
+                if k in x and k in y:
+                    worst = max(worst, abs(float(x[k]) - float(y[k])))
+    return worst
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--wav", default="api/test.wav")
+    ap.add_argument("--utterances", type=int, default=32)
+    ap.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    ap.add_argument("--threads", type=int, default=0, help="torch intra-op threads (0 = default)")
+    args = ap.parse_args()
+
+    import torch
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    audio, sr = sf.read(args.wav, dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    items = _items(audio, sr, args.utterances, np.random.default_rng(0))
+    aligner = WhisperXAligner(device="cpu")
+    aligner.warm_up("en")
+
+    t0 = time.perf_counter()
+    reference = [aligner.align_segments(segs, clip, csr) for segs, clip, csr in items]
+    single = time.perf_counter() - t0
+    print(f"{len(items)} utterances, {sum(len(c) for _, c, _ in items) / sr:.1f} s of audio")
+    print(f"{'path':12} {'utt/s':>8} {'speedup':>8} {'max diff':>9}")
+    print(f"{'single':12} {len(items) / single:8.2f} {1.0:8.2f} {0.0:9.2g}")
+
+    for bs in args.batch_sizes:
+        t0 = time.perf_counter()
+        results = aligner.align_batch(items, batch_size=bs)
+        wall = time.perf_counter() - t0
+        print(f"{'batch=' + str(bs):12} {len(items) / wall:8.2f} {single / wall:8.2f} {_max_diff(reference, results):9.2g}")
+
+
+if __name__ == "__main__":
+    main()
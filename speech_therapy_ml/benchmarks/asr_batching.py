@@ -0,0 +1,76 @@
+"""
+Throughput vs latency of ASRBatcher against one-at-a-time transcription.
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.asr_batching --wav api/test.wav --requests 32
+  python -m benchmarks.asr_batching --clients 1 4 16 --max-batch 16 --max-wait-ms 20
+
+For each concurrency level, N clients each submit requests back-to-back until
+--requests total have completed. "serial" is the pre-batching path
+(asyncio.to_thread(ASR.transcribe_numpy)); "batched" goes through ASRBatcher.
+"""
+
+import argparse
+import asyncio
+import time
+
+import numpy as np
+import soundfile as sf
+
+from asr import get_asr, ASRBatcher, BatchConfig
+
+
+def _percentile(xs, q):
+    return float(np.percentile(np.asarray(xs), q)) if xs else 0.0
+
+
+async def _drive(call, audio, sr, clients: int, total: int):
+    latencies = []
+    remaining = [total]
+
+    async def client():
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            t0 = time.perf_counter()
+            await call(audio, sr)
+            latencies.append(time.perf_counter() - t0)
+
+    t_start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(clients)))
+    wall = time.perf_counter() - t_start
+    return len(latencies) / wall, latencies
+
+
+async def run(args):
+    audio, sr = sf.read(args.wav, dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    asr = get_asr()
+    asr.transcribe_numpy(audio, sr)  # warm-up
+
+    async def serial(a, s):
+        return await asyncio.to_thread(asr.transcribe_numpy, a, s)
+
+    batcher = ASRBatcher(asr, BatchConfig(max_batch_size=args.max_batch, max_wait_ms=args.max_wait_ms))
+
+    print(f"{'mode':8} {'clients':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8}")
+    for clients in args.clients:
+        for name, call in (("serial", serial), ("batched", batcher.transcribe)):
+            rps, lat = await _drive(call, audio, sr, clients, args.requests)
+            print(f"{name:8} {clients:7d} {rps:8.2f} {_percentile(lat, 50) * 1000:8.1f} {_percentile(lat, 95) * 1000:8.1f}")
+    await batcher.stop()
+    print("batcher stats:", batcher.stats)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wav", type=str, default="api/test.wav")
+    parser.add_argument("--clients", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=32, help="Requests per (mode, concurrency) run")
+    parser.add_argument("--max-batch", type=int, default=16)
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
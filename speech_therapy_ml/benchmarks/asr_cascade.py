@@ -0,0 +1,73 @@
+"""
+Latency and escalation rate of ASRCascade against the single full-size model.
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.asr_cascade --wav api/test.wav
+  python -m benchmarks.asr_cascade --wav a.wav b.wav --expected "ship sheep" "thank you" --repeat 5
+
+"full" is the default ASRConfig (small, beam 5) for every utterance; "cascade" is
+CascadeConfig() (base/beam 1, escalating to small/beam 5). The report shows mean latency,
+per-stage escalation rate and how often the cascade's final text matches the full model.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import soundfile as sf
+
+from asr import ASRModel, ASRCascade, CascadeConfig
+from asr.asr import _norm_word
+
+
+def _load(path: str):
+    audio, sr = sf.read(path, dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    return audio, sr
+
+
+def _same(a: str, b: str) -> bool:
+    return [_norm_word(w) for w in a.split()] == [_norm_word(w) for w in b.split()]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--wav", nargs="+", default=["api/test.wav"])
+    ap.add_argument("--expected", nargs="*", default=[], help="expected text per --wav (optional, same order)")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    items = [(*_load(p), args.expected[i] if i < len(args.expected) else None) for i, p in enumerate(args.wav)]
+    cfg = CascadeConfig()
+    full = ASRModel(cfg.stages[-1])
+    cascade = ASRCascade.from_config(cfg, pool_size=1)
+    for audio, sr, _ in items[:1]:  # first-call allocations out of the timings
+        full.transcribe_numpy(audio, sr)
+        cascade.transcribe_numpy(audio, sr)
+    cascade = ASRCascade(cascade.backends, cfg)  # fresh counters
+
+    timings = {"full": [], "cascade": []}
+    matches = 0
+    for _ in range(args.repeat):
+        for audio, sr, expected in items:
+            t0 = time.perf_counter()
+            ref, _ = full.transcribe_numpy(audio, sr)
+            timings["full"].append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            hyp, _ = cascade.transcribe_numpy(audio, sr, expected_text=expected)
+            timings["cascade"].append(time.perf_counter() - t0)
+            matches += _same(ref, hyp)
+
+    n = len(timings["full"])
+    print(f"{n} utterances ({len(items)} files x {args.repeat})")
+    for name, ts in timings.items():
+        print(f"{name:8} mean {np.mean(ts) * 1000:8.1f} ms   p95 {np.percentile(ts, 95) * 1000:8.1f} ms")
+    for i, st in enumerate(cascade.stats()["stages"]):
+        print(f"stage {i} ({st['model_size']}, beam {st['beam_size']}): decoded {st['decoded']}, "
+              f"escalated {st['escalated']} ({st['escalation_rate'] * 100:.0f}%)")
+    print(f"cascade text == full text: {matches}/{n}")
+
+
+if __name__ == "__main__":
+    main()
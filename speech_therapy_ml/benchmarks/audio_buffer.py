@@ -0,0 +1,113 @@
+"""
+Waveform copies and peak memory of one /score request's audio handling: per-stage conversions
+(as before AudioBuffer) vs one shared AudioBuffer. No models are loaded; each stage does only
+its input conversion and a cheap read, so the numbers isolate the audio plumbing.
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.audio_buffer --seconds 30
+  python -m benchmarks.audio_buffer --seconds 30 --sr 44100   # upload needs resampling
+
+Each mode runs in a fresh interpreter. "copies" counts stage inputs that don't share memory with
+the request's audio; "resamples" counts librosa.resample calls; peak numbers are above the
+baseline taken after the upload is decoded.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+_PROBE = r"""
+import json, resource, sys, tracemalloc
+import numpy as np
+import librosa
+
+mode, seconds, sr = sys.argv[1], float(sys.argv[2]), int(sys.argv[3])
+resamples = [0]
+_resample = librosa.resample
+def counting_resample(*a, **k):
+    resamples[0] += 1
+    return _resample(*a, **k)
+librosa.resample = counting_resample
+
+rng = np.random.default_rng(0)
+upload = (0.1 * rng.standard_normal(int(seconds * sr))).astype(np.float32)  # what soundfile returns
+librosa.resample(np.zeros(1024, np.float32), orig_sr=sr, target_sr=16000) if sr != 16000 else None
+resamples[0] = 0
+
+# ----- stage conversions as they were before AudioBuffer -----
+def legacy_asr(audio):
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    if audio.dtype == np.int16:
+        return (audio.astype(np.float32) / 32768.0).clip(-1.0, 1.0)
+    return audio.astype(np.float32)
+
+def legacy_aligner(audio, sr, target_sr=16000):
+    audio = np.asarray(audio).astype(np.float32)
+    if sr != target_sr:
+        audio = librosa.resample(audio, orig_sr=sr, target_sr=target_sr)
+    return audio
+
+def legacy_scorer(audio):
+    a = np.asarray(audio)
+    f = a.astype(np.float32)
+    return f[:, 0] if f.ndim > 1 else f
+
+from asr import AudioBuffer, trim_silence
+from asr.asr import _to_float32_mono
+from asr.cache import ResultCache
+from scoring.aligner import WhisperXAligner
+from scoring.scorer import _to_float_audio
+
+base_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+tracemalloc.start()
+copies = 0
+def stage(out, source):
+    global copies
+    copies += not np.shares_memory(np.asarray(out), np.asarray(source))
+    float(np.asarray(out)[::997].sum())  # touch it, like a consumer would
+
+if mode == "legacy":
+    trim_silence(upload, sr)
+    ResultCache.audio_key(upload, sr)
+    stage(legacy_asr(upload), upload)
+    stage(legacy_aligner(upload, sr), upload)
+    stage(legacy_scorer(upload), upload)
+else:
+    buf = AudioBuffer.from_array(upload, sr)  # the one conversion / resample
+    source = upload if sr == 16000 else buf
+    stage(buf, upload)
+    trim_silence(buf, buf.sample_rate)
+    ResultCache.audio_key(buf, buf.sample_rate)
+    stage(_to_float32_mono(buf), source)
+    stage(WhisperXAligner._ensure_float32(buf, buf.sample_rate), source)
+    stage(_to_float_audio(buf), source)
+
+_, peak = tracemalloc.get_traced_memory()
+rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"copies": copies, "resamples": resamples[0], "traced_peak_mb": peak / 2**20,
+                  "rss_growth_mb": (rss - base_rss) / 1024}))
+"""
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=30.0)
+    ap.add_argument("--sr", type=int, default=16000, help="sample rate of the simulated upload")
+    args = ap.parse_args()
+
+    print(f"{args.seconds:.0f} s float32 upload at {args.sr} Hz ({args.seconds * args.sr * 4 / 2**20:.1f} MB)")
+    print(f"{'mode':8} {'copies':>6} {'resamples':>9} {'traced peak MB':>15} {'peak RSS growth MB':>19}")
+    for mode in ("legacy", "shared"):
+        proc = subprocess.run([sys.executable, "-c", _PROBE, mode, str(args.seconds), str(args.sr)],
+                              capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"{mode:8} failed: {proc.stderr.strip().splitlines()[-1]}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{mode:8} {r['copies']:6d} {r['resamples']:9d} {r['traced_peak_mb']:15.2f} {r['rss_growth_mb']:19.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Word-level DTW: scoring/dtw.py vs librosa.sequence.dtw, with a tolerance check.
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.dtw --wav api/test.wav
+  python -m benchmarks.dtw --wav api/test.wav --templates 4 16 64 --band 0.2
+
+Word-length slices (0.2-0.6 s) of the recording's MFCC stand in for templates and test words, so the
+sequences have real MFCC statistics. For each template count one test word is compared against every
+template:
+  librosa     the former dtw_distance: librosa.sequence.dtw (full cost + step matrices, backtracking) per pair
+  cost loop   dtw_cost per pair (no band)
+  many        dtw_many, all templates in one batched wavefront (no band)
+  min         dtw_min, LB_Keogh order + early abandon, only the closest template
+  band        dtw_min with the Sakoe-Chiba band (--band)
+Before timing, dtw_cost and dtw_many are checked against librosa on every pair (relative error <= 1e-9),
+and dtw_min against the argmin of the librosa distances. tests/test_dtw.py holds the same check
+(plus tie-heavy pairs and the NumPy wavefront fallback) under pytest.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import soundfile as sf
+
+from scoring.dtw import dtw_cost, dtw_many, dtw_min
+from scoring.features import FeatureFrames
+from scoring.scorer import _librosa
+
+HOP_S = 256 / 16000
+
+
+def _load(path: str):
+    audio, sr = sf.read(path, dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    return audio, sr
+
+
+def _librosa_distance(ref, test):
+    D, wp = _librosa().sequence.dtw(X=ref, Y=test, metric="euclidean")
+    return float(D[-1, -1]) / len(wp)
+
+
+def _slices(mfcc, count, rng):
+    out = []
+    for _ in range(count):
+        n = int(rng.uniform(0.2, 0.6) / HOP_S)
+        s = int(rng.integers(0, max(1, mfcc.shape[1] - n)))
+        m = mfcc[:, s:s + n]
+        out.append(m - m.mean(axis=1, keepdims=True))
+    return out
+
+
+def _best_ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--wav", default="api/test.wav")
+    ap.add_argument("--templates", type=int, nargs="+", default=[1, 4, 16, 64])
+    ap.add_argument("--band", type=float, default=0.2)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    y, sr = _load(args.wav)
+    mfcc = FeatureFrames(y, sr).mfcc(13)
+    rng = np.random.default_rng(0)
+    test = _slices(mfcc, 1, rng)[0]
+    _librosa_distance(test, test)  # numba compilation out of the timings
+
+    # tolerance check
+    refs = _slices(mfcc, max(args.templates), rng)
+    expect = np.array([_librosa_distance(r, test) for r in refs])
+    single = np.array([dtw_cost(r, test) for r in refs])
+    many = dtw_many(refs, test)
+    err = max(np.max(np.abs(single - expect) / expect), np.max(np.abs(many - expect) / expect))
+    best_idx, best = dtw_min(refs, test)
+    assert err <= 1e-9, f"dtw differs from librosa: max relative error {err:.3g}"
+    assert best_idx == int(np.argmin(expect)) and abs(best - expect.min()) <= 1e-9 * expect.min()
+    print(f"{args.wav}: test word {test.shape[1]} frames; max relative error vs librosa {err:.2g} (tolerance 1e-9)")
+
+    print(f"{'templates':>9} {'librosa ms':>11} {'cost loop':>10} {'many':>8} {'min':>8} {'band':>8} {'speedup (min)':>14}")
+    for k in args.templates:
+        refs_k = refs[:k]
+        t_lib = _best_ms(lambda: [_librosa_distance(r, test) for r in refs_k], args.repeat)
+        t_cost = _best_ms(lambda: [dtw_cost(r, test) for r in refs_k], args.repeat)
+        t_many = _best_ms(lambda: dtw_many(refs_k, test), args.repeat)
+        t_min = _best_ms(lambda: dtw_min(refs_k, test), args.repeat)
+        t_band = _best_ms(lambda: dtw_min(refs_k, test, band=args.band), args.repeat)
+        print(f"{k:9d} {t_lib:11.2f} {t_cost:10.2f} {t_many:8.2f} {t_min:8.2f} {t_band:8.2f} {t_lib / t_min:13.1f}x")
+
+
+if __name__ == "__main__":
+    main()
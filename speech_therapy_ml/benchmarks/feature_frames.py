@@ -0,0 +1,83 @@
+"""
+Per-word features from one shared FeatureFrames vs recomputing them per slice.
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.feature_frames --wav api/test.wav --words 10 50 200
+
+"per-slice" is what the scorer did before FeatureFrames: librosa.feature.rms over the utterance
+(framed separately from the pitch tracker) plus compute_mfcc (its own mel spectrogram) on every
+word slice. "shared" frames once, reads RMS from it and slices the memoized MFCC per word. Word
+windows are synthetic (evenly spaced) so the numbers isolate feature extraction.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import soundfile as sf
+
+from scoring.features import FeatureFrames
+from scoring.scorer import _librosa, compute_mfcc
+
+FRAME_LENGTH = 2048
+HOP_LENGTH = 256
+
+
+def _load(path: str):
+    audio, sr = sf.read(path, dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    return audio, sr
+
+
+def _per_slice(y, sr, windows):
+    rms = _librosa().feature.rms(y=y, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH)[0]
+    mfccs = [compute_mfcc(y[int(s * sr):int(e * sr)], sr) for s, e in windows]
+    return rms, mfccs
+
+
+def _shared(y, sr, windows):
+    ff = FeatureFrames(y, sr, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH)
+    mfcc = ff.mfcc()
+    mfccs = []
+    for s, e in windows:
+        a, b = ff.frame_range(s, e)
+        mfccs.append(mfcc[:, a:b])
+    return ff.rms, mfccs
+
+
+def _best_ms(fn, args, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--wav", default="api/test.wav")
+    ap.add_argument("--words", type=int, nargs="+", default=[10, 50, 200])
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    y, sr = _load(args.wav)
+    dur = len(y) / sr
+    _per_slice(y, sr, [(0.0, dur)])  # librosa imports / filter banks out of the timings
+    _shared(y, sr, [(0.0, dur)])
+    print(f"{args.wav}: {dur:.1f} s")
+    print(f"{'words':>6} {'per-slice ms':>13} {'shared ms':>10} {'speedup':>8}")
+    for n in args.words:
+        edges = np.linspace(0.0, dur, n + 1)
+        windows = [(float(edges[i]), float(edges[i + 1])) for i in range(n)]
+        a = _best_ms(_per_slice, (y, sr, windows), args.repeat)
+        b = _best_ms(_shared, (y, sr, windows), args.repeat)
+        print(f"{n:6d} {a:13.2f} {b:10.2f} {a / b:7.1f}x")
+    rms_a, _ = _per_slice(y, sr, [])
+    rms_b, _ = _shared(y, sr, [])
+    print(f"RMS identical to librosa.feature.rms: {np.array_equal(rms_a, rms_b)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+word_gop on synthetic CTC emissions: minimal pairs must flag the right letter, and scoring must stay
+cheap next to the alignment that produced the emissions.
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.gop
+  python -m benchmarks.gop --words 2000 --frames-per-letter 4
+
+Emissions are made the way a character CTC model shapes them: each spoken letter peaks for a few
+frames (blank elsewhere), with noise on every label. "said" is the letter sequence the synthetic
+speaker produced and "expected" the word scored against it, e.g. expected "ship" said as "sheep":
+the "i" must be the weakest letter, below GOP_WEAK, with "e" as its competitor, and the correctly
+read word must have no weak letter. The timing row scores --words words out of one long float16
+emission array (one block per 30 s segment, as whisperx cuts them).
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from scoring.gop import GOP_WEAK, CTCEmissions, word_gop
+
+# torchaudio WAV2VEC2_ASR_BASE_960H labels, as whisperx builds the align dictionary
+LABELS = ["-", "|", "e", "t", "a", "o", "n", "i", "h", "s", "r", "d", "l", "u", "m", "w", "c", "f", "g", "y",
+          "p", "b", "v", "k", "'", "x", "j", "q", "z"]
+DICTIONARY = {c: i for i, c in enumerate(LABELS)}
+FRAME_S = 0.02
+PAIRS = [("ship", "sheep"), ("sheep", "ship"), ("cat", "cut"), ("bed", "bad"), ("thin", "fin"), ("rock", "lock")]
+
+
+def _emissions(said: str, rng, frames_per_letter: int, gap: int = 2) -> np.ndarray:
+    """(frames, vocab) log-softmax: blank-padded letter peaks of `said` (a repeated letter gets a blank between)."""
+    rows = [("-", gap)]
+    for c in said:
+        rows += [(c, frames_per_letter), ("-", 1)]
+    rows.append(("-", gap))
+    logits = []
+    for label, n in rows:
+        block = rng.normal(0.0, 1.0, (n, len(LABELS)))
+        block[:, DICTIONARY[label]] += 9.0
+        logits.append(block)
+    x = np.concatenate(logits)
+    x -= x.max(axis=1, keepdims=True)
+    return (x - np.log(np.exp(x).sum(axis=1, keepdims=True))).astype(np.float16)
+
+
+def _one(said: str, rng, frames_per_letter: int) -> CTCEmissions:
+    lp = _emissions(said, rng, frames_per_letter)
+    return CTCEmissions(lp, [(0.0, FRAME_S, 0, len(lp))], DICTIONARY, blank=0)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--words", type=int, default=1000)
+    ap.add_argument("--frames-per-letter", type=int, default=3)
+    args = ap.parse_args()
+    rng = np.random.default_rng(0)
+
+    print(f"{'expected':>9} {'said':>7} {'gop':>7} {'weakest':>8} {'competitor':>10} {'correct read gop':>17}")
+    ok = True
+    for expected, said in PAIRS:
+        em = _one(said, rng, args.frames_per_letter)
+        g = word_gop(em, expected, 0.0, len(em.log_probs) * FRAME_S)
+        ref = word_gop(_one(expected, rng, args.frames_per_letter), expected, 0.0, len(em.log_probs) * FRAME_S)
+        weakest = min(range(len(g["graphemes"])), key=lambda k: g["graphemes"][k]["gop"])
+        wg = g["graphemes"][weakest]
+        # the letter(s) that differ between the two spellings, at the weakest position
+        diff = {a for a, b in zip(expected, said) if a != b} | set(expected) - set(said)
+        good = wg["char"] in diff and wg["gop"] < GOP_WEAK and ref["gop"] >= GOP_WEAK
+        ok &= good
+        print(f"{expected:>9} {said:>7} {g['gop']:7.2f} {wg['char']:>8} {str(wg['competitor']):>10} {ref['gop']:17.2f}"
+              + ("" if good else "  <- wrong"))
+    print("minimal pairs:", "ok" if ok else "FAILED")
+
+    # timing: words laid out back to back in one long emission array, 30 s blocks
+    vocab = [w for pair in PAIRS for w in pair]
+    said = [vocab[i] for i in rng.integers(0, len(vocab), args.words)]
+    parts, spans, t = [], [], 0.0
+    for w in said:
+        lp = _emissions(w, rng, args.frames_per_letter)
+        parts.append(lp)
+        spans.append((w, t, t + len(lp) * FRAME_S))
+        t += len(lp) * FRAME_S
+    lp = np.concatenate(parts)
+    per_block = int(30.0 / FRAME_S)
+    blocks = [(k * FRAME_S, FRAME_S, k, min(per_block, len(lp) - k)) for k in range(0, len(lp), per_block)]
+    em = CTCEmissions(lp, blocks, DICTIONARY, blank=0)
+    word_gop(em, *spans[0])  # first-call setup (letter index) out of the timing
+    t0 = time.perf_counter()
+    scored = sum(word_gop(em, w, s, e) is not None for w, s, e in spans)
+    dt = time.perf_counter() - t0
+    print(f"{args.words} words ({t:.0f} s of emissions, {lp.nbytes / 1024:.0f} KB float16 = "
+          f"{lp.nbytes / 1024 / t:.1f} KB/s): {dt / args.words * 1e6:.0f} us/word, {scored} scored")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Cold-start import cost of the service modules, measured in a fresh interpreter per module.
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.import_time --budget-ms 1000
+
+Each module is imported with `python -X importtime`; the script prints wall time, the slowest
+imports it pulled in, and fails (exit 1) if a module exceeds --budget-ms or drags in one of the
+heavy runtime dependencies (torch, whisperx, faster_whisper, librosa, audio devices, openai)
+that should only load on first use. tests/test_import_time.py enforces the same budget under pytest.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+
+DEFAULT_MODULES = [
+    "asr",
+    "scoring.aligner",
+    "scoring.scorer",
+    "scoring.feedback",
+    "interactive.session",
+    "api.main",
+]
+
+HEAVY = ["torch", "whisperx", "faster_whisper", "ctranslate2", "librosa",
+         "sounddevice", "webrtcvad", "openai", "requests"]
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+wall = time.perf_counter() - t0
+print(json.dumps({{"wall_ms": wall * 1000, "loaded": [m for m in {heavy!r} if m in sys.modules]}}))
+"""
+
+
+def measure(module: str):
+    """(result, None) with wall_ms, eager heavy imports and the slowest direct imports, or (None, error)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE.format(module=module, heavy=HEAVY)],
+        capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        err = proc.stderr.strip().splitlines()
+        return None, err[-1] if err else f"exit {proc.returncode}"
+    result = json.loads(proc.stdout.strip().splitlines()[-1])
+    # "import time: self [us] | cumulative | imported package"
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, self_us, cum_us, name = line.replace("import time:", "|", 1).split("|")
+        # nesting is shown by indentation; keep what the measured module itself pulled in
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        if depth != 1:
+            continue
+        rows.append((int(cum_us), name.strip()))
+    result["top"] = sorted(rows, reverse=True)
+    return result, None
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    ap.add_argument("--budget-ms", type=float, default=1000.0)
+    ap.add_argument("--top", type=int, default=5, help="slowest direct imports to list per module")
+    args = ap.parse_args()
+
+    failed = False
+    print(f"{'module':22} {'wall ms':>8}  status")
+    for module in args.modules:
+        res, err = measure(module)
+        if res is None:
+            # missing optional deps in this environment are reported, not counted as regressions
+            print(f"{module:22} {'-':>8}  skipped ({err})")
+            continue
+        problems = []
+        if res["wall_ms"] > args.budget_ms:
+            problems.append(f"over budget ({args.budget_ms:.0f} ms)")
+        if res["loaded"]:
+            problems.append("eager imports: " + ", ".join(res["loaded"]))
+        failed = failed or bool(problems)
+        print(f"{module:22} {res['wall_ms']:8.1f}  {'; '.join(problems) or 'ok'}")
+        for cum_us, name in res["top"][:args.top]:
+            print(f"{'':22} {cum_us / 1000:8.1f}    {name}")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
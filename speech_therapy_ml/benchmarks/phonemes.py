@@ -0,0 +1,71 @@
+"""
+Phoneme index: loading the pickled index vs parsing the dictionary text, and lookup throughput.
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.phonemes --source cmudict.dict
+  python -m benchmarks.phonemes --source cmudict.dict --lookups 200000
+
+"parse" reads the cmudict text into word -> pronunciations, which is what pronouncing does on its
+first phones_for_word call in every process. "load" is PhonemeIndex.load on the pickle built from the
+same file. Lookups alternate in-vocabulary words (index hits) with made-up ones (cached G2P guesses);
+the G2P row is the uncached cost of one guess.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from scoring.phonemes import PhonemeIndex, _parse_cmudict_lines, build_index, guess_phones
+
+OOV = ["zorbix", "brayleigh", "kaydence", "flimble", "snorkitty", "jaxtyn", "quibbly", "tremlo"]
+
+
+def _best_ms(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def _parse(path):
+    with open(path, encoding="latin-1") as f:
+        return _parse_cmudict_lines(f)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--source", required=True, help="cmudict.dict text file")
+    ap.add_argument("--lookups", type=int, default=100000)
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out = os.path.join(tmp, "phonemes.pkl")
+        n = build_index(out, args.source)
+        parse_ms = _best_ms(lambda: _parse(args.source), args.repeat)
+        load_ms = _best_ms(lambda: PhonemeIndex(out).load(), args.repeat)
+        index = PhonemeIndex(out).load()
+
+    vocab = list(index._words)[:: max(1, len(index._words) // 1000)] or ["hello"]
+    words = [vocab[i % len(vocab)] if i % 2 == 0 else OOV[i % len(OOV)] for i in range(args.lookups)]
+    for w in OOV:
+        index.pronounce(w)  # G2P cache warm
+    t0 = time.perf_counter()
+    for w in words:
+        index.pronounce(w)
+    lookup_s = time.perf_counter() - t0
+    guess_phones.cache_clear()
+    g2p_ms = _best_ms(lambda: [guess_phones.__wrapped__(w) for w in OOV], args.repeat) / len(OOV)
+
+    print(f"{args.source}: {n} words")
+    print(f"parse text        {parse_ms:9.1f} ms")
+    print(f"load pickle       {load_ms:9.1f} ms   ({parse_ms / load_ms:.1f}x)")
+    print(f"lookups           {args.lookups / lookup_s:9.0f} /s   (half in-vocabulary, half cached G2P)")
+    print(f"G2P, uncached     {g2p_ms * 1000:9.1f} us / word")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Real-time factor of the scorer's pitch backends and their agreement with pyin.
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.pitch_backends --wav api/test.wav
+  python -m benchmarks.pitch_backends --wav a.wav b.wav --backends pyin yin nccf --repeat 5
+  python -m benchmarks.pitch_backends --wav a.wav b.wav --voicing-thresholds 0.35 0.45 0.55 0.75
+
+Each backend tracks every file at the scorer's frame grid (frame 2048, hop 256). RTF is the best
+tracking time over --repeat runs divided by the audio duration (lower is faster). Agreement is
+measured against pyin frame by frame:
+  voicing acc   share of frames where the voiced/unvoiced decision matches pyin
+  F0 RMSE       Hz and cents, on frames both call voiced
+  gross err     share of those frames more than 20% away from pyin (octave / halving errors)
+--voicing-thresholds adds a yin@t / nccf@t row per threshold, to calibrate voicing_threshold against pyin.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import soundfile as sf
+
+from scoring.pitch import get_pitch_backend
+
+FRAME_LENGTH = 2048
+HOP_LENGTH = 256
+
+
+def _load(path: str):
+    audio, sr = sf.read(path, dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    return audio, sr
+
+
+def _best_time(backend, audio, sr, repeat):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = backend.track(audio, sr, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH)
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--wav", nargs="+", default=["api/test.wav"])
+    ap.add_argument("--backends", nargs="+", default=["pyin", "yin", "nccf"])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--voicing-thresholds", type=float, nargs="*", default=[],
+                    help="extra yin / nccf rows with these voicing_threshold values")
+    args = ap.parse_args()
+
+    clips = [_load(p) for p in args.wav]
+    total_s = sum(len(a) / sr for a, sr in clips)
+    names = ["pyin"] + [b for b in args.backends if b != "pyin"]
+    backends = {name: get_pitch_backend(name) for name in names}
+    for t in args.voicing_thresholds:
+        for name in ("yin", "nccf"):
+            if name in args.backends:
+                backends[f"{name}@{t:g}"] = get_pitch_backend(name, voicing_threshold=t)
+    names = list(backends)
+    for backend in backends.values():  # numba compilation / first-call allocations out of the timings
+        backend.track(clips[0][0][:16000], clips[0][1], frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH)
+
+    tracks = {name: [] for name in names}
+    seconds = {name: 0.0 for name in names}
+    for audio, sr in clips:
+        for name, backend in backends.items():
+            t, out = _best_time(backend, audio, sr, args.repeat)
+            seconds[name] += t
+            tracks[name].append(out)
+
+    print(f"{len(clips)} file(s), {total_s:.1f} s of audio")
+    print(f"{'backend':10} {'RTF':>7} {'speedup':>8} {'voiced':>7} {'voicing acc':>12} {'F0 RMSE Hz':>11} {'cents':>7} {'gross err':>10}")
+    for name in names:
+        agree, both, ref_f0, hyp_f0, voiced = 0, 0, [], [], 0
+        for (ref, ref_v, _, _), (hyp, hyp_v, _, _) in zip(tracks["pyin"], tracks[name]):
+            n = min(len(ref_v), len(hyp_v))
+            rv, hv = np.asarray(ref_v[:n], bool) & np.isfinite(ref[:n]), np.asarray(hyp_v[:n], bool) & np.isfinite(hyp[:n])
+            agree += int(np.sum(rv == hv))
+            voiced += int(hv.sum())
+            both += n
+            m = rv & hv
+            ref_f0.append(ref[:n][m])
+            hyp_f0.append(hyp[:n][m])
+        r, h = np.concatenate(ref_f0).astype(np.float64), np.concatenate(hyp_f0).astype(np.float64)
+        if r.size:
+            rmse = f"{np.sqrt(np.mean((h - r) ** 2)):11.2f}"
+            cents = f"{np.sqrt(np.mean((1200 * np.log2(h / r)) ** 2)):7.1f}"
+            gross = f"{np.mean(np.abs(h / r - 1.0) > 0.2) * 100:9.1f}%"
+        else:
+            rmse, cents, gross = f"{'-':>11}", f"{'-':>7}", f"{'-':>10}"
+        print(f"{name:10} {seconds[name] / total_s:7.4f} {seconds['pyin'] / seconds[name]:7.1f}x {voiced / max(1, both) * 100:6.1f}% "
+              f"{agree / max(1, both) * 100:11.1f}% {rmse} {cents} {gross}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Scorer.score_batch: persistent process pool vs in-process scoring.
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.score_batch --wav api/test.wav
+  python -m benchmarks.score_batch --workers 1 2 4 --utterances 32 --pitch-backend nccf
+
+Every utterance is the recording with synthetic evenly spaced word timings (no ASR / alignment),
+so only scoring is timed. "inline" is score_batch(workers=0), one attempt after another in this
+process; each pool row starts and warms the pool first, then times one batch. Pool results are
+checked against the inline ones before timing. Speed-up is bounded by physical cores
+(os.cpu_count() is printed): on one core the pool only adds the shared-memory hand-off.
+"""
+
+import argparse
+import os
+import time
+
+import soundfile as sf
+
+from scoring.scorer import Scorer, ScorerConfig
+
+WORDS = "the quick brown fox jumps over the lazy dog".split()
+
+
+def _load(path: str):
+    audio, sr = sf.read(path, dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    return audio, sr
+
+
+def _item(audio, sr, i):
+    dur = len(audio) / sr
+    step = dur / len(WORDS)
+    words = [{"word": w, "start": round(k * step, 3), "end": round((k + 0.9) * step, 3), "score": 0.9}
+             for k, w in enumerate(WORDS)]
+    return {"expected_text": " ".join(WORDS), "aligned_result": {"segments": [{"words": words}]},
+            "audio_np": audio, "audio_sr": sr, "speaker_id": f"spk{i % 8}"}
+
+
+def _strip(result):
+    # timings differ run to run; everything else must match
+    return {k: v for k, v in result.items() if k not in ("timings", "debug")}
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--wav", default="api/test.wav")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--utterances", type=int, default=16)
+    ap.add_argument("--pitch-backend", default="pyin")
+    args = ap.parse_args()
+
+    audio, sr = _load(args.wav)
+    items = [_item(audio, sr, i) for i in range(args.utterances)]
+    cfg = ScorerConfig(pitch_backend=args.pitch_backend)
+    print(f"{args.wav}: {len(audio) / sr:.1f} s, {args.utterances} utterances, pitch {args.pitch_backend}, "
+          f"{os.cpu_count()} cores")
+
+    scorer = Scorer(sample_rate=16000, cfg=cfg)
+    # librosa import / numba compiles out of the timing; no speaker_id, so profiles start empty as in the pool
+    scorer.score_batch([dict(items[0], speaker_id=None)], workers=0)
+    t0 = time.perf_counter()
+    expect = scorer.score_batch(items, workers=0)
+    t_inline = time.perf_counter() - t0
+    print(f"{'workers':>8} {'utt/s':>8} {'speedup':>8}")
+    print(f"{'inline':>8} {args.utterances / t_inline:8.2f} {1.0:7.2f}x")
+
+    for n in args.workers:
+        pool_scorer = Scorer(sample_rate=16000, cfg=cfg)
+        pool_scorer.start_pool(n).warm_up()
+        try:
+            t0 = time.perf_counter()
+            got = pool_scorer.score_batch(items)
+            t_pool = time.perf_counter() - t0
+        finally:
+            pool_scorer.close()
+        bad = [i for i, r in enumerate(got) if isinstance(r, Exception)]
+        assert not bad, f"pool failed on items {bad}: {got[bad[0]]!r}"
+        same = all(_strip(a) == _strip(b) for a, b in zip(got, expect))
+        print(f"{n:8d} {args.utterances / t_pool:8.2f} {t_inline / t_pool:7.2f}x" + ("" if same else "  (results differ)"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Pitch-tracking cost with a per-speaker F0 range vs the full C2-C6 search.
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.speaker_range --wav api/test.wav
+  python -m benchmarks.speaker_range --wav a.wav b.wav --backend nccf --repeat 5
+
+Every file is scored once with a fresh speaker id, which builds that speaker's profile from the
+reliable words (one word per 0.3 s of audio, so no aligner is needed). It is then tracked again
+with the full range and with SpeakerProfileStore.pitch_range. The report gives the best tracking
+time of each, the narrowed band, and how often the two tracks differ by more than 20% on frames
+both call voiced (octave errors the narrow band removes or introduces).
+"""
+
+import argparse
+import time
+
+import numpy as np
+import soundfile as sf
+
+from scoring.scorer import Scorer, ScorerConfig
+from scoring.speaker import ProfileConfig
+
+FRAME_LENGTH = 2048
+HOP_LENGTH = 256
+
+
+def _load(path: str):
+    audio, sr = sf.read(path, dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    return audio, sr
+
+
+def _aligned(duration_s: float) -> dict:
+    n = max(1, int(duration_s / 0.3))
+    return {"segments": [{"words": [{"word": f"w{i}", "start": i * 0.3, "end": i * 0.3 + 0.25, "score": 0.9} for i in range(n)]}]}
+
+
+def _best(fn, repeat):
+    best, out = float("inf"), None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        out = fn()
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--wav", nargs="+", default=["api/test.wav"])
+    ap.add_argument("--backend", default="pyin", choices=["pyin", "yin", "nccf"])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    # min_words=1 so a single scored attempt is enough to narrow the range
+    scorer = Scorer(cfg=ScorerConfig(pitch_backend=args.backend))
+    scorer.speakers.cfg = ProfileConfig(min_words=1)
+    print(f"backend {args.backend}")
+    print(f"{'file':24} {'full ms':>8} {'narrow ms':>10} {'speedup':>8} {'band Hz':>14} {'voiced full/narrow':>19} {'>20% apart':>11}")
+    for i, path in enumerate(args.wav):
+        audio, sr = _load(path)
+        speaker = f"speaker-{i}"
+        aligned = _aligned(len(audio) / sr)
+        expected = " ".join(w["word"] for w in aligned["segments"][0]["words"])
+        scorer.score_utterance(expected, aligned, audio, sr, speaker_id=speaker)  # builds the profile (and warms up)
+        band = scorer.speakers.pitch_range(speaker)
+        if band is None:
+            print(f"{path:24} no reliable words, profile not ready")
+            continue
+        full_t, (f_full, v_full, _, _) = _best(lambda: scorer.pitch.track(audio, sr, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH), args.repeat)
+        narrow_t, (f_narrow, v_narrow, _, _) = _best(lambda: scorer.pitch.track(audio, sr, fmin_hz=band[0], fmax_hz=band[1],
+                                                                               frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH), args.repeat)
+        both = np.asarray(v_full, bool) & np.asarray(v_narrow, bool) & np.isfinite(f_full) & np.isfinite(f_narrow)
+        apart = float(np.mean(np.abs(f_narrow[both] / f_full[both] - 1.0) > 0.2)) if both.any() else 0.0
+        print(f"{path:24} {full_t * 1000:8.1f} {narrow_t * 1000:10.1f} {full_t / narrow_t:7.2f}x {band[0]:6.0f}-{band[1]:<7.0f} "
+              f"{np.mean(v_full):9.2f}/{np.mean(v_narrow):<9.2f} {apart * 100:10.1f}%")
+
+
+if __name__ == "__main__":
+    main()
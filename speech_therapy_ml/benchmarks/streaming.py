@@ -0,0 +1,132 @@
+"""
+StreamingScorer vs Scorer.score_utterance on a long reading: per-word latency, compute, memory held,
+and agreement with the batch result.
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.streaming --wav api/test.wav
+  python -m benchmarks.streaming --loops 40 --chunk-ms 100 --word-lag-s 0.5 --pitch-backend pyin
+
+The recording is looped --loops times to stand in for a story page; the expected words are drawn from
+a small story vocabulary, laid out evenly (~2.7 words/s), and the "ASR" misreads / skips a few of them. Streaming is simulated in audio time:
+chunks of --chunk-ms are fed in order, and a word's aligned dict arrives with the chunk that passes
+its end + --word-lag-s. A word's latency is the audio still to come when its record is returned plus
+the compute of that feed() call; batch latency is the audio after the word plus one score_utterance.
+"""
+
+import argparse
+import time
+
+import numpy as np
+import soundfile as sf
+
+from scoring.scorer import Scorer, ScorerConfig
+
+VOCAB = ("once upon a time there was a little fox who lived by the river and every morning "
+         "she ran along the bank to look for fish in the cold clear water").split()
+
+
+def _load(path: str):
+    audio, sr = sf.read(path, dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    return audio, sr
+
+
+def _reading(duration_s: float, rng):
+    """(expected_text, aligned words) with a few misread, skipped and inserted words."""
+    n = int(duration_s * 2.7)
+    expected = [VOCAB[i] for i in rng.integers(0, len(VOCAB), n)]
+    step = duration_s / n
+    words = []
+    for i, w in enumerate(expected):
+        r = rng.random()
+        if r < 0.04:
+            continue  # skipped
+        if r < 0.08:
+            w = "the" if w != "the" else "a"  # misread
+        words.append({"word": w, "start": round(i * step, 3), "end": round((i + 0.8) * step, 3), "score": 0.9})
+        if r > 0.98:
+            words.append({"word": "um", "start": round((i + 0.82) * step, 3), "end": round((i + 0.95) * step, 3), "score": 0.5})
+    return " ".join(expected), words
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--wav", default="api/test.wav")
+    ap.add_argument("--loops", type=int, default=20)
+    ap.add_argument("--chunk-ms", type=float, default=100.0)
+    ap.add_argument("--word-lag-s", type=float, default=0.5)
+    ap.add_argument("--pitch-backend", default="nccf")
+    args = ap.parse_args()
+
+    y, sr = _load(args.wav)
+    audio = np.tile(y, args.loops)
+    dur = len(audio) / sr
+    expected, words = _reading(dur, np.random.default_rng(0))
+    cfg = ScorerConfig(pitch_backend=args.pitch_backend)
+    print(f"{args.wav} x{args.loops}: {dur:.1f} s, {len(expected.split())} expected / {len(words)} read words, "
+          f"pitch {args.pitch_backend}, chunks {args.chunk_ms:.0f} ms, word lag {args.word_lag_s} s")
+
+    # batch
+    scorer = Scorer(sample_rate=sr, cfg=cfg)
+    scorer.score_utterance("hello", {"segments": [{"words": words[:2]}]}, y, sr)  # librosa / numba warm-up
+    t0 = time.perf_counter()
+    batch = scorer.score_utterance(expected, {"segments": [{"words": words}]}, audio, sr)
+    t_batch = time.perf_counter() - t0
+    batch_lat = [dur - r["end"] + t_batch for r in batch["per_word"] if r["end"] is not None]
+
+    # streaming
+    stream = scorer.stream(expected, audio_sr=sr)
+    chunk = int(sr * args.chunk_ms / 1000)
+    nxt, emitted, lat, held, t_stream = 0, 0, [], 0, 0.0
+    for pos in range(0, len(audio), chunk):
+        fed_s = min(len(audio), pos + chunk) / sr
+        new = []
+        while nxt < len(words) and words[nxt]["end"] + args.word_lag_s <= fed_s:
+            new.append(words[nxt])
+            nxt += 1
+        t0 = time.perf_counter()
+        out = stream.feed(audio[pos:pos + chunk], new)
+        dt = time.perf_counter() - t0
+        t_stream += dt
+        emitted += len(out)
+        lat += [fed_s - r["end"] + dt for r in out if r["end"] is not None]
+        held = max(held, stream.stats()["frames_held"])
+    t0 = time.perf_counter()
+    stream.feed(words=words[nxt:])  # the last words' alignment lands after the audio ends
+    result = stream.finish()
+    dt = time.perf_counter() - t0
+    t_stream += dt
+    lat += [dur - r["end"] + dt for r in result["per_word"][emitted:] if r["end"] is not None]
+
+    print(f"{'':10} {'mean lat s':>10} {'p95 lat s':>10} {'compute s':>10} {'RTF':>7}")
+    for name, l, t in (("batch", batch_lat, t_batch), ("streaming", lat, t_stream)):
+        print(f"{name:10} {np.mean(l):10.3f} {np.percentile(l, 95):10.3f} {t:10.3f} {t / dur:7.4f}")
+    print(f"streaming held at most {held} frames ({held * 256 / sr:.1f} s of contour) of {stream.stats()['frames']}")
+
+    # agreement
+    b, s = batch["per_word"], result["per_word"]
+    ops_b = {r["expected_idx"]: (r["op"], r["actual_idx"]) for r in b if r["expected_idx"] is not None}
+    ops_s = {r["expected_idx"]: (r["op"], r["actual_idx"]) for r in s if r["expected_idx"] is not None}
+    same_ops = sum(ops_b[i] == ops_s.get(i) for i in ops_b)
+    print(f"expected words aligned identically: {same_ops}/{len(ops_b)} (entries: batch {len(b)}, streaming {len(s)})")
+    by_actual = {r["actual_idx"]: r for r in b if r["actual_idx"] is not None}
+    f0_diff, en_diff, rel_same, n = [], [], 0, 0
+    for r in s:
+        other = by_actual.get(r["actual_idx"])
+        if other is None or r["prosody"]["f0_mean_hz"] is None:
+            continue
+        n += 1
+        f0_diff.append(abs(r["prosody"]["f0_mean_hz"] - other["prosody"]["f0_mean_hz"]))
+        en_diff.append(abs(r["prosody"]["energy_db_mean"] - other["prosody"]["energy_db_mean"]))
+        rel_same += r["prosody"]["prosody_reliable"] == other["prosody"]["prosody_reliable"]
+    print(f"per-word prosody over {n} words: |f0 diff| median {np.median(f0_diff):.2f} Hz, "
+          f"|energy diff| max {np.max(en_diff):.3f} dB, reliability agrees {rel_same}/{n}")
+    for k in ("word_accuracy", "wpm", "avg_pause_s", "utterance_duration_s"):
+        print(f"  {k:22} batch {batch['summary'][k]:>8} streaming {result['summary'][k]:>8}")
+    for k in ("avg_f0_hz", "f0_std_hz_over_words", "avg_energy_db", "prosody_coverage"):
+        print(f"  {k:22} batch {batch['summary']['prosody'][k]:>8} streaming {result['summary']['prosody'][k]:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Frames/sec of the VADSegmenter utterance state machine on one core (no microphone needed).
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.vad_frames --wav api/test.wav --repeat 50
+
+The input stream is the wav repeated with --gap-s of low-level noise between copies, cut into
+frame_ms frames. "rolling" is the current VADSegmenter; "recount" re-runs VAD over the whole
+pre-roll ring on every untriggered frame and concatenates frame lists, as the streamer used to.
+"""
+
+import argparse
+import os
+import time
+from collections import deque
+
+import numpy as np
+import soundfile as sf
+
+from asr import VADSegmenter, VADConfig
+
+
+class _CountingVad:
+    def __init__(self, vad):
+        self.vad = vad
+        self.calls = 0
+
+    def is_speech(self, buf, sr):
+        self.calls += 1
+        return self.vad.is_speech(buf, sr)
+
+
+def _recount(vad, frames, cfg: VADConfig, on_utterance):
+    sr = cfg.sample_rate
+    end_silence_frames = int(cfg.end_silence_ms / cfg.frame_ms)
+    max_frames = int(cfg.max_utterance_s * 1000 / cfg.frame_ms)
+    ring = deque(maxlen=int(cfg.pre_roll_ms / cfg.frame_ms))
+    triggered, voiced_frames, silence_count = False, [], 0
+    for frame in frames:
+        is_speech = vad.is_speech(frame.tobytes(), sr)
+        if not triggered:
+            ring.append(frame)
+            if len(ring) == ring.maxlen:
+                voiced = sum(1 for f in ring if vad.is_speech(f.tobytes(), sr))
+                if voiced > 0.6 * len(ring):
+                    triggered, voiced_frames, silence_count = True, list(ring), 0
+                    ring.clear()
+        else:
+            voiced_frames.append(frame)
+            silence_count = 0 if is_speech else silence_count + 1
+            if silence_count > end_silence_frames or len(voiced_frames) >= max_frames:
+                on_utterance(np.concatenate(voiced_frames, axis=0).astype(np.int16))
+                triggered, voiced_frames, silence_count = False, [], 0
+
+
+def _stream(wav: str, repeat: int, gap_s: float, cfg: VADConfig):
+    speech, sr = sf.read(wav, dtype="int16", always_2d=False)
+    if speech.ndim > 1:
+        speech = speech[:, 0]
+    assert sr == cfg.sample_rate, f"benchmark wav must be {cfg.sample_rate} Hz"
+    rng = np.random.default_rng(0)
+    gap = (rng.standard_normal(int(gap_s * sr)) * 3).astype(np.int16)
+    audio = np.concatenate([np.concatenate([gap, speech]) for _ in range(repeat)])
+    frame_len = int(sr * cfg.frame_ms / 1000)
+    n = len(audio) // frame_len
+    return [audio[i * frame_len:(i + 1) * frame_len] for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--wav", type=str, default="api/test.wav")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--gap-s", type=float, default=3.0, help="Background noise between utterances")
+    parser.add_argument("--runs", type=int, default=5, help="Report the best of N runs")
+    args = parser.parse_args()
+
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {sorted(os.sched_getaffinity(0))[0]})
+
+    cfg = VADConfig()
+    frames = _stream(args.wav, args.repeat, args.gap_s, cfg)
+    print(f"{len(frames)} frames of {cfg.frame_ms} ms ({len(frames) * cfg.frame_ms / 1000:.0f} s of audio)")
+    print(f"{'impl':8} {'frames/s':>10} {'x realtime':>10} {'vad/frame':>9} {'utts':>5}")
+
+    for name in ("rolling", "recount"):
+        best = float("inf")
+        for _ in range(args.runs):
+            segmenter = VADSegmenter(cfg)
+            vad = _CountingVad(segmenter.vad)
+            utts = []
+            t0 = time.perf_counter()
+            if name == "rolling":
+                segmenter.vad = vad
+                for frame in frames:
+                    utt = segmenter.push(frame)
+                    if utt is not None:
+                        utts.append(utt)
+            else:
+                _recount(vad, frames, cfg, utts.append)
+            best = min(best, time.perf_counter() - t0)
+        fps = len(frames) / best
+        print(f"{name:8} {fps:10.0f} {fps * cfg.frame_ms / 1000:10.0f} {vad.calls / len(frames):9.2f} {len(utts):5d}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Per-word prosody stats: scorer._word_prosody_vectorized vs the per-word loop (_word_prosody_loop),
+for 1 to 1000 words; every run checks that both produce identical per-word records (bit-compatible
+values, same reliability reasons). _word_prosody takes the loop up to WORD_PROSODY_LOOP_MAX_WORDS
+words, where the vectorized pass's fixed overhead outweighs it, and the vectorized pass above.
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.word_prosody
+  python -m benchmarks.word_prosody --words 1 3 6 10 100 1000 --repeat 20
+
+Contours are synthetic (hop 256 at 16 kHz, ~3.3 words/s, voicing gaps and a few octave errors),
+so no audio or pitch tracking is involved: the timings isolate the per-word stage.
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from scoring.scorer import WORD_PROSODY_LOOP_MAX_WORDS, _word_prosody_loop, _word_prosody_vectorized
+
+
+def _contours(n_words: int, rng, sr: int = 16000, hop: int = 256):
+    n_frames = int(n_words * 0.3 * sr / hop) + 8
+    times = (np.arange(n_frames) * hop / sr).astype(np.float32)
+    f0_raw = (180.0 + 30.0 * np.sin(np.arange(n_frames) / 40.0) + rng.normal(0, 5, n_frames)).astype(np.float32)
+    f0_raw[rng.random(n_frames) < 0.3] = np.nan                               # unvoiced frames
+    f0_raw[rng.random(n_frames) < 0.02] *= 4.0                                 # octave errors -> outliers
+    f0_raw[int(n_frames * 0.4):int(n_frames * 0.45)] = np.nan                  # a fully unvoiced stretch
+    f0_smoothed = np.convolve(np.nan_to_num(f0_raw, nan=180.0), np.ones(3, np.float32) / 3, mode="same").astype(np.float32)
+    energy = (-30.0 + rng.normal(0, 6, n_frames)).astype(np.float32)
+    energy[int(n_frames * 0.6):int(n_frames * 0.62)] = -95.0                   # near-silent stretch
+    edges = np.sort(rng.uniform(0, times[-1], 2 * n_words))
+    words = [{"word": f"w{i}", "start": float(edges[2 * i]), "end": float(edges[2 * i + 1])} for i in range(n_words)]
+    words[0]["end"] = words[0]["start"]                                        # zero-length word
+    return words, times, f0_raw, f0_smoothed, energy, ~np.isnan(f0_raw)
+
+
+def _best_ms(fn, args, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--words", type=int, nargs="+", default=[1, 3, 10, 30, 100, 300, 1000])
+    ap.add_argument("--repeat", type=int, default=10)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'words':>6} {'loop ms':>9} {'vector ms':>10} {'speedup':>8}  identical  (_word_prosody: loop up to {WORD_PROSODY_LOOP_MAX_WORDS})")
+    for n in args.words:
+        inputs = _contours(n, rng)
+        identical = _word_prosody_loop(*inputs) == _word_prosody_vectorized(*inputs)
+        loop = _best_ms(_word_prosody_loop, inputs, args.repeat)
+        vec = _best_ms(_word_prosody_vectorized, inputs, args.repeat)
+        print(f"{n:6d} {loop:9.2f} {vec:10.2f} {loop / vec:7.1f}x  {'yes' if identical else 'NO'}")
+        if not identical:
+            raise SystemExit(f"vectorized per-word prosody differs from the loop at {n} words")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Latency and word-boundary agreement of the two word-timing backends:
+  whisperx: ASR decode, then wav2vec2 CTC alignment (WhisperXAligner.align_segments)
+  whisper:  one decode with faster-whisper word_timestamps (WhisperTimestampAligner)
+
+Run from speech_therapy_ml/:
+  python -m benchmarks.word_timing --wav api/test.wav
+  python -m benchmarks.word_timing --wav a.wav b.wav c.wav --repeat 5
+
+Both backends are warmed up first. WhisperX is the reference for timing accuracy: words are
+paired by normalized text (SequenceMatcher), and the report gives the absolute start/end
+differences of the paired words plus the share of boundaries within 50 / 100 ms.
+"""
+
+import argparse
+import time
+from difflib import SequenceMatcher
+
+import numpy as np
+import soundfile as sf
+
+from asr import get_asr
+from asr.asr import _norm_word
+from scoring.aligner import WhisperXAligner, WhisperTimestampAligner
+
+
+def _load(path: str):
+    audio, sr = sf.read(path, dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    return audio, sr
+
+
+def _words(aligned: dict) -> list:
+    return [w for seg in aligned.get("segments", []) for w in seg.get("words", [])
+            if "start" in w and "end" in w]
+
+
+def _boundary_diffs(reference: list, hypothesis: list) -> tuple:
+    """(start diffs, end diffs, paired count) over words matched by normalized text."""
+    ref_norm = [_norm_word(w["word"]) for w in reference]
+    hyp_norm = [_norm_word(w["word"]) for w in hypothesis]
+    starts, ends, paired = [], [], 0
+    for block in SequenceMatcher(a=ref_norm, b=hyp_norm, autojunk=False).get_matching_blocks():
+        for k in range(block.size):
+            r, h = reference[block.a + k], hypothesis[block.b + k]
+            starts.append(abs(float(r["start"]) - float(h["start"])))
+            ends.append(abs(float(r["end"]) - float(h["end"])))
+            paired += 1
+    return starts, ends, paired
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--wav", nargs="+", default=["api/test.wav"])
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    clips = [_load(p) for p in args.wav]
+    asr = get_asr()
+    wx = WhisperXAligner()
+    wx.warm_up("en")
+    fast = WhisperTimestampAligner(asr)
+    audio, sr = clips[0]
+    asr.transcribe_numpy(audio, sr)  # first-call allocations out of the timings
+    fast.transcribe_aligned(audio, sr)
+
+    timings = {"whisperx": [], "whisper": []}
+    starts, ends, paired, total = [], [], 0, 0
+    for rep in range(args.repeat):
+        for audio, sr in clips:
+            t0 = time.perf_counter()
+            _, segments = asr.transcribe_numpy(audio, sr)
+            reference = wx.align_segments(segments, audio, sr, language="en")
+            timings["whisperx"].append(time.perf_counter() - t0)
+            t0 = time.perf_counter()
+            _, _, hypothesis = fast.transcribe_aligned(audio, sr)
+            timings["whisper"].append(time.perf_counter() - t0)
+            if rep == 0:  # decoding is deterministic; compare boundaries once per file
+                s, e, p = _boundary_diffs(_words(reference), _words(hypothesis))
+                starts += s
+                ends += e
+                paired += p
+                total += len(_words(reference))
+
+    n = len(timings["whisperx"])
+    print(f"{n} utterances ({len(clips)} files x {args.repeat}), {sum(len(a) / s for a, s in clips):.1f} s of audio per pass")
+    for name, ts in timings.items():
+        print(f"{name:9} mean {np.mean(ts) * 1000:8.1f} ms   p95 {np.percentile(ts, 95) * 1000:8.1f} ms")
+    print(f"speedup (whisperx / whisper mean): {np.mean(timings['whisperx']) / np.mean(timings['whisper']):.2f}x")
+    print(f"paired words: {paired}/{total} reference words")
+    if not paired:
+        return
+    print(f"{'boundary':8} {'mean ms':>8} {'median':>8} {'p90':>8} {'<=50ms':>7} {'<=100ms':>8}")
+    for name, d in (("start", np.asarray(starts)), ("end", np.asarray(ends))):
+        print(f"{name:8} {d.mean() * 1000:8.1f} {np.median(d) * 1000:8.1f} {np.percentile(d, 90) * 1000:8.1f} "
+              f"{(d <= 0.05).mean() * 100:6.0f}% {(d <= 0.10).mean() * 100:7.0f}%")
+
+
+if __name__ == "__main__":
+    main()
@@ -11,11 +11,6 @@ from typing import Optional, Tuple
 from dotenv import load_dotenv
 load_dotenv()
 
-try:
-    from openai import AzureOpenAI
-except Exception:
-    AzureOpenAI = None
-
 from . import state as state_module
 
 class Coach:
@@ -24,8 +19,9 @@ class Coach:
         self.api_key = os.getenv("AZURE_OPENAI_KEY")
         self.endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
         self.client = None
-        if AzureOpenAI is not None and self.api_key and self.endpoint and self.deployment:
+        if self.api_key and self.endpoint and self.deployment:
             try:
+                from openai import AzureOpenAI  # deferred: only needed when Azure is configured
                 self.client = AzureOpenAI(api_key=self.api_key, api_version="2024-05-01-preview", azure_endpoint=self.endpoint)
             except Exception:
                 self.client = None
@@ -25,19 +25,21 @@ from typing import Optional
 from dotenv import load_dotenv
 load_dotenv()
 
-# audio I/O
-import sounddevice as sd
+# audio I/O (sounddevice is imported where a device is actually used)
 import soundfile as sf
 import numpy as np
 
 # core modules (your existing code)
 try:
-    from asr import get_asr, VADStreamer, VADConfig
+    from asr import get_asr, VADStreamer, VADConfig, ASRCascade, CascadeConfig, trim_silence, AudioBuffer
 except Exception:
     from asr.asr import get_asr, VADStreamer, VADConfig
+    from asr.cascade import ASRCascade, CascadeConfig
+    from asr.trim import trim_silence
+    from asr.audio import AudioBuffer
 
-from scoring.aligner import WhisperXAligner
-from scoring.scorer import Scorer
+from scoring.aligner import WhisperXAligner, FORCED_MIN_CONFIDENCE
+from scoring.scorer import Scorer, ScorerConfig
 from scoring.azure_tts import AzureTTS
 from scoring.feedback import FeedbackGenerator
 
@@ -47,6 +49,7 @@ from .bot import Coach
 # small helper
 def _play_wav_file(path: str):
     try:
+        import sounddevice as sd
         data, sr = sf.read(path, dtype="float32")
         sd.play(data, sr)
         sd.wait()
@@ -63,15 +66,23 @@ class InteractiveSession:
                  repeat_threshold: float = 0.75,
                  max_repeats: int = 2,
                  use_azure_tts: bool = True,
-                 default_age: str = "adult"):
+                 default_age: str = "adult",
+                 align_mode: str = "asr",
+                 asr_cascade: bool = False,
+                 pitch_backend: str = "pyin",
+                 user_id: str = "local"):
         self.sample_rate = sample_rate
+        self.align_mode = align_mode  # "asr" (decode then align) | "forced" (align expected text, ASR only as fallback)
         self.default_duration = default_duration
         self.repeat_threshold = repeat_threshold
         self.max_repeats = max_repeats
         self.default_age = default_age
+        self.user_id = user_id  # keys the scorer's per-speaker F0 profile
 
         # instantiate ASR & aligner & scorer
-        self.asr = get_asr()
+        # asr_cascade: base/beam-1 first, escalate to small only when the attempt looks unclear or off-script
+        self.asr_cascade = asr_cascade
+        self.asr = ASRCascade.from_config(CascadeConfig(), pool_size=1) if asr_cascade else get_asr()
         self.aligner = WhisperXAligner(device=None)
         self.azure_tts = None
         if use_azure_tts:
@@ -89,7 +100,7 @@ class InteractiveSession:
             print("[session] Feedback will use a local fallback.")
             self.feedback_gen = None
 
-        self.scorer = Scorer(azure_tts=self.azure_tts, sample_rate=self.sample_rate)
+        self.scorer = Scorer(azure_tts=self.azure_tts, sample_rate=self.sample_rate, cfg=ScorerConfig(pitch_backend=pitch_backend))
         self.coach = Coach()
 
         # runtime state
@@ -117,28 +128,59 @@ class InteractiveSession:
         """Record a mono int16 buffer for duration_s seconds and return numpy array (int16)."""
         dur = max(1, int(duration_s))
         print(f"[session] Recording for {dur} seconds...")
+        import sounddevice as sd
         data = sd.rec(int(dur * self.sample_rate), samplerate=self.sample_rate, channels=1, dtype="int16")
         sd.wait()
         return data.squeeze()
 
     def process_attempt(self, expected_text: str, audio_np: np.ndarray, asr_hypothesis: Optional[str] = None, save_wav: Optional[str] = None) -> dict:
-        """Transcribe -> align -> score. Returns scoring result (dict)."""
+        """Transcribe -> align -> score (or forced-align -> score). Returns scoring result (dict)."""
         if save_wav:
             try:
                 sf.write(save_wav, audio_np, self.sample_rate)
             except Exception as e:
                 print("[session] Could not save wav:", e)
 
+        # one read-only float32 16 kHz buffer for ASR, alignment and scoring (converted once, never copied)
+        buf = AudioBuffer.from_array(audio_np, self.sample_rate)
+        # fixed-length recordings are often mostly silence: drop it once, map word times back when scoring
+        trim = trim_silence(buf, buf.sample_rate)
+        if trim.trimmed:
+            buf = AudioBuffer.from_array(trim.audio, buf.sample_rate)
+        audio_np, sr, time_map = buf, buf.sample_rate, (trim.to_original_s if trim.trimmed else None)
+
+        forced_confidence = None
+        if self.align_mode == "forced":
+            try:
+                aligned, forced_confidence = self.aligner.force_align(expected_text, audio_np, sample_rate=sr, language="en")
+                if forced_confidence >= FORCED_MIN_CONFIDENCE:
+                    result = self.scorer.score_utterance(expected_text=expected_text,
+                                                         aligned_result=aligned,
+                                                         audio_np=audio_np,
+                                                         audio_sr=sr,
+                                                         asr_hypothesis=None,
+                                                         debug=False,
+                                                         time_map=time_map,
+                                                         speaker_id=self.user_id)
+                    result["_meta"] = {"asr_text": None, "mode": "forced", "forced_confidence": round(forced_confidence, 3)}
+                    return result
+                print(f"[session] Forced alignment confidence {forced_confidence:.2f} too low; running ASR.")
+            except Exception as e:
+                print("[session] Forced alignment failed:", e)
+
         # ASR
         try:
-            asr_text, segments = self.asr.transcribe_numpy(audio_np, sample_rate=self.sample_rate)
+            if self.asr_cascade:
+                asr_text, segments = self.asr.transcribe_numpy(audio_np, sample_rate=sr, expected_text=expected_text)
+            else:
+                asr_text, segments = self.asr.transcribe_numpy(audio_np, sample_rate=sr)
         except Exception as e:
             print("[session] ASR failed:", e)
             asr_text, segments = (asr_hypothesis or "", [])
 
         # Align
         try:
-            aligned = self.aligner.align_segments(segments, audio_np, sample_rate=self.sample_rate, language="en", return_char_alignments=False)
+            aligned = self.aligner.align_segments(segments, audio_np, sample_rate=sr, language="en", return_char_alignments=False)
         except Exception as e:
             print("[session] Alignment failed:", e)
             aligned = {"segments": segments}
@@ -148,9 +190,11 @@ class InteractiveSession:
             result = self.scorer.score_utterance(expected_text=expected_text,
                                                  aligned_result=aligned,
                                                  audio_np=audio_np,
-                                                 audio_sr=self.sample_rate,
+                                                 audio_sr=sr,
                                                  asr_hypothesis=asr_text,
-                                                 debug=False)
+                                                 debug=False,
+                                                 time_map=time_map,
+                                                 speaker_id=self.user_id)
         except Exception as e:
             print("[session] Scoring failed:", e)
             result = {
@@ -162,6 +206,8 @@ class InteractiveSession:
 
         # attach some meta
         result["_meta"] = {"asr_text": asr_text}
+        if forced_confidence is not None:
+            result["_meta"].update({"mode": "forced_fallback_asr", "forced_confidence": round(forced_confidence, 3)})
         return result
 
     def give_feedback(self, scoring_result: dict, play: bool = True, age_group: Optional[str] = None) -> str:
@@ -293,6 +339,10 @@ def main():
     parser.add_argument("--no-play", action="store_true", help="Don't play TTS feedback")
     parser.add_argument("--save", type=str, default=None, help="Directory to save per-attempt JSON (optional)")
     parser.add_argument("--age", choices=["kid", "teen", "adult"], default="adult", help="Age group for feedback tone")
+    parser.add_argument("--align-mode", choices=["asr", "forced"], default="asr", help="forced: align the expected text directly, ASR only as fallback")
+    parser.add_argument("--asr-cascade", action="store_true", help="Decode with a small fast model first; rerun with the full model only when unsure")
+    parser.add_argument("--user-id", default="local", help="Speaker id for the per-speaker pitch range profile")
+    parser.add_argument("--pitch-backend", choices=["pyin", "yin", "nccf"], default="pyin", help="Pitch tracker for prosody (yin/nccf are much faster)")
     args = parser.parse_args()
 
     sess = InteractiveSession(sample_rate=16000,
@@ -300,7 +350,11 @@ def main():
                               repeat_threshold=args.repeat_threshold,
                               max_repeats=args.max_repeats,
                               use_azure_tts=True,
-                              default_age=args.age)
+                              default_age=args.age,
+                              align_mode=args.align_mode,
+                              asr_cascade=args.asr_cascade,
+                              pitch_backend=args.pitch_backend,
+                              user_id=args.user_id)
     try:
         sess.run_guided(save_sessions_dir=args.save, play_feedback=not args.no_play)
     except KeyboardInterrupt:
@@ -1,5 +1,11 @@
 from .aligner import WhisperXAligner
+from .align_batching import AlignBatcher, AlignBatchConfig
 from .azure_tts import AzureTTS
-from .scorer import Scorer
+from .scorer import Scorer, ScorerConfig
+from .streaming import StreamingScorer
+from .pitch import get_pitch_backend
+from .features import FeatureFrames
+from .gop import CTCEmissions, word_gop
+from .phonemes import get_phoneme_index
 
-__all__ = ["WhisperXAligner", "AzureTTS", "Scorer"]
+__all__ = ["WhisperXAligner", "AlignBatcher", "AlignBatchConfig", "AzureTTS", "Scorer", "ScorerConfig", "StreamingScorer", "get_pitch_backend", "FeatureFrames", "CTCEmissions", "word_gop", "get_phoneme_index"]
@@ -0,0 +1,106 @@
+"""
+speech_therapy_ml/scoring/align_batching.py
+
+AlignBatcher:
+  - Async micro-batching front-end for WhisperXAligner (the alignment counterpart of asr.ASRBatcher)
+  - Collects concurrent align requests for up to max_wait_ms (or max_batch_size items), per language
+  - Runs each batch through one align_batch call (batched wav2vec2 forward passes) in a worker thread
+    and resolves every caller with its own result
+  - A batch of one short request goes through align_segments, exactly as without the batcher
+
+Usage (inside a running event loop):
+  batcher = AlignBatcher(aligner, AlignBatchConfig(max_batch_size=8, max_wait_ms=10))
+  aligned = await batcher.align(asr_segments, audio_np, 16000, "en")
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+import numpy as np
+
+
+@dataclass
+class AlignBatchConfig:
+    max_batch_size: int = 8        # upper bound on utterances per align_batch call
+    max_wait_ms: float = 10.0      # how long the first request waits for company
+    slices_per_pass: int = 8       # wav2vec2 batch size inside align_batch
+
+
+class AlignBatcher:
+    """Queues alignment requests and flushes them as align_batch calls, one language per call."""
+    def __init__(self, aligner, cfg: AlignBatchConfig = AlignBatchConfig()):
+        assert cfg.max_batch_size >= 1, "max_batch_size must be >= 1"
+        self.aligner = aligner
+        self.cfg = cfg
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.stats: Dict[str, int] = {"requests": 0, "batches": 0, "largest_batch": 0}
+
+    def start(self):
+        """Start the collector task on the running loop (called lazily by align)."""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.get_running_loop().create_task(self._collect())
+
+    async def stop(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def align(self, asr_segments: list, audio_np: np.ndarray, sample_rate: int, language: str = "en") -> dict:
+        """Same contract as WhisperXAligner.align_segments, but shares wav2vec2 passes with concurrent callers."""
+        self.start()
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((asr_segments, audio_np, sample_rate, language, fut))
+        return await fut
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        max_wait_s = self.cfg.max_wait_ms / 1000.0
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + max_wait_s
+            while len(batch) < self.cfg.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            # one aligner, one align model per language: batches run one after another
+            await self._align(batch)
+
+    async def _align(self, batch: list):
+        # callers that went away (client disconnect) don't need an alignment
+        batch = [item for item in batch if not item[4].done()]
+        by_language: Dict[str, list] = {}
+        for item in batch:
+            by_language.setdefault(item[3], []).append(item)
+
+        for language, items in by_language.items():
+            self.stats["requests"] += len(items)
+            self.stats["batches"] += 1
+            self.stats["largest_batch"] = max(self.stats["largest_batch"], len(items))
+            try:
+                if len(items) == 1 and len(items[0][0]) <= 1:
+                    segments, audio, sr, _, _ = items[0]
+                    results = [await asyncio.to_thread(self.aligner.align_segments, segments, audio, sr, language)]
+                else:
+                    results = await asyncio.to_thread(self.aligner.align_batch, [item[:3] for item in items], language,
+                                                      False, self.cfg.slices_per_pass)
+            except Exception as e:
+                for item in items:
+                    if not item[4].done():
+                        item[4].set_exception(e)
+                continue
+            for item, res in zip(items, results):
+                if not item[4].done():
+                    item[4].set_result(res)
@@ -5,49 +5,242 @@ Usage:
   aligner = WhisperXAligner(device="cpu")
   aligned_result = aligner.align_segments(asr_segments, audio_np, sample_rate, language="en")
   # aligned_result is the whisperx result dict containing 'segments' each with 'words': [{'text','start','end','confidence'}]
+
+  # forced mode: align the expected text directly (no ASR decode)
+  aligned_result, confidence = aligner.force_align("ship sheep", audio_np, sample_rate, language="en")
+
+  # at startup: load the align model and run one dummy alignment
+  aligner.warm_up(language="en")
+
+  # several languages: bounded LRU of align models (by count and by parameter memory)
+  aligner = WhisperXAligner(max_models=3, max_memory_mb=2048)
+  aligner.preload(["en", "hi"])
+
+  # several utterances at once: one batched wav2vec2 pass, per-item trellis/backtrack
+  results = aligner.align_batch([(segments_a, audio_a, 16000), (segments_b, audio_b, 16000)], language="en")
+
+  # aligned_result["emissions"]: the CTC frame posteriors the alignment computed (scoring/gop.py), float16;
+  # the scorer turns them into per-letter goodness-of-pronunciation scores. keep_emissions=False drops them.
+
+  # fast mode: word timings from the Whisper decode itself (no wav2vec2 pass)
+  text, segments, aligned_result = WhisperTimestampAligner(get_asr()).transcribe_aligned(audio_np, 16000)
 """
 
+import hashlib
 import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
 import numpy as np
 import warnings
 warnings.filterwarnings("ignore", category=UserWarning)
 
-try:
-    import whisperx
-except Exception as e:
-    raise ImportError("whisperx is required for alignment. Install `pip install whisperx`. Error: " + str(e))
+from .gop import CTCEmissions
+
+# whisperx and torch are imported on first use: importing this module stays cheap.
+def _whisperx():
+    try:
+        import whisperx
+    except Exception as e:
+        raise ImportError("whisperx is required for alignment. Install `pip install whisperx`. Error: " + str(e))
+    return whisperx
+
+def _cuda_available() -> bool:
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except Exception:
+        return False
+
+# whisperx slices segments at its own fixed rate and pads slices shorter than this (wav2vec2 minimum)
+_WX_SAMPLE_RATE = 16000
+_WX_MIN_SAMPLES = 400
+
+def _clean_segments(asr_segments: list) -> list:
+    # whisperx.align expects segments in whisperx output format. The minimal required keys are 'start','end','text'.
+    return [{"start": float(s.get("start", 0.0)), "end": float(s.get("end", 0.0)), "text": str(s.get("text", "")).strip()}
+            for s in asr_segments]
+
+def _waveform_key(waveform: np.ndarray) -> tuple:
+    w = np.ascontiguousarray(waveform, dtype=np.float32).reshape(-1)
+    return w.size, hashlib.blake2b(w.tobytes(), digest_size=16).digest()
+
+class _PrecomputedEmissions:
+    """
+    Stands in for the wav2vec2 model inside whisperx.align: returns logits that align_batch computed
+    in batched forward passes, keyed by the exact waveform slice whisperx asks for. Slices it has not
+    seen (shouldn't happen) go to the real model, so the result never depends on the lookup.
+    """
+    def __init__(self, model, model_type: str, table: dict):
+        self.model = model
+        self.model_type = model_type
+        self.table = table
 
-import torch
+    def __call__(self, waveform, lengths=None):
+        logits = self.table.get(_waveform_key(waveform.detach().cpu().numpy()))
+        if self.model_type == "torchaudio":
+            return (logits, None) if logits is not None else self.model(waveform, lengths=lengths)
+        if logits is not None:
+            return _Logits(logits)
+        return self.model(waveform)
+
+class _Logits:
+    def __init__(self, logits):
+        self.logits = logits
+
+class _EmissionRecorder:
+    """
+    Wraps the model (or _PrecomputedEmissions) inside whisperx.align and keeps each slice's output as
+    float16 log-softmax, keyed like _PrecomputedEmissions, so GOP needs no second wav2vec2 pass.
+    """
+    def __init__(self, model, model_type: str):
+        self.model = model
+        self.model_type = model_type
+        self.emissions = {}
+
+    def __call__(self, waveform, lengths=None):
+        import torch
+        if self.model_type == "torchaudio":
+            out = self.model(waveform, lengths=lengths)
+            logits = out[0]
+        else:
+            out = self.model(waveform)
+            logits = out.logits
+        log_probs = torch.log_softmax(logits[0].float(), dim=-1).cpu().numpy().astype(np.float16)
+        self.emissions[_waveform_key(waveform.detach().cpu().numpy())] = log_probs
+        return out
+
+    def collect(self, segments: list, audio: np.ndarray, dictionary: dict):
+        """One CTCEmissions over the segments whisperx aligned (the slices it cut, in segment order), or None."""
+        duration = len(audio) / float(_WX_SAMPLE_RATE)
+        parts, blocks, offset = [], [], 0
+        for seg in segments:
+            if not seg["text"] or seg["start"] >= duration:
+                continue
+            w = audio[int(seg["start"] * _WX_SAMPLE_RATE):int(seg["end"] * _WX_SAMPLE_RATE)]
+            if w.size < _WX_MIN_SAMPLES:
+                w = np.pad(w, (0, _WX_MIN_SAMPLES - w.size))
+            e = self.emissions.get(_waveform_key(w))
+            if e is None or len(e) == 0:
+                continue
+            # whisperx's frame -> time ratio: segment duration over (frames - 1)
+            blocks.append((seg["start"], (seg["end"] - seg["start"]) / max(1, len(e) - 1), offset, len(e)))
+            parts.append(e)
+            offset += len(e)
+        if not parts:
+            return None
+        labels = {str(c): int(i) for c, i in dictionary.items()}
+        blank = labels.get("[pad]", labels.get("<pad>", 0))
+        return CTCEmissions(np.concatenate(parts), blocks, labels, blank)
+
+# forced-alignment defaults (mean wav2vec2 CTC character posterior per word, 0..1)
+FORCED_WORD_THRESHOLD = 0.3    # words below this are treated as missed / substituted
+FORCED_MIN_CONFIDENCE = 0.5    # utterance confidence below this -> fall back to full ASR
+
+def _model_nbytes(model) -> int:
+    """Parameter + buffer memory of a torch module (0 if it isn't one)."""
+    try:
+        tensors = list(model.parameters()) + list(model.buffers())
+    except Exception:
+        return 0
+    return sum(t.numel() * t.element_size() for t in tensors)
 
 class WhisperXAligner:
-    def __init__(self, device: str | None = None):
+    def __init__(self, device: str | None = None, max_models: int = 2, max_memory_mb: float | None = None,
+                 keep_emissions: bool = True):
         """
         device: "cuda" or "cpu" or None -> auto
+        max_models: align models (one per language) kept loaded; least recently used is evicted
+        max_memory_mb: also evict while loaded models exceed this (the newest model always stays)
+        keep_emissions: attach the alignment's CTC emissions to each result as aligned["emissions"]
         """
-        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
-        self._align_model = None
-        self._metadata = None
-        # cache the align model per language
-        self._loaded_lang = None
-
-    def _ensure_align_model(self, language: str = "en"):
-        if self._align_model is not None and self._loaded_lang == language:
-            return
-        # load alignment model for language. whisperx will pick a suitable model (wav2vec2-based).
-        self._align_model, self._metadata = whisperx.load_align_model(language_code=language, device=self.device)
-        self._loaded_lang = language
+        self.device = device or ("cuda" if _cuda_available() else "cpu")
+        self.keep_emissions = keep_emissions
+        self.max_models = max(1, max_models)
+        self.max_memory_bytes = int(max_memory_mb * 1024 * 1024) if max_memory_mb else None
+        # language -> (model, metadata, nbytes), least recently used first
+        self._models: "OrderedDict[str, tuple]" = OrderedDict()
+        self._loading: dict = {}  # language -> Future shared by concurrent first requests
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "coalesced": 0, "loads": 0, "evictions": 0}
+
+    def _ensure_align_model(self, language: str = "en") -> tuple:
+        """Return (model, metadata) for `language`, loading it at most once however many threads ask."""
+        with self._lock:
+            entry = self._models.get(language)
+            if entry is not None:
+                self._models.move_to_end(language)
+                self._counters["hits"] += 1
+                return entry[0], entry[1]
+            pending = self._loading.get(language)
+            owner = pending is None
+            if owner:
+                pending = self._loading[language] = Future()
+            else:
+                self._counters["coalesced"] += 1
+        if not owner:
+            return pending.result()  # re-raises the loader's error
+
+        try:
+            # load alignment model for language. whisperx will pick a suitable model (wav2vec2-based).
+            model, metadata = _whisperx().load_align_model(language_code=language, device=self.device)
+        except BaseException as e:
+            with self._lock:
+                self._loading.pop(language, None)
+            pending.set_exception(e)
+            raise
+        with self._lock:
+            self._models[language] = (model, metadata, _model_nbytes(model))
+            self._counters["loads"] += 1
+            self._evict()
+            self._loading.pop(language, None)
+        pending.set_result((model, metadata))
+        return model, metadata
+
+    def _evict(self):
+        # caller holds self._lock; in-flight users of an evicted model keep their own reference
+        def over() -> bool:
+            if len(self._models) > self.max_models:
+                return True
+            return self.max_memory_bytes is not None and sum(e[2] for e in self._models.values()) > self.max_memory_bytes
+        while len(self._models) > 1 and over():
+            self._models.popitem(last=False)
+            self._counters["evictions"] += 1
+
+    def preload(self, languages: list):
+        """Load align models for `languages` (e.g. at startup). Later entries win if capacity is short."""
+        for language in languages:
+            self._ensure_align_model(language)
+
+    def stats(self) -> dict:
+        with self._lock:
+            out = dict(self._counters)
+            out["loaded"] = list(self._models)
+            out["memory_mb"] = round(sum(e[2] for e in self._models.values()) / (1024 * 1024), 1)
+            out["max_models"] = self.max_models
+            out["max_memory_mb"] = round(self.max_memory_bytes / (1024 * 1024), 1) if self.max_memory_bytes else None
+        return out
+
+    def warm_up(self, language: str = "en", sample_rate: int = 16000) -> dict:
+        """Load the align model for `language` and align a dummy one-word segment, so the first
+        real request doesn't stall on model download/load and first-call allocations."""
+        self._ensure_align_model(language)
+        audio = np.random.default_rng(0).normal(0.0, 0.01, sample_rate).astype(np.float32)
+        return self.align_segments([{"start": 0.0, "end": 1.0, "text": "hello"}], audio, sample_rate, language=language)
 
     @staticmethod
     def _ensure_float32(audio: np.ndarray, sr: int, target_sr: int = 16000) -> np.ndarray:
         """WhisperX expects float32 waveform, shape (n,) normalized to [-1,1]. If sampling rate mismatch, resample using librosa if installed."""
         import numpy as np
+        if hasattr(audio, "at_rate"):
+            # asr.AudioBuffer: already float32 mono; resampled variants are cached on the buffer
+            return audio.at_rate(target_sr)
         audio = np.asarray(audio)
         if audio.dtype == np.int16:
-            audio = (audio.astype(np.float32) / 32768.0).astype(np.float32)
-        elif audio.dtype == np.float32:
             audio = audio.astype(np.float32)
+            audio /= 32768.0
         else:
-            audio = audio.astype(np.float32)
+            audio = audio.astype(np.float32, copy=False)
 
         # resample if needed
         if sr != target_sr:
@@ -73,19 +266,179 @@ class WhisperXAligner:
         Returns:
           - whisperx-style result dict after alignment (contains 'segments' with 'words' list)
         """
-        self._ensure_align_model(language=language)
+        align_model, metadata = self._ensure_align_model(language=language)
         # ensure float32 16k mono
-        audio = self._ensure_float32(audio_np, sr=sample_rate, target_sr=self._metadata.get("sample_rate", 16000) if isinstance(self._metadata, dict) and self._metadata.get("sample_rate") else 16000)
+        audio = self._ensure_float32(audio_np, sr=sample_rate, target_sr=metadata.get("sample_rate", 16000) if isinstance(metadata, dict) and metadata.get("sample_rate") else 16000)
 
         device = self.device
-        # whisperx.align expects segments in whisperx output format. The minimal required keys are 'start','end','text'.
         # Pass through asr_segments directly but ensure snake_case keys
-        segments = []
-        for s in asr_segments:
-            st = {"start": float(s.get("start", 0.0)), "end": float(s.get("end", 0.0)), "text": str(s.get("text", "")).strip()}
-            segments.append(st)
+        segments = _clean_segments(asr_segments)
 
         # Run alignment
-        aligned = whisperx.align(segments, self._align_model, self._metadata, audio, device, return_char_alignments=return_char_alignments)
+        model = _EmissionRecorder(align_model, metadata["type"]) if self.keep_emissions else align_model
+        aligned = _whisperx().align(segments, model, metadata, audio, device, return_char_alignments=return_char_alignments)
         # aligned is a dict with "segments" key replaced by aligned segments (each segment contains "words")
+        if self.keep_emissions:
+            aligned["emissions"] = model.collect(segments, audio, metadata["dictionary"])
         return aligned
+
+    def align_batch(self,
+                    items: list,
+                    language: str = "en",
+                    return_char_alignments: bool = False,
+                    batch_size: int = 8) -> list:
+        """
+        Align several utterances, computing wav2vec2 emissions for all their segments in batched
+        forward passes (length-sorted, `batch_size` slices per pass).
+        Parameters:
+          - items: list of (asr_segments, audio_np, sample_rate), each as for align_segments
+        Returns:
+          - one whisperx-style result per item, in order, matching align_segments on that item
+            (emissions agree to float rounding; trellis/backtrack is unchanged)
+        """
+        align_model, metadata = self._ensure_align_model(language=language)
+        target_sr = metadata.get("sample_rate", 16000) if isinstance(metadata, dict) and metadata.get("sample_rate") else 16000
+        prepared, slices = [], []
+        for asr_segments, audio_np, sample_rate in items:
+            audio = self._ensure_float32(audio_np, sr=sample_rate, target_sr=target_sr)
+            segments = _clean_segments(asr_segments)
+            prepared.append((segments, audio))
+            duration = len(audio) / float(_WX_SAMPLE_RATE)
+            for seg in segments:
+                # same slice whisperx.align will cut; segments it skips just go unused
+                if not seg["text"] or seg["start"] >= duration:
+                    continue
+                w = audio[int(seg["start"] * _WX_SAMPLE_RATE):int(seg["end"] * _WX_SAMPLE_RATE)]
+                if w.size:
+                    slices.append(w)
+
+        proxy = _PrecomputedEmissions(align_model, metadata["type"],
+                                      self._batched_emissions(align_model, metadata["type"], slices, batch_size))
+        results = []
+        for segments, audio in prepared:
+            model = _EmissionRecorder(proxy, metadata["type"]) if self.keep_emissions else proxy
+            aligned = _whisperx().align(segments, model, metadata, audio, self.device, return_char_alignments=return_char_alignments)
+            if self.keep_emissions:
+                aligned["emissions"] = model.collect(segments, audio, metadata["dictionary"])
+            results.append(aligned)
+        return results
+
+    def _batched_emissions(self, model, model_type: str, slices: list, batch_size: int) -> dict:
+        """waveform key -> (1, frames, vocab) logits, exactly the frames an unbatched call would return."""
+        import torch
+
+        padded = {}
+        for w in slices:
+            n = w.size
+            if n < _WX_MIN_SAMPLES:
+                w = np.pad(w, (0, _WX_MIN_SAMPLES - n))
+            padded.setdefault(_waveform_key(w), (w, n))
+        order = sorted(padded.items(), key=lambda kv: kv[1][0].size)  # similar lengths share a batch
+        batch_size = max(1, batch_size)
+        table = {}
+        with torch.inference_mode():
+            for b in range(0, len(order), batch_size):
+                chunk = order[b:b + batch_size]
+                if model_type == "torchaudio":
+                    # The conv feature extractor of the base models group-normalises over time, so it
+                    # runs per slice (padding would change it); the transformer is masked and batched.
+                    feats, lengths = [], []
+                    for _, (w, n) in chunk:
+                        x = torch.from_numpy(w)[None].to(self.device)
+                        ln = torch.as_tensor([n], device=self.device) if n < _WX_MIN_SAMPLES else None
+                        f, fl = model.feature_extractor(x, ln)
+                        feats.append(f[0])
+                        lengths.append(int(fl[0]) if fl is not None else f.shape[1])
+                    x = model.encoder(torch.nn.utils.rnn.pad_sequence(feats, batch_first=True),
+                                      torch.as_tensor(lengths, device=self.device))
+                    if model.aux is not None:
+                        x = model.aux(x)
+                    for i, (key, _) in enumerate(chunk):
+                        table[key] = x[i:i + 1, :feats[i].shape[0]]
+                elif getattr(getattr(model, "config", None), "feat_extract_norm", "group") == "layer":
+                    # layer-norm feature extractor: padding + attention mask leaves valid frames unchanged
+                    sizes = [w.size for _, (w, _) in chunk]
+                    x = torch.zeros(len(chunk), max(sizes))
+                    mask = torch.zeros(len(chunk), max(sizes), dtype=torch.long)
+                    for i, (_, (w, _)) in enumerate(chunk):
+                        x[i, :sizes[i]] = torch.from_numpy(w)
+                        mask[i, :sizes[i]] = 1
+                    logits = model(x.to(self.device), attention_mask=mask.to(self.device)).logits
+                    frames = model._get_feat_extract_output_lengths(torch.as_tensor(sizes))
+                    for i, (key, _) in enumerate(chunk):
+                        table[key] = logits[i:i + 1, :int(frames[i])]
+                else:
+                    # group-norm HF models have no padding-invariant batched path
+                    for key, (w, _) in chunk:
+                        table[key] = model(torch.from_numpy(w)[None].to(self.device)).logits
+        return table
+
+    def force_align(self,
+                    expected_text: str,
+                    audio_np: np.ndarray,
+                    sample_rate: int,
+                    language: str = "en",
+                    word_threshold: float = FORCED_WORD_THRESHOLD) -> tuple:
+        """
+        Align the known expected text straight onto the audio, skipping Whisper decoding.
+        Returns (aligned_result, confidence):
+          - aligned_result: whisperx-style dict; words whose CTC score is below `word_threshold` (or that
+            could not be placed) get "word": "<unk>" and keep the prompt word under "expected", so the
+            scorer sees them as substitutions.
+          - confidence: mean word score over the expected words (0..1). Callers should run the regular
+            ASR path when it falls below FORCED_MIN_CONFIDENCE.
+        """
+        n = len(audio_np) if audio_np is not None else 0
+        duration = n / float(sample_rate) if sample_rate else 0.0
+        text = " ".join(str(expected_text).split())
+        if duration <= 0.0 or not text:
+            return {"segments": []}, 0.0
+
+        aligned = self.align_segments([{"start": 0.0, "end": duration, "text": text}], audio_np, sample_rate, language=language)
+
+        scores = []
+        for seg in aligned.get("segments", []):
+            for w in seg.get("words", []):
+                score = w.get("score")
+                score = float(score) if score is not None and "start" in w else 0.0
+                scores.append(score)
+                if score < word_threshold:
+                    w["expected"] = w.get("word")
+                    w["word"] = "<unk>"
+        confidence = float(np.mean(scores)) if scores else 0.0
+        return aligned, confidence
+
+
+class WhisperTimestampAligner:
+    """
+    Word timings straight from faster-whisper (word_timestamps=True): one decode gives the text and
+    the word boundaries, and no wav2vec2 model is loaded. Output has the whisperx shape
+    {"segments": [{"start", "end", "text", "words": [{"word", "start", "end", "score"}]}]}, so
+    Scorer.score_utterance consumes it unchanged. Boundaries come from Whisper's cross-attention
+    (DTW over attention heads), which is coarser than CTC alignment; see benchmarks/word_timing.py.
+
+    Usage:
+      aligner = WhisperTimestampAligner(get_asr())
+      text, segments, aligned_result = aligner.transcribe_aligned(audio_np, 16000)
+    """
+    def __init__(self, asr):
+        self.asr = asr  # ASRModel / ASRPool / ASRCascade: anything with transcribe_numpy(..., word_timestamps=True)
+
+    @staticmethod
+    def to_aligned_result(segments: list) -> dict:
+        """ASR segments carrying words[{word, start, end, probability}] -> whisperx-style aligned result."""
+        out = []
+        for s in segments:
+            words = [{"word": w["word"], "start": float(w["start"]), "end": float(w["end"]), "score": float(w["probability"])}
+                     for w in s.get("words", []) if str(w.get("word", "")).strip()]
+            out.append({"start": float(s.get("start", 0.0)), "end": float(s.get("end", 0.0)),
+                        "text": str(s.get("text", "")).strip(), "words": words})
+        return {"segments": out}
+
+    def transcribe_aligned(self, audio_np: np.ndarray, sample_rate: int, expected_text: str | None = None) -> tuple:
+        """Returns (text, segments, aligned_result). expected_text is forwarded to an ASRCascade gate."""
+        if expected_text is not None and getattr(self.asr, "uses_expected_text", False):
+            text, segments = self.asr.transcribe_numpy(audio_np, sample_rate, word_timestamps=True, expected_text=expected_text)
+        else:
+            text, segments = self.asr.transcribe_numpy(audio_np, sample_rate, word_timestamps=True)
+        return text, segments, self.to_aligned_result(segments)
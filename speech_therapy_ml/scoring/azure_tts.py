@@ -4,7 +4,6 @@ If AZURE_SPEECH_KEY / AZURE_REGION are not present in env, raises an informative
 """
 
 import os
-import requests
 import tempfile
 from dotenv import load_dotenv
 load_dotenv()
@@ -35,6 +34,7 @@ class AzureTTS:
             "X-Microsoft-OutputFormat": output_format,
             "User-Agent": "speech_therapy_scoring"
         }
+        import requests
         resp = requests.post(self.endpoint, headers=headers, data=ssml.encode("utf-8"))
         if resp.status_code != 200:
             raise RuntimeError(f"Azure TTS failed: {resp.status_code} {resp.text}")
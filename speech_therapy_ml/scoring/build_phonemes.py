@@ -0,0 +1,34 @@
+"""
+Build the pickled phoneme index (scoring/phonemes.py) once per install.
+
+Run from speech_therapy_ml/:
+  python -m scoring.build_phonemes                                   # from the cmudict package
+  python -m scoring.build_phonemes --source cmudict.dict --out models/phonemes.pkl
+  python -m scoring.build_phonemes sheep zorbix                      # build, then look words up
+"""
+
+import argparse
+import os
+import time
+
+from .phonemes import DEFAULT_INDEX_PATH, build_index, get_phoneme_index
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build the pickled word -> ARPAbet phoneme index.")
+    ap.add_argument("--source", default=None, help="cmudict.dict text file (default: the cmudict package)")
+    ap.add_argument("--out", default=os.getenv("PHONEME_INDEX_PATH") or DEFAULT_INDEX_PATH)
+    ap.add_argument("words", nargs="*", help="words to look up after building")
+    args = ap.parse_args()
+
+    t0 = time.perf_counter()
+    n = build_index(args.out, args.source)
+    print(f"[phonemes] {n} words -> {args.out} ({time.perf_counter() - t0:.1f} s)")
+    index = get_phoneme_index(args.out)
+    for w in args.words:
+        phones, guessed = index.pronounce(w)
+        print(f"{w:20} {phones}{'  (guessed)' if guessed else ''}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Build the reference MFCC template bank (scoring/templates.py) for the exercise words.
+
+Run from speech_therapy_ml/:
+  python -m scoring.build_templates --tts                       # one Azure TTS reference per word
+  python -m scoring.build_templates --wav-dir refs/             # recorded refs/<word>.wav, refs/<word>-<n>.wav
+  python -m scoring.build_templates --tts --wav-dir refs/ --words zebra tiger
+
+Words come from interactive/state.EXERCISES plus --words. Recorded references and TTS can be mixed;
+every reference becomes one template and the scorer takes the closest.
+"""
+
+import argparse
+import glob
+import io
+import os
+import time
+from typing import Dict, List
+
+import numpy as np
+import soundfile as sf
+
+from .templates import DEFAULT_BANK_PATH, TemplateBank, exercise_words, reference_mfcc
+
+
+def _read(data_or_path):
+    audio, sr = sf.read(data_or_path, dtype="float32", always_2d=False)
+    if audio.ndim > 1:
+        audio = audio[:, 0]
+    return audio, sr
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Build the per-word MFCC template bank.")
+    ap.add_argument("--tts", action="store_true", help="synthesize one reference per word with Azure TTS")
+    ap.add_argument("--wav-dir", default=None, help="directory of recorded references named <word>.wav / <word>-<n>.wav")
+    ap.add_argument("--words", nargs="*", default=[], help="words to add to the exercise bank's")
+    ap.add_argument("--out", default=os.getenv("TEMPLATE_BANK_PATH") or DEFAULT_BANK_PATH)
+    args = ap.parse_args()
+    if not args.tts and not args.wav_dir:
+        ap.error("give --tts and/or --wav-dir")
+
+    words = exercise_words(args.words)
+    tts = None
+    if args.tts:
+        from .azure_tts import AzureTTS
+        tts = AzureTTS()
+
+    t0 = time.perf_counter()
+    templates: Dict[str, List[np.ndarray]] = {}
+    for word in words:
+        refs = []
+        if args.wav_dir:
+            refs += [_read(p) for p in sorted(glob.glob(os.path.join(args.wav_dir, f"{word}.wav")) +
+                                              glob.glob(os.path.join(args.wav_dir, f"{word}-*.wav")))]
+        if tts is not None:
+            refs.append(_read(io.BytesIO(tts.synthesize_to_wav_bytes(word))))
+        mfccs = [reference_mfcc(y, sr) for y, sr in refs]
+        mfccs = [m for m in mfccs if m.shape[1] > 0]
+        if mfccs:
+            templates[word] = mfccs
+        else:
+            print(f"[templates] no reference for '{word}'")
+
+    bank = TemplateBank.build(templates, args.out)
+    print(f"[templates] {len(bank)}/{len(words)} words, {bank.data.shape[0]} frames, scale {bank.scale:.2f} "
+          f"-> {args.out}.npy/.json ({time.perf_counter() - t0:.1f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -17,9 +17,10 @@ import json
 
 # attempt to import get_asr from either package root or module
 try:
-    from asr import get_asr
+    from asr import get_asr, trim_silence
 except Exception:
     from asr.asr import get_asr
+    from asr.trim import trim_silence
 
 from scoring.aligner import WhisperXAligner
 from scoring.azure_tts import AzureTTS
@@ -53,6 +54,11 @@ def main():
         sf.write(args.out, audio_np, 16000)
         print(f"[cli_example] saved recording to {args.out}")
 
+    # 0) Trim leading/trailing silence; word times are mapped back to the recording when scoring
+    trim = trim_silence(audio_np, 16000)
+    audio_np = trim.audio
+    print(f"[cli_example] trimmed silence: {trim.meta()}")
+
     # 1) ASR
     asr = get_asr()
     asr_text, segments = asr.transcribe_numpy(audio_np, sample_rate=16000)
@@ -84,7 +90,8 @@ def main():
                                        audio_np=audio_np,
                                        audio_sr=16000,
                                        asr_hypothesis=asr_text,
-                                       debug=args.debug)
+                                       debug=args.debug,
+                                       time_map=trim.to_original_s)
         # print(json.dumps(result, indent=2))
     except Exception as e:
         print("[cli_example] Scoring failed:", str(e))
@@ -0,0 +1,327 @@
+"""
+speech_therapy_ml/scoring/dtw.py
+
+Cost-only DTW for word-level acoustic comparison (MFCC sequences, euclidean frame distance):
+  - Same recursion and normalization as the scorer's former librosa.sequence.dtw call: steps
+    (1,1), (0,1), (1,0) tried in that order with first-min tie-break, result = D[-1, -1] / path length,
+    where the path length is carried along the recursion instead of backtracked
+  - No N x M cost or step matrix: a pair runs row by row over two rows along the shorter sequence,
+    O(min(N, M)) memory, in a kernel compiled with numba on first use (numba ships with librosa)
+  - Without numba, dtw_many runs an anti-diagonal wavefront instead: every cell of a diagonal depends
+    only on the two previous diagonals, so one diagonal of every reference template is one NumPy step
+  - band: optional Sakoe-Chiba constraint, |i / (M - 1) - j / (N - 1)| <= band on the normalized axes
+  - threshold: early abandon once no path through the current wavefront can end below it (result inf)
+  - dtw_many / dtw_min: one test word against many templates; dtw_min orders them by LB_Keogh and
+    skips templates whose lower bound already exceeds the best distance found
+
+Usage:
+  d = dtw_cost(ref_mfcc, test_mfcc)                          # ~= librosa D[-1, -1] / len(wp)
+  ds = dtw_many(template_mfccs, test_mfcc, band=0.2)
+  best_idx, best_d = dtw_min(template_mfccs, test_mfcc)
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+
+INF = np.inf
+
+
+def _band_width(m: np.ndarray, n: int, band: Optional[float]) -> np.ndarray:
+    """Per-template half-width on the normalized axes; never narrower than one step each way."""
+    if band is None:
+        return np.full(len(m), INF)
+    floor = 1.0 / np.maximum(m - 1, 1) + 1.0 / max(n - 1, 1)
+    return np.maximum(band, floor)
+
+
+def _pair_band(m: int, n: int, band: Optional[float]) -> float:
+    """_band_width for one pair, as a Python float (called per template, so no array round trip)."""
+    if band is None:
+        return INF
+    return max(band, 1.0 / max(m - 1, 1) + 1.0 / max(n - 1, 1))
+
+
+def _wavefront(refs: np.ndarray, lens: np.ndarray, test: np.ndarray, band: Optional[float],
+               threshold: float, up_first: bool = False) -> np.ndarray:
+    """
+    refs (K, d, M_max) zero-padded, lens (K,) valid frames, test (d, N); rows i index refs, columns j
+    index test. Returns (K,) D[M_k - 1, N - 1] / path length, inf when abandoned.
+    up_first swaps the (0,1)/(1,0) tie order, for callers that transposed the problem.
+    """
+    K, _, m_max = refs.shape
+    n = test.shape[1]
+    out = np.full(K, INF)
+    alive = np.arange(K)
+    bw = _band_width(lens, n, band)
+    inv_m = 1.0 / np.maximum(lens - 1, 1)
+    inv_n = 1.0 / max(n - 1, 1)
+    max_len = lens + n - 1                               # longest possible path, for the abandon bound
+
+    # diagonals k-1 and k-2 (accumulated cost, path length), indexed by column j
+    d1 = np.full((K, n), INF)
+    d2 = np.full((K, n), INF)
+    l1 = np.zeros((K, n), dtype=np.int64)
+    l2 = np.zeros((K, n), dtype=np.int64)
+    for k in range(m_max + n - 1):
+        j0, j1 = max(0, k - m_max + 1), min(k, n - 1)
+        j = np.arange(j0, j1 + 1)
+        i = k - j
+        diff = refs[:, :, i] - test[None, :, j]
+        cost = np.sqrt(np.einsum("kdl,kdl->kl", diff, diff))
+        outside = (i[None, :] >= lens[:, None]) | (np.abs(i[None, :] * inv_m[:, None] - j[None, :] * inv_n) > bw[:, None])
+        cost[outside] = INF
+
+        if k == 0:
+            dn, ln = cost, np.ones_like(cost, dtype=np.int64)
+        else:
+            jm = np.maximum(j - 1, 0)
+            has_left = (j >= 1)[None, :]
+            diag = np.where(has_left, d2[:, jm], INF) + cost
+            left = np.where(has_left, d1[:, jm], INF) + cost   # (i, j-1)
+            up = d1[:, j] + cost                               # (i-1, j); inf on row 0 (not on diagonal k-1)
+            dn, ln = diag, l2[:, jm] + 1
+            first, second = (up, left) if up_first else (left, up)
+            l_first, l_second = (l1[:, j], l1[:, jm]) if up_first else (l1[:, jm], l1[:, j])
+            take = first < dn
+            dn, ln = np.where(take, first, dn), np.where(take, l_first + 1, ln)
+            take = second < dn
+            dn, ln = np.where(take, second, dn), np.where(take, l_second + 1, ln)
+
+        # rotate: the buffer two diagonals back becomes the new diagonal
+        d2, d1, l2, l1 = d1, d2, l1, l2
+        d1.fill(INF)
+        d1[:, j0:j1 + 1] = dn
+        l1[:, j0:j1 + 1] = ln
+
+        done = lens + n - 2 == k
+        if done.any():
+            out[alive[done]] = d1[done, n - 1] / l1[done, n - 1]
+        # every path crosses diagonal k or k-1, and costs are non-negative
+        bound = np.minimum(d1.min(axis=1), d2.min(axis=1)) / max_len
+        drop = done | (bound > threshold) | (lens + n - 2 < k)
+        if drop.any():
+            keep = ~drop
+            if not keep.any():
+                break
+            alive, refs, lens, bw, inv_m, max_len = alive[keep], refs[keep], lens[keep], bw[keep], inv_m[keep], max_len[keep]
+            d1, d2, l1, l2 = d1[keep], d2[keep], l1[keep], l2[keep]
+            m_max_alive = int(lens.max())
+            if m_max_alive < m_max:  # shorter remaining templates: fewer diagonals and rows to visit
+                m_max = m_max_alive
+                refs = refs[:, :, :m_max]
+    out[out > threshold] = INF
+    return out
+
+
+def _dtw_pair(ref, test, bw, threshold, up_first):
+    """
+    Row-by-row recursion for one pair, two rows of (cost, path length) along test. Plain loops: compiled
+    with numba on first use (see _kernels), where it beats the per-diagonal NumPy steps of _wavefront
+    by a wide margin at word lengths. Returns inf once a whole row lies above threshold * longest path.
+    """
+    d, m = ref.shape
+    n = test.shape[1]
+    inv_m = 1.0 / max(m - 1, 1)
+    inv_n = 1.0 / max(n - 1, 1)
+    abandon = threshold * (m + n - 1)
+    prev = np.full(n, np.inf)
+    cur = np.full(n, np.inf)
+    prev_len = np.zeros(n, dtype=np.int64)
+    cur_len = np.zeros(n, dtype=np.int64)
+    for i in range(m):
+        row_min = np.inf
+        for j in range(n):
+            if abs(i * inv_m - j * inv_n) > bw:
+                cur[j] = np.inf
+                cur_len[j] = 0
+                continue
+            acc = 0.0
+            for c in range(d):
+                diff = ref[c, i] - test[c, j]
+                acc += diff * diff
+            cost = np.sqrt(acc)
+            if i == 0 and j == 0:
+                best, best_len = cost, 1
+            else:
+                best, best_len = np.inf, 0
+                if i > 0 and j > 0:
+                    best, best_len = prev[j - 1] + cost, prev_len[j - 1] + 1
+                left = cur[j - 1] + cost if j > 0 else np.inf
+                up = prev[j] + cost if i > 0 else np.inf
+                if up_first:
+                    if up < best:
+                        best, best_len = up, prev_len[j] + 1
+                    if left < best:
+                        best, best_len = left, cur_len[j - 1] + 1
+                else:
+                    if left < best:
+                        best, best_len = left, cur_len[j - 1] + 1
+                    if up < best:
+                        best, best_len = up, prev_len[j] + 1
+            cur[j] = best
+            cur_len[j] = best_len
+            if best < row_min:
+                row_min = best
+        if row_min > abandon:  # every path crosses every row
+            return np.inf
+        prev, cur = cur, prev
+        prev_len, cur_len = cur_len, prev_len
+    total = prev[n - 1] / prev_len[n - 1] if prev_len[n - 1] > 0 else np.inf
+    return total if total <= threshold else np.inf
+
+
+_KERNELS = None
+
+
+def _kernels():
+    """(pair, lb): _dtw_pair / _lb_pair compiled with numba on first use (numba ships with librosa);
+    (None, _lb_pair) without numba, and dtw_many falls back to the NumPy wavefront."""
+    global _KERNELS
+    if _KERNELS is None:
+        try:
+            import numba
+            jit = numba.njit(cache=True, nogil=True)
+            _KERNELS = (jit(_dtw_pair), jit(_lb_pair))
+        except Exception:
+            _KERNELS = (None, _lb_pair)
+    return _KERNELS
+
+
+def _pair(ref: np.ndarray, test: np.ndarray, band: Optional[float], threshold: float) -> float:
+    """Both float64 (d, ·) with frames > 0; buffers run along the shorter sequence."""
+    kernel = _kernels()[0]
+    if ref.shape[1] < test.shape[1]:
+        # transposed problem: (0,1) and (1,0) swap roles, so does their tie order
+        ref, test, up_first = test, ref, True
+    else:
+        up_first = False
+    if kernel is None:
+        return float(_wavefront(ref[None], np.array([ref.shape[1]]), test, band, threshold, up_first=up_first)[0])
+    bw = _pair_band(ref.shape[1], test.shape[1], band)
+    return float(kernel(np.ascontiguousarray(ref), np.ascontiguousarray(test), bw, float(threshold), up_first))
+
+
+def _stack(refs: Sequence[np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+    lens = np.array([r.shape[1] for r in refs], dtype=np.int64)
+    d = refs[0].shape[0]
+    out = np.zeros((len(refs), d, int(lens.max())), dtype=np.float64)
+    for k, r in enumerate(refs):
+        out[k, :, :r.shape[1]] = r
+    return out, lens
+
+
+def dtw_cost(ref: np.ndarray, test: np.ndarray, band: Optional[float] = None, threshold: float = INF) -> float:
+    """Normalized DTW cost of one (d, M) reference vs one (d, N) test sequence; inf if abandoned."""
+    ref = np.asarray(ref, dtype=np.float64)
+    test = np.asarray(test, dtype=np.float64)
+    if ref.shape[1] == 0 or test.shape[1] == 0:
+        return INF
+    return _pair(ref, test, band, threshold)
+
+
+def dtw_many(refs: Sequence[np.ndarray], test: np.ndarray, band: Optional[float] = None, threshold: float = INF) -> np.ndarray:
+    """dtw_cost of test against every (d, M_k) reference; (K,) with inf where abandoned. Compiled pairs when
+    numba is available, otherwise all references in one batched NumPy wavefront."""
+    out = np.full(len(refs), INF)
+    test = np.asarray(test, dtype=np.float64)
+    idx = [k for k, r in enumerate(refs) if r.shape[1] > 0]
+    if not idx or test.shape[1] == 0:
+        return out
+    if _kernels()[0] is not None:
+        for k in idx:
+            out[k] = _pair(np.asarray(refs[k], dtype=np.float64), test, band, threshold)
+        return out
+    stacked, lens = _stack([refs[k] for k in idx])
+    out[idx] = _wavefront(stacked, lens, test, band, threshold)
+    return out
+
+
+def _lb_pair(ref, test, bw):
+    """
+    LB_Keogh of one pair (see lb_keogh). The reference window of test column j, within bw of it on the
+    normalized axes and widened by one frame, only moves forward with j, so each coefficient's envelope is
+    a sliding max / min over monotone deques: O(d * (M + N)) whatever the band. Plain loops, compiled
+    with the DTW kernel when numba is there.
+    """
+    d, m = ref.shape
+    n = test.shape[1]
+    sq = np.zeros(n)
+    lo = np.empty(n, dtype=np.int64)
+    hi = np.empty(n, dtype=np.int64)
+    for j in range(n):
+        centre = j / max(n - 1, 1) * (m - 1)
+        lo[j] = max(0, int(np.floor(centre - bw * (m - 1))) - 1)
+        hi[j] = min(m - 1, int(np.ceil(centre + bw * (m - 1))) + 1)
+    dq_max = np.empty(m, dtype=np.int64)
+    dq_min = np.empty(m, dtype=np.int64)
+    for c in range(d):
+        h_max = t_max = h_min = t_min = 0
+        nxt = 0
+        for j in range(n):
+            while nxt <= hi[j]:
+                v = ref[c, nxt]
+                while t_max > h_max and ref[c, dq_max[t_max - 1]] <= v:
+                    t_max -= 1
+                dq_max[t_max] = nxt
+                t_max += 1
+                while t_min > h_min and ref[c, dq_min[t_min - 1]] >= v:
+                    t_min -= 1
+                dq_min[t_min] = nxt
+                t_min += 1
+                nxt += 1
+            while dq_max[h_max] < lo[j]:
+                h_max += 1
+            while dq_min[h_min] < lo[j]:
+                h_min += 1
+            x = test[c, j]
+            upper, lower = ref[c, dq_max[h_max]], ref[c, dq_min[h_min]]
+            e = x - upper if x > upper else (lower - x if x < lower else 0.0)
+            sq[j] += e * e
+    return np.sqrt(sq).sum() / (m + n - 1)
+
+
+def lb_keogh(refs: Sequence[np.ndarray], test: np.ndarray, band: Optional[float] = None) -> np.ndarray:
+    """
+    Lower bound of dtw_cost(ref, test) for every reference. Every test frame is matched to at least one
+    reference frame inside its band window, and its distance to any of them is at least its distance to
+    the per-coefficient [min, max] envelope of that window; summed over test frames, divided by the
+    longest possible path.
+    """
+    test = np.ascontiguousarray(test, dtype=np.float64)
+    n = test.shape[1]
+    kernel = _kernels()[1]
+    out = np.full(len(refs), INF)
+    for k, r in enumerate(refs):
+        m = r.shape[1]
+        if m == 0 or n == 0:
+            continue
+        out[k] = kernel(np.ascontiguousarray(r, dtype=np.float64), test, min(_pair_band(m, n, band), 1.0))
+    return out
+
+
+def dtw_min(refs: Sequence[np.ndarray], test: np.ndarray, band: Optional[float] = None,
+            threshold: float = INF, batch: int = 8) -> Tuple[Optional[int], float]:
+    """
+    (index, cost) of the reference closest to test, or (None, inf) if none is below threshold.
+    References are visited in LB_Keogh order (one at a time when compiled, batch at a time in the NumPy
+    wavefront); only references whose lower bound is below the best cost so far run, and each abandons
+    once it cannot beat it.
+    """
+    if len(refs) == 0:
+        return None, INF
+    lbs = lb_keogh(refs, test, band)
+    order = np.argsort(lbs, kind="stable")
+    best_idx, best = None, threshold
+    step = 1 if _kernels()[0] is not None else batch  # compiled pairs tighten the threshold after every template
+    for s in range(0, len(order), step):
+        chunk = [int(k) for k in order[s:s + step] if lbs[k] <= best]
+        if not chunk:
+            break  # later references have even larger lower bounds
+        costs = dtw_many([refs[k] for k in chunk], test, band, best)
+        c = int(np.argmin(costs))
+        if np.isfinite(costs[c]) and (best_idx is None or costs[c] < best):
+            best_idx, best = chunk[c], float(costs[c])
+    return best_idx, (best if best_idx is not None else INF)
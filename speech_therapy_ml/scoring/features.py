@@ -0,0 +1,101 @@
+"""
+speech_therapy_ml/scoring/features.py
+
+FeatureFrames:
+  - Frames an utterance once (librosa's grid: center=True, zero padding, frame k at k * hop_length / sr)
+  - Lazily derives and memoizes everything the scorer reads from that framing:
+      .frames          (n_frames, frame_length) strided view, the input of the NumPy pitch trackers
+      .times           frame centre times in seconds
+      .rms             bit-identical to librosa.feature.rms(y, frame_length, hop_length)[0]
+      .power_spectrum  |rfft(hann * frame)|^2, (n_frames, 1 + frame_length // 2)
+      .mel(n_mels) / .mfcc(n_mfcc)  (n_mels / n_mfcc, n_frames), like librosa.feature.* on the same grid
+  - Every array has n_frames entries along time, so per-frame consumers line up without truncation
+
+Usage:
+  ff = FeatureFrames(y, 16000, frame_length=2048, hop_length=256)
+  energy_db = 20 * np.log10(ff.rms + 1e-9)
+  s, e = ff.frame_range(0.42, 0.91)
+  word_mfcc = ff.mfcc()[:, s:e]
+"""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Dict, Tuple
+
+import numpy as np
+
+
+def frame_signal(y: np.ndarray, frame_length: int, hop_length: int) -> np.ndarray:
+    """(n_frames, frame_length) strided view of y zero-padded by frame_length // 2 on both sides (librosa center=True)."""
+    pad = frame_length // 2
+    yp = np.pad(np.asarray(y, dtype=np.float32), pad)
+    n_frames = 1 + len(y) // hop_length
+    step = yp.strides[0]
+    return np.lib.stride_tricks.as_strided(yp, shape=(n_frames, frame_length), strides=(hop_length * step, step), writeable=False)
+
+
+class FeatureFrames:
+    """One framing of a mono float signal; derived features are computed on first access, then cached."""
+
+    def __init__(self, y: np.ndarray, sr: int, frame_length: int = 2048, hop_length: int = 256):
+        self.y = np.asarray(y, dtype=np.float32)
+        self.sr = sr
+        self.frame_length = frame_length
+        self.hop_length = hop_length
+        self.n_frames = 1 + len(self.y) // hop_length
+        self._mel: Dict[int, np.ndarray] = {}
+        self._mfcc: Dict[Tuple[int, int], np.ndarray] = {}
+
+    def matches(self, frame_length: int, hop_length: int) -> bool:
+        return self.frame_length == frame_length and self.hop_length == hop_length
+
+    @cached_property
+    def frames(self) -> np.ndarray:
+        return frame_signal(self.y, self.frame_length, self.hop_length)
+
+    @cached_property
+    def times(self) -> np.ndarray:
+        # (k * hop) / sr, the same rounding as librosa.times_like
+        return (np.arange(self.n_frames) * self.hop_length) / float(self.sr)
+
+    @cached_property
+    def rms(self) -> np.ndarray:
+        # librosa.feature.rms reduces a (frame_length, n_frames) view along axis 0; the transposed
+        # view has the same memory layout, so the sums (and the result) are bit-identical
+        return np.sqrt(np.mean(np.square(self.frames.T), axis=0))
+
+    @cached_property
+    def power_spectrum(self) -> np.ndarray:
+        n = self.frame_length
+        window = (0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(n) / n)).astype(np.float32)  # periodic hann, as librosa.stft
+        spec = np.fft.rfft(self.frames * window, axis=1)
+        return (spec.real ** 2 + spec.imag ** 2).astype(np.float32)
+
+    def mel(self, n_mels: int = 128) -> np.ndarray:
+        """Mel power spectrogram, (n_mels, n_frames)."""
+        m = self._mel.get(n_mels)
+        if m is None:
+            import librosa
+            basis = librosa.filters.mel(sr=self.sr, n_fft=self.frame_length, n_mels=n_mels)
+            m = self._mel[n_mels] = basis @ self.power_spectrum.T
+        return m
+
+    def mfcc(self, n_mfcc: int = 13, n_mels: int = 128) -> np.ndarray:
+        """MFCCs, (n_mfcc, n_frames)."""
+        key = (n_mfcc, n_mels)
+        m = self._mfcc.get(key)
+        if m is None:
+            import librosa
+            m = self._mfcc[key] = librosa.feature.mfcc(S=librosa.power_to_db(self.mel(n_mels)), n_mfcc=n_mfcc)
+        return m
+
+    def frame_range(self, start_s: float, end_s: float) -> Tuple[int, int]:
+        """[s, e) frames whose centres fall in [start_s, end_s]; at least one frame when the signal has any."""
+        times = self.times
+        s = int(np.searchsorted(times, start_s, side="left"))
+        e = int(np.searchsorted(times, end_s, side="right"))
+        if e <= s:
+            s = max(0, s - 1)
+            e = min(self.n_frames, s + 1)
+        return s, e
@@ -15,18 +15,14 @@ from typing import Optional
 from dotenv import load_dotenv
 load_dotenv()
 
-# audio playback
-try:
-    import soundfile as sf
-    import sounddevice as sd
-except Exception as e:
-    raise ImportError("feedback.py requires 'soundfile' and 'sounddevice'. Install them. Error: " + str(e))
-
-# Azure OpenAI client (OpenAI Python package with Azure wrapper)
-try:
-    from openai import AzureOpenAI
-except Exception:
-    AzureOpenAI = None  # handled below
+# Audio playback (soundfile/sounddevice) and the Azure OpenAI client are imported on
+# first use, so servers without an audio device can still import this module.
+def _azure_openai_cls():
+    try:
+        from openai import AzureOpenAI
+    except Exception:
+        return None
+    return AzureOpenAI
 
 # reuse your AzureTTS helper
 from .azure_tts import AzureTTS
@@ -69,6 +65,7 @@ class FeedbackGenerator:
         if not (self.api_key and self.endpoint and self.deployment):
             raise RuntimeError("Azure OpenAI config missing. Set AZURE_OPENAI_KEY, AZURE_OPENAI_ENDPOINT, AZURE_OPENAI_DEPLOYMENT.")
 
+        AzureOpenAI = _azure_openai_cls()
         if AzureOpenAI is None:
             raise RuntimeError("OpenAI Python package not available. Install the 'openai' package that provides AzureOpenAI.")
 
@@ -252,6 +249,8 @@ class FeedbackGenerator:
             self.azure_tts.synthesize_to_file(safe, tmp.name)
             if play:
                 try:
+                    import soundfile as sf
+                    import sounddevice as sd
                     data, sr = sf.read(tmp.name, dtype='float32')
                     sd.play(data, sr)
                     sd.wait()
@@ -0,0 +1,152 @@
+"""
+speech_therapy_ml/scoring/gop.py
+
+CTCEmissions:
+  - The wav2vec2 CTC frame posteriors WhisperXAligner already computed for the alignment, kept as one
+    float16 (frames, vocab) log-softmax array (~3 KB per second of audio) plus, per aligned segment,
+    (start_s, frame_s, offset, n_frames) to place its frames in time
+  - .window(start_s, end_s) -> float16 view of the frames around a word (no copy)
+  - Travels in aligned_result["emissions"]; .to_json() / .coerce() round-trip it through the result cache
+
+word_gop(emissions, word, start_s, end_s):
+  - Goodness of pronunciation per grapheme: the whisperx align models are character CTC models, so the
+    units are the word's letters, not ARPAbet phones
+  - The word's letters are force-aligned (CTC Viterbi) inside the word's window; for each letter, over
+    the frames it occupies:
+      posterior   exp(mean log P(letter))                              0..1
+      gop         mean(log P(letter) - max over letters log P(other))  <= 0, 0 = the model's top letter
+      competitor  the letter the model preferred most on those frames (ship read as sheep: "i" -> "e")
+  - None when the window is too short for the letters or no letter is in the model's vocabulary
+
+Usage:
+  aligned = aligner.align_segments(segments, audio, 16000)        # aligned["emissions"]: CTCEmissions
+  g = word_gop(CTCEmissions.coerce(aligned["emissions"]), "ship", 0.42, 0.71)
+  g["graphemes"][2]  # {"char": "i", "posterior": 0.21, "gop": -1.9, "competitor": "e"}
+"""
+
+from __future__ import annotations
+
+import base64
+import math
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+GOP_WEAK = -1.5       # gop below this: another letter was ~4.5x likelier on the letter's frames
+WINDOW_PAD_FRAMES = 2  # frames added around a word's window so blanks can absorb boundary error
+
+
+@dataclass
+class CTCEmissions:
+    log_probs: np.ndarray                               # (frames, vocab) float16 log-softmax, all segments back to back
+    blocks: List[Tuple[float, float, int, int]]         # per segment: (start_s, frame_s, offset, n_frames)
+    labels: Dict[str, int]                              # the align model's dictionary (lower-case label -> index)
+    blank: int = 0
+    _letters: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    _names: Optional[Dict[int, str]] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def coerce(cls, value: Any) -> Optional["CTCEmissions"]:
+        """aligned_result["emissions"] as stored: a CTCEmissions, its to_json() dict (cache hit) or absent."""
+        if value is None or isinstance(value, cls):
+            return value
+        if isinstance(value, dict) and "log_probs" in value:
+            raw = np.frombuffer(base64.b64decode(value["log_probs"]), dtype=np.float16)
+            return cls(raw.reshape(value["shape"]), [tuple(b) for b in value["blocks"]], dict(value["labels"]), int(value["blank"]))
+        return None
+
+    def to_json(self) -> Dict:
+        return {"log_probs": base64.b64encode(np.ascontiguousarray(self.log_probs, dtype=np.float16).tobytes()).decode("ascii"),
+                "shape": list(self.log_probs.shape), "blocks": [list(b) for b in self.blocks],
+                "labels": self.labels, "blank": self.blank}
+
+    @property
+    def letters(self) -> np.ndarray:
+        """Vocabulary indices of single letters / apostrophe (the competitors; not blank or word separators)."""
+        if self._letters is None:
+            self._letters = np.array(sorted(i for c, i in self.labels.items()
+                                            if len(c) == 1 and (c.isalpha() or c == "'") and i != self.blank), dtype=np.int64)
+        return self._letters
+
+    def label_of(self, index: int) -> Optional[str]:
+        if self._names is None:
+            self._names = {i: c for c, i in self.labels.items()}
+        return self._names.get(index)
+
+    def window(self, start_s: float, end_s: float, pad: int = WINDOW_PAD_FRAMES) -> Optional[np.ndarray]:
+        """Frames of the segment containing the word's midpoint that cover [start_s, end_s] (+ pad frames), as a view."""
+        mid = 0.5 * (start_s + end_s)
+        for seg_start, frame_s, offset, n in self.blocks:
+            if n == 0 or not (seg_start <= mid <= seg_start + n * frame_s):
+                continue
+            a = max(0, int(math.floor((start_s - seg_start) / frame_s)) - pad)
+            b = min(n, int(math.ceil((end_s - seg_start) / frame_s)) + 1 + pad)
+            return self.log_probs[offset + a:offset + b] if b > a else None
+        return None
+
+
+def _ctc_viterbi(lp: np.ndarray, ext: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Best CTC path through lp (T, vocab) for the extended label sequence ext = blank, tok0, blank, ..., blank.
+    Returns the state (index into ext) per frame, or None if the tokens do not fit in T frames.
+    """
+    emit = lp[:, ext]
+    T, S = emit.shape
+    skip = np.zeros(S, dtype=bool)
+    skip[2:] = ext[2:] != ext[:-2]  # s-2 -> s jumps a blank only between two different tokens
+    neg = np.float32(-np.inf)
+    dp = np.full(S, neg, dtype=np.float32)
+    dp[:2] = emit[0, :2]
+    back = np.zeros((T, S), dtype=np.int8)
+    cand = np.full((3, S), neg, dtype=np.float32)
+    cols = np.arange(S)
+    for t in range(1, T):
+        cand[0] = dp
+        cand[1, 1:] = dp[:-1]
+        cand[2, 2:] = np.where(skip[2:], dp[:-2], neg)
+        arg = np.argmax(cand, axis=0)
+        dp = cand[arg, cols] + emit[t]
+        back[t] = arg
+    s = S - 1 if dp[S - 1] >= dp[S - 2] else S - 2
+    if not np.isfinite(dp[s]):
+        return None
+    path = np.empty(T, dtype=np.int64)
+    for t in range(T - 1, -1, -1):
+        path[t] = s
+        s -= back[t, s]
+    return path
+
+
+def word_gop(emissions: CTCEmissions, word: str, start_s: float, end_s: float) -> Optional[Dict]:
+    """Per-grapheme posterior / GOP / competitor of `word` over its aligned time span (see module docstring)."""
+    chars = [c for c in word.lower() if c in emissions.labels]
+    lp = emissions.window(start_s, end_s)
+    if not chars or lp is None or len(lp) < len(chars):
+        return None
+    tokens = [emissions.labels[c] for c in chars]
+    ext = np.full(2 * len(tokens) + 1, emissions.blank, dtype=np.int64)
+    ext[1::2] = tokens
+    lpf = lp.astype(np.float32)
+    path = _ctc_viterbi(lpf, ext)
+    if path is None:
+        return None
+
+    out = []
+    for k, (c, tok) in enumerate(zip(chars, tokens)):
+        frames = np.flatnonzero(path == 2 * k + 1)
+        own = lpf[frames, tok]
+        rivals = emissions.letters[emissions.letters != tok]
+        gop, competitor = 0.0, None
+        if rivals.size:
+            rival_lp = lpf[np.ix_(frames, rivals)]
+            gop = float(np.mean(own - np.maximum(own, rival_lp.max(axis=1))))
+            competitor = emissions.label_of(int(rivals[np.argmax(rival_lp.mean(axis=0))]))
+        out.append({"char": c, "posterior": round(float(np.exp(np.mean(own))), 3), "gop": round(gop, 3),
+                    "competitor": competitor})
+    return {
+        "unit": "grapheme",
+        "graphemes": out,
+        "posterior": round(float(np.mean([g["posterior"] for g in out])), 3),
+        "gop": min(g["gop"] for g in out),  # the weakest letter decides (one wrong vowel is a wrong word)
+    }
@@ -0,0 +1,264 @@
+"""
+speech_therapy_ml/scoring/phonemes.py
+
+PhonemeIndex:
+  - Prebuilt word -> ARPAbet pronunciations (with stress digits, e.g. "K AE1 T"), the CMU dictionary
+    pickled once into models/phonemes.pkl; loading it is one pickle.load on first lookup, nothing is
+    parsed at import time
+  - .phones_for_word(word) -> list of pronunciations, drop-in for pronouncing.phones_for_word
+  - .pronounce(word) -> (phones, guessed): the first dictionary pronunciation, or a cached rule-based
+    letter-to-sound guess for out-of-vocabulary words (names, made-up words) with guessed=True
+  - get_phoneme_index() is the process-wide instance the scorer, feedback and exercise code share
+
+Build (once per install; the index is also built on first load when the cmudict package is installed):
+  python -m scoring.build_phonemes
+  python -m scoring.build_phonemes --source path/to/cmudict.dict --out models/phonemes.pkl
+
+Usage:
+  index = get_phoneme_index()
+  index.pronounce("sheep")    # ("SH IY1 P", False)
+  index.pronounce("zorbix")   # ("Z AO1 R B IH0 K S", True)
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import re
+import sys
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "phonemes.pkl")
+INDEX_VERSION = 1
+
+_WORD_STRIP = "\"'.,!?;:()[]"
+
+
+def _key(word: str) -> str:
+    return word.strip().lower().strip(_WORD_STRIP)
+
+
+# ---------- Building ----------
+
+def _parse_cmudict_lines(lines: Iterable[str]) -> Dict[str, List[str]]:
+    """cmudict.dict text ("word W ER1 D", variants as "word(2) ...", "#" / ";;;" comments) -> word -> pronunciations."""
+    out: Dict[str, List[str]] = {}
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if not line or line.startswith(";;;"):
+            continue
+        word, _, phones = line.partition(" ")
+        word = re.sub(r"\(\d+\)$", "", word).lower()
+        if phones.strip():
+            out.setdefault(word, []).append(" ".join(phones.split()))
+    return out
+
+
+def _load_cmudict_package() -> Dict[str, List[str]]:
+    import cmudict
+    return {word.lower(): [" ".join(p) for p in prons] for word, prons in cmudict.dict().items()}
+
+
+def build_index(out_path: str = DEFAULT_INDEX_PATH, source: Optional[str] = None) -> int:
+    """Write the pickled index from a cmudict text file, or from the cmudict package when source is None.
+    Returns the number of words."""
+    if source:
+        with open(source, encoding="latin-1") as f:
+            entries = _parse_cmudict_lines(f)
+    else:
+        entries = _load_cmudict_package()
+    # tuples of interned strings: smaller pickle, and repeated pronunciations share one object
+    words = {w: tuple(sys.intern(p) for p in prons) for w, prons in entries.items()}
+    out_dir = os.path.dirname(os.path.abspath(out_path))
+    os.makedirs(out_dir, exist_ok=True)
+    # a temp file of our own: concurrent builders never publish each other's half-written pickle
+    fd, tmp = tempfile.mkstemp(dir=out_dir, prefix=os.path.basename(out_path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump({"version": INDEX_VERSION, "words": words}, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, out_path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+    return len(words)
+
+
+# ---------- Rule-based G2P (out-of-vocabulary fallback) ----------
+
+_VOWELS = "aeiouy"
+_VOWEL_PHONES = {"AA", "AE", "AH", "AO", "AW", "AY", "EH", "ER", "EY", "IH", "IY", "OW", "OY", "UH", "UW"}
+
+# longest match first; each entry is (letters, phones)
+_GRAPHEMES = sorted([
+    ("tion", "SH AH N"), ("sion", "ZH AH N"), ("ture", "CH ER"), ("igh", "AY"), ("tch", "CH"), ("dge", "JH"),
+    ("sch", "S K"), ("eau", "OW"), ("augh", "AO"), ("ough", "AO"),
+    ("ch", "CH"), ("sh", "SH"), ("th", "TH"), ("ph", "F"), ("wh", "W"), ("ck", "K"), ("ng", "NG"),
+    ("qu", "K W"), ("gh", "G"), ("dg", "JH"),
+    ("ee", "IY"), ("ea", "IY"), ("oo", "UW"), ("ou", "AW"), ("oi", "OY"), ("oy", "OY"), ("ai", "EY"),
+    ("ay", "EY"), ("au", "AO"), ("aw", "AO"), ("ei", "EY"), ("ey", "IY"), ("ie", "IY"), ("ue", "UW"),
+    ("ew", "UW"), ("oa", "OW"), ("ow", "OW"),
+    ("ar", "AA R"), ("or", "AO R"), ("er", "ER"), ("ir", "ER"), ("ur", "ER"),
+    ("a", "AE"), ("e", "EH"), ("i", "IH"), ("o", "AA"), ("u", "AH"),
+    ("b", "B"), ("c", "K"), ("d", "D"), ("f", "F"), ("g", "G"), ("h", "HH"), ("j", "JH"), ("k", "K"),
+    ("l", "L"), ("m", "M"), ("n", "N"), ("p", "P"), ("q", "K"), ("r", "R"), ("s", "S"), ("t", "T"),
+    ("v", "V"), ("w", "W"), ("x", "K S"), ("z", "Z"),
+], key=lambda g: -len(g[0]))
+
+_LONG = {"a": "EY", "e": "IY", "i": "AY", "o": "OW", "u": "UW", "y": "AY"}
+_SOFTENERS = "eiy"
+
+
+def _magic_e(word: str, i: int) -> bool:
+    """word[i] is a vowel followed by one consonant and a final silent 'e' (make, bike, home)."""
+    return len(word) >= 3 and i == len(word) - 3 and word[-1] == "e" and word[-2] not in _VOWELS + "rw"
+
+
+@lru_cache(maxsize=4096)
+def guess_phones(word: str) -> str:
+    """Letter-to-sound guess for an out-of-vocabulary word, ARPAbet with primary stress on the first vowel."""
+    w = "".join(c for c in _key(word) if c.isalpha())
+    if not w:
+        return ""
+    if w.startswith(("kn", "gn", "wr")):
+        w = w[1:]
+    n_vowel_groups = len(re.findall(r"[aeiouy]+", w[:-1] if w.endswith("e") and len(w) > 2 else w))
+    phones: List[str] = []
+    i = 0
+    while i < len(w):
+        c, prev = w[i], w[i - 1] if i else ""
+        nxt = w[i + 1] if i + 1 < len(w) else ""
+        if i == len(w) - 1 and c == "e" and n_vowel_groups >= 1 and len(w) > 2:
+            break  # final silent e
+        if c == nxt and c not in _VOWELS:
+            i += 1  # doubled consonant sounds once
+            continue
+        if c == "g" and nxt == "h" and i > 0:
+            i += 2  # silent after a vowel (night, Leigh)
+            continue
+        if c == "o" and i == len(w) - 1:
+            phones.append("OW")  # hello, go
+            break
+        if c in "aeiou" and _magic_e(w, i):
+            phones.append(_LONG[c])
+            i += 1
+            continue
+        if c == "y":
+            if i == 0 and nxt in _VOWELS:
+                phones.append("Y")
+            elif i == len(w) - 1:
+                phones.append("AY" if n_vowel_groups <= 1 else "IY")
+            else:
+                phones.append("IH")
+            i += 1
+            continue
+        if c == "c" and nxt in _SOFTENERS:
+            phones.append("S")
+            i += 1
+            continue
+        if c == "g" and nxt in _SOFTENERS and not w.startswith("get") and not w.startswith("give"):
+            phones.append("JH")
+            i += 1
+            continue
+        if c == "l" and nxt == "e" and i == len(w) - 2 and prev and prev not in _VOWELS:
+            phones.extend(["AH", "L"])  # table, apple
+            break
+        for letters, ph in _GRAPHEMES:
+            if w.startswith(letters, i):
+                phones.extend(ph.split())
+                i += len(letters)
+                break
+        else:
+            i += 1
+    out, stressed = [], False
+    for p in phones:
+        if p in _VOWEL_PHONES:
+            p += "0" if stressed else "1"
+            stressed = True
+        out.append(p)
+    return " ".join(out)
+
+
+# ---------- Index ----------
+
+class PhonemeIndex:
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("PHONEME_INDEX_PATH") or DEFAULT_INDEX_PATH
+        self._words: Optional[Dict[str, Tuple[str, ...]]] = None
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "guessed": 0}
+        self.source = "none"
+
+    def load(self) -> "PhonemeIndex":
+        """Read the pickled index (building it from the cmudict package if the file is missing).
+        Without either, the index is empty and every word goes through the G2P fallback."""
+        if self._words is not None:
+            return self
+        with self._lock:
+            if self._words is not None:
+                return self
+            words: Dict[str, Tuple[str, ...]] = {}
+            if not os.path.exists(self.path):
+                try:
+                    build_index(self.path)
+                except Exception as e:
+                    print(f"[phonemes] no index at {self.path} and cmudict unavailable ({e}); using G2P only")
+            if os.path.exists(self.path):
+                try:
+                    with open(self.path, "rb") as f:
+                        data = pickle.load(f)
+                except (EOFError, pickle.UnpicklingError) as e:
+                    print(f"[phonemes] {self.path} is unreadable ({e}); rebuild it. Using G2P only")
+                    data = {}
+                if data.get("version") == INDEX_VERSION:
+                    words = data["words"]
+                    self.source = self.path
+                elif data:
+                    print(f"[phonemes] {self.path} is index version {data.get('version')}, expected {INDEX_VERSION}; rebuild it")
+            self._words = words
+        return self
+
+    def __contains__(self, word: str) -> bool:
+        return _key(word) in self.load()._words
+
+    def __len__(self) -> int:
+        return len(self.load()._words)
+
+    def phones_for_word(self, word: str) -> List[str]:
+        """All dictionary pronunciations of word ([] when out of vocabulary), like pronouncing.phones_for_word."""
+        return list(self.load()._words.get(_key(word), ()))
+
+    def pronounce(self, word: str) -> Tuple[Optional[str], bool]:
+        """(phones, guessed): first dictionary pronunciation, else the rule-based guess (None for non-words)."""
+        prons = self.load()._words.get(_key(word))
+        if prons:
+            self._counters["hits"] += 1
+            return prons[0], False
+        guess = guess_phones(word)
+        if not guess:
+            return None, False
+        self._counters["guessed"] += 1
+        return guess, True
+
+    def stats(self) -> Dict:
+        out = dict(self._counters)
+        out["words"] = len(self._words) if self._words is not None else None
+        out["source"] = self.source
+        return out
+
+
+_INDEX: Optional[PhonemeIndex] = None
+_INDEX_LOCK = threading.Lock()
+
+
+def get_phoneme_index(path: Optional[str] = None) -> PhonemeIndex:
+    """Process-wide PhonemeIndex (PHONEME_INDEX_PATH / models/phonemes.pkl); an explicit path gets its own instance."""
+    global _INDEX
+    if path:
+        return PhonemeIndex(path)
+    with _INDEX_LOCK:
+        if _INDEX is None:
+            _INDEX = PhonemeIndex()
+        return _INDEX
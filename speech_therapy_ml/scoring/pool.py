@@ -0,0 +1,340 @@
+"""
+speech_therapy_ml/scoring/pool.py
+
+ScorerPool:
+  - N persistent worker processes, each holding its own Scorer (same ScorerConfig), so pitch tracking
+    and feature extraction run on N cores instead of contending for one interpreter's GIL
+  - Audio goes to the worker through a multiprocessing.shared_memory block (one copy in, one copy out);
+    only the small arguments and the result dict are pickled
+  - Dispatch: attempts of one speaker_id always go to the same worker (its F0 profile lives there),
+    everything else to the least-loaded worker
+  - .submit(...) -> concurrent.futures.Future (asyncio.wrap_future for the API);
+    .score_batch(items) -> results in input order, a failed item is its exception instead of a dict
+  - A worker process that dies is replaced: the attempt it was running fails, the ones queued behind it
+    are resubmitted to the replacement
+  - An attempt running longer than attempt_timeout_s (counted from when it reaches the front of a started
+    worker's queue) fails with TimeoutError; its worker is killed and replaced the same way
+
+Usage:
+  pool = ScorerPool(workers=4, cfg=ScorerConfig(pitch_backend="nccf"))
+  pool.warm_up()
+  results = pool.score_batch([{"expected_text": "ship", "aligned_result": aligned, "audio_np": audio, "audio_sr": 16000}])
+"""
+
+from __future__ import annotations
+
+import multiprocessing as mp
+import os
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Deque, Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+def default_workers() -> int:
+    return max(1, (os.cpu_count() or 1) // 2)
+
+
+# ----- worker side -----
+
+_WORKER_SCORER = None
+
+
+def _init_worker(cfg, sample_rate: int):
+    global _WORKER_SCORER
+    from .scorer import Scorer
+    _WORKER_SCORER = Scorer(sample_rate=sample_rate, cfg=cfg)
+
+
+def _score_shared(shm_name: str, shape, dtype: str, kwargs: Dict[str, Any]) -> Dict:
+    # copy out and detach right away: nothing the scorer keeps (or an exception traceback) can pin the block
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        audio = np.array(np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+    finally:
+        shm.close()
+    return _WORKER_SCORER.score_utterance(audio_np=audio, **kwargs)
+
+
+def _worker_stats() -> Dict:
+    s = _WORKER_SCORER
+    return {
+        "pid": os.getpid(),
+        "speaker_profiles": s.speakers.stats(),
+        "phonemes": s.phonemes.stats(),
+        "templates": s.templates.stats() if s.templates is not None else None,
+    }
+
+
+# ----- parent side -----
+
+ATTEMPT_TIMEOUT_S = 60.0  # one attempt is well under a second; a worker past this is hung
+
+
+class _Attempt:
+    """One submitted attempt: its call, shared-memory audio, the caller's future and the worker holding it."""
+    __slots__ = ("args", "shm", "timeout", "future", "worker", "started")
+
+    def __init__(self, args, shm, timeout: Optional[float]):
+        self.args = args
+        self.shm = shm
+        self.timeout = timeout
+        self.future: Future = Future()
+        self.worker: Optional[ProcessPoolExecutor] = None
+        self.started: Optional[float] = None  # when it reached the head of a started worker's queue
+
+
+class ScorerPool:
+    def __init__(self, workers: Optional[int] = None, cfg=None, sample_rate: int = 16000,
+                 attempt_timeout_s: Optional[float] = ATTEMPT_TIMEOUT_S):
+        from .scorer import ScorerConfig
+        self.cfg = cfg if cfg is not None else ScorerConfig()
+        self.sample_rate = sample_rate
+        self.attempt_timeout_s = attempt_timeout_s
+        size = workers if workers is not None else default_workers()
+        assert size >= 1, "ScorerPool needs at least one worker"
+        # spawn: the API process runs threads and native runtimes that fork() would copy mid-flight
+        self._ctx = mp.get_context("spawn")
+        self._workers: List[ProcessPoolExecutor] = [self._new_worker() for _ in range(size)]
+        self._lock = threading.Lock()
+        self._booting = set(self._workers)  # processes still starting up: their queued attempts' clocks wait
+        # per worker, its attempts in submission order: the head is running, the rest wait behind it
+        self._pending: List[Deque[_Attempt]] = [deque() for _ in range(size)]
+        self._completed = [0] * size
+        self._failed = [0] * size
+        self._restarts = 0
+        self._timeouts = 0
+        self._closed = False
+        self._stop = threading.Event()
+        self._watchdog: Optional[threading.Thread] = None
+        if attempt_timeout_s is not None:
+            self._watchdog = threading.Thread(target=self._watch, name="scorer-pool-watchdog", daemon=True)
+            self._watchdog.start()
+        for w in self._workers:
+            self._boot(w)
+
+    def _new_worker(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=1, mp_context=self._ctx, initializer=_init_worker,
+                                   initargs=(self.cfg, self.sample_rate))
+
+    def _boot(self, worker: ProcessPoolExecutor):
+        """Start the worker's process now; an attempt's timeout only counts once the process has answered,
+        so spawn and imports are not charged to the first attempt."""
+        try:
+            ping = worker.submit(os.getpid)
+        except BrokenProcessPool:
+            ping = None
+        if ping is None:
+            self._booted(worker)
+        else:
+            ping.add_done_callback(lambda _: self._booted(worker))
+
+    def _booted(self, worker: ProcessPoolExecutor):
+        with self._lock:
+            self._booting.discard(worker)
+            for idx, w in enumerate(self._workers):
+                if w is worker:
+                    self._start_head(idx)
+
+    def _start_head(self, idx: int):
+        """Start the timeout clock of the attempt at the head of worker idx's queue. Caller holds the lock."""
+        queue = self._pending[idx]
+        if queue and queue[0].started is None and self._workers[idx] not in self._booting:
+            queue[0].started = time.monotonic()
+
+    @property
+    def size(self) -> int:
+        return len(self._workers)
+
+    def _pick(self, speaker_id: Optional[str]) -> int:
+        """Caller holds the lock."""
+        if speaker_id is not None:
+            return zlib.crc32(str(speaker_id).encode()) % self.size
+        return min(range(self.size), key=lambda i: len(self._pending[i]))
+
+    def submit(self, expected_text: str, aligned_result: dict, audio_np, audio_sr: int,
+               asr_hypothesis: Optional[str] = None, debug: bool = False, time_map=None,
+               speaker_id: Optional[str] = None) -> Future:
+        """Score one attempt on a worker; same arguments as Scorer.score_utterance (time_map must pickle).
+        The future fails with TimeoutError if the attempt runs longer than attempt_timeout_s."""
+        kwargs = dict(expected_text=expected_text, aligned_result=aligned_result, audio_sr=audio_sr,
+                      asr_hypothesis=asr_hypothesis, debug=debug, time_map=time_map, speaker_id=speaker_id)
+        with self._lock:
+            idx = self._pick(speaker_id)
+        return self._submit(idx, audio_np, kwargs, self.attempt_timeout_s)
+
+    def _submit(self, idx: int, audio_np, kwargs: Dict[str, Any], timeout: Optional[float]) -> Future:
+        a = np.ascontiguousarray(np.asarray(audio_np))
+        shm = shared_memory.SharedMemory(create=True, size=max(1, a.nbytes))
+        np.ndarray(a.shape, dtype=a.dtype, buffer=shm.buf)[...] = a
+        att = _Attempt((_score_shared, shm.name, a.shape, a.dtype.str, kwargs), shm, timeout)
+        with self._lock:
+            queue = self._pending[idx]
+            queue.append(att)
+            att.worker = self._workers[idx]
+            self._start_head(idx)
+        try:
+            self._send(idx, att)
+        except BaseException:
+            self._release(idx, att, failed=True)
+            raise
+        return att.future
+
+    def _send(self, idx: int, att: _Attempt):
+        worker = att.worker
+        try:
+            fut = worker.submit(*att.args)
+        except BrokenProcessPool:  # died since its last attempt finished; _recover sends att to the replacement
+            self._recover(idx, worker, blame_head=False)
+            return
+        fut.add_done_callback(lambda f: self._done(idx, att, worker, f))
+
+    def _release(self, idx: int, att: _Attempt, failed: bool) -> bool:
+        """Take a finished attempt off its worker's queue and free its audio; False if it was already taken."""
+        with self._lock:
+            queue = self._pending[idx]
+            try:
+                queue.remove(att)
+            except ValueError:
+                return False
+            self._completed[idx] += 1
+            if failed:
+                self._failed[idx] += 1
+            self._start_head(idx)
+        att.shm.close()
+        att.shm.unlink()
+        return True
+
+    def _done(self, idx: int, att: _Attempt, worker: ProcessPoolExecutor, fut: Future):
+        if fut.cancelled():  # close() dropped it before it ran
+            if self._release(idx, att, failed=True):
+                att.future.cancel()
+            return
+        err = fut.exception()
+        if isinstance(err, BrokenProcessPool) and not self._closed:
+            with self._lock:
+                # moved to a replacement already, or timed out (its worker was killed on purpose)
+                stale = att.worker is not worker or att.future.done()
+            if not stale:
+                self._recover(idx, worker, blame_head=True)
+            return
+        if self._release(idx, att, failed=err is not None):
+            if err is None:
+                att.future.set_result(fut.result())
+            else:
+                att.future.set_exception(err)
+
+    def _recover(self, idx: int, broken: ProcessPoolExecutor, blame_head: bool):
+        """Replace a dead worker and resubmit the attempts queued on it. With blame_head, the oldest one (the
+        attempt it was running, which may be what killed it) fails instead of being retried."""
+        booting = None
+        with self._lock:
+            if self._workers[idx] is broken:
+                booting = self._workers[idx] = self._new_worker()
+                self._booting.add(booting)
+                self._restarts += 1
+            fresh = self._workers[idx]
+            queue = self._pending[idx]
+            moved = [a for a in queue if a.worker is broken]
+            culprit = moved.pop(0) if blame_head and moved and moved[0] is queue[0] else None
+            for a in moved:
+                a.worker = fresh
+                a.started = None
+            self._start_head(idx)
+        broken.shutdown(wait=False)
+        if booting is not None:
+            self._boot(booting)
+        if culprit is not None and self._release(idx, culprit, failed=True):
+            culprit.future.set_exception(BrokenProcessPool("scorer worker died while running this attempt"))
+        for a in moved:
+            self._send(idx, a)
+
+    def _watch(self):
+        interval = min(1.0, self.attempt_timeout_s / 4)
+        while not self._stop.wait(interval):
+            now = time.monotonic()
+            with self._lock:
+                hung = [(idx, q[0]) for idx, q in enumerate(self._pending)
+                        if q and q[0].timeout is not None and q[0].started is not None
+                        and now - q[0].started > q[0].timeout]
+            for idx, att in hung:
+                self._expire(idx, att)
+
+    def _expire(self, idx: int, att: _Attempt):
+        """Fail a hung attempt, move the attempts behind it to a fresh worker, then kill the hung process."""
+        with self._lock:
+            hung = att.worker
+            if self._closed or self._workers[idx] is not hung or att.future.done():
+                return
+            self._timeouts += 1
+        # ProcessPoolExecutor has no public way to stop a running call. Take its processes now:
+        # _recover shuts the executor down, which forgets them
+        procs = list((getattr(hung, "_processes", None) or {}).values())
+        if self._release(idx, att, failed=True):
+            att.future.set_exception(TimeoutError(f"scoring attempt exceeded {att.timeout:g} s"))
+        self._recover(idx, hung, blame_head=False)
+        # its callbacks are stale by now; killing the process also lets its manager thread exit
+        for proc in procs:
+            proc.terminate()
+
+    def score_batch(self, items: Sequence[Dict[str, Any]]) -> List[Any]:
+        """Score every item (score_utterance keyword arguments) in parallel; results in input order, with a
+        failed item's exception in its slot so one bad attempt does not sink the batch."""
+        futures = []
+        for item in items:
+            try:
+                futures.append(self.submit(**item))
+            except Exception as e:  # bad arguments / unreadable audio for this item only
+                failed: Future = Future()
+                failed.set_exception(e)
+                futures.append(failed)
+        out = []
+        for fut in futures:
+            try:
+                out.append(fut.result())
+            except Exception as e:
+                out.append(e)
+        return out
+
+    def warm_up(self):
+        """Start every worker and push one dummy attempt through it (librosa import, numba compiles)."""
+        sr = self.sample_rate
+        audio = np.random.default_rng(0).normal(0.0, 0.01, sr).astype(np.float32)
+        aligned = {"segments": [{"words": [{"word": "hello", "start": 0.1, "end": 0.6, "score": 0.9}]}]}
+        kwargs = dict(expected_text="hello", aligned_result=aligned, audio_sr=sr)
+        # no timeout: the first attempt includes process start, imports and compiles
+        for fut in [self._submit(idx, audio, kwargs, None) for idx in range(self.size)]:
+            fut.result()
+
+    def worker_stats(self, timeout: float = 1.0) -> List[Optional[Dict]]:
+        """Each worker's scorer stats (speaker profiles, phoneme index, templates); None if it is too busy to answer."""
+        out = []
+        for w in list(self._workers):
+            try:
+                out.append(w.submit(_worker_stats).result(timeout=timeout))
+            except Exception:
+                out.append(None)
+        return out
+
+    def stats(self) -> Dict:
+        with self._lock:
+            return {
+                "workers": self.size,
+                "in_flight": [len(q) for q in self._pending],
+                "completed": list(self._completed),
+                "failed": list(self._failed),
+                "restarts": self._restarts,
+                "timeouts": self._timeouts,
+            }
+
+    def close(self, wait: bool = True):
+        self._closed = True
+        self._stop.set()
+        for w in self._workers:
+            w.shutdown(wait=wait, cancel_futures=True)
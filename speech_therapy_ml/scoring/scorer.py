@@ -9,22 +9,32 @@ import math
 import tempfile
 import os
 import json
-from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
+from typing import Callable, List, Dict, Any, Optional
 
-# libs used
-try:
-    import pronouncing
-except Exception:
-    pronouncing = None
+# librosa takes ~1 s to import; load it on first feature extraction instead of at import time.
+_LIBROSA = None
 
-try:
-    import soundfile as sf
-    import librosa
-except Exception as e:
-    raise ImportError("scorer requires 'soundfile' and 'librosa'. Install them (pip install soundfile librosa). Error: " + str(e))
+def _librosa():
+    global _LIBROSA
+    if _LIBROSA is None:
+        try:
+            import librosa
+        except Exception as e:
+            raise ImportError("scorer requires 'librosa'. Install it (pip install librosa). Error: " + str(e))
+        _LIBROSA = librosa
+    return _LIBROSA
 
 from difflib import SequenceMatcher
 from .azure_tts import AzureTTS
+from .dtw import dtw_cost
+from .features import FeatureFrames
+from .gop import GOP_WEAK, CTCEmissions, word_gop
+from .phonemes import get_phoneme_index
+from .pitch import get_pitch_backend
+from .speaker import SpeakerProfileStore
+from .pool import ATTEMPT_TIMEOUT_S, ScorerPool
+from .templates import DEFAULT_BANK_PATH, N_MFCC, TemplateBank
 
 # ---------- Text utilities ----------
 def normalize_text(s: str) -> str:
@@ -45,20 +55,21 @@ def _extract_text_from_word_dict(w: Dict) -> str:
         return w["token"].strip()
     return ""
 
+def flat_word(w: Dict) -> Dict:
+    """One aligned word dict (whisperx / whisper keys) -> {"word", "start", "end", "confidence"}; word may be ""."""
+    txt = _extract_text_from_word_dict(w)
+    start = w.get("start", w.get("start_time", w.get("s", 0.0)))
+    end = w.get("end", w.get("end_time", w.get("e", 0.0)))
+    conf = w.get("confidence", w.get("probability", w.get("score", None)))
+    return {
+        "word": txt,
+        "start": float(start) if start is not None else 0.0,
+        "end": float(end) if end is not None else 0.0,
+        "confidence": float(conf) if conf is not None else None
+    }
+
 def flatten_whisperx_words(aligned_result: Dict, asr_hypothesis: Optional[str] = None) -> List[Dict]:
-    words: List[Dict] = []
-    for seg in aligned_result.get("segments", []):
-        for w in seg.get("words", []):
-            txt = _extract_text_from_word_dict(w)
-            start = w.get("start", w.get("start_time", w.get("s", 0.0)))
-            end = w.get("end", w.get("end_time", w.get("e", 0.0)))
-            conf = w.get("confidence", w.get("probability", w.get("score", None)))
-            words.append({
-                "word": txt,
-                "start": float(start) if start is not None else 0.0,
-                "end": float(end) if end is not None else 0.0,
-                "confidence": float(conf) if conf is not None else None
-            })
+    words: List[Dict] = [flat_word(w) for seg in aligned_result.get("segments", []) for w in seg.get("words", [])]
 
     num_empty = sum(1 for w in words if not w["word"])
     if num_empty > 0 and asr_hypothesis:
@@ -89,7 +100,9 @@ def flatten_whisperx_words(aligned_result: Dict, asr_hypothesis: Optional[str] =
 
 # ---------- Simple alignment (string-level) ----------
 def simple_word_alignment(expected_tokens: List[str], actual_tokens: List[str]) -> List[Dict]:
-    sm = SequenceMatcher(a=expected_tokens, b=actual_tokens)
+    # autojunk off: from 200 actual words on it would drop common words ("the", "a") from matching,
+    # which misaligns whole reading passages
+    sm = SequenceMatcher(a=expected_tokens, b=actual_tokens, autojunk=False)
     out = []
     for tag, i1, i2, j1, j2 in sm.get_opcodes():
         if tag == "equal":
@@ -121,29 +134,28 @@ def compute_mfcc(y: np.ndarray, sr: int, n_mfcc: int = 13) -> np.ndarray:
         y = y.astype(np.float32)
     if np.all(np.abs(y) < 1e-7):
         return np.zeros((n_mfcc, 1), dtype=np.float32)
-    mf = librosa.feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc)
+    mf = _librosa().feature.mfcc(y=y, sr=sr, n_mfcc=n_mfcc)
     return mf
 
 def dtw_distance(mfcc_ref: np.ndarray, mfcc_test: np.ndarray) -> float:
-    D, wp = librosa.sequence.dtw(X=mfcc_ref, Y=mfcc_test, metric="euclidean")
-    cost = float(D[-1, -1])
-    path_len = len(wp) if wp is not None else (mfcc_ref.shape[1] + mfcc_test.shape[1]) / 2.0
-    if path_len <= 0:
-        return cost
-    return cost / float(path_len)
+    # cost-only wavefront (scoring/dtw.py); same value as librosa.sequence.dtw's D[-1, -1] / len(wp)
+    return dtw_cost(mfcc_ref, mfcc_test)
 
 # ---------- Prosody helpers ----------
 def _to_float_audio(audio: np.ndarray) -> np.ndarray:
+    # np.asarray on an asr.AudioBuffer is its samples; float32 mono input is used as-is
     a = np.asarray(audio)
+    if a.ndim > 1:
+        a = a[:, 0]
     if a.dtype == np.int16:
-        f = (a.astype(np.float32) / 32768.0).astype(np.float32)
-    else:
         f = a.astype(np.float32)
-    if f.ndim > 1:
-        f = f[:, 0]
+        f /= 32768.0
+    else:
+        f = a.astype(np.float32, copy=False)
     return f
 
 def _safe_pyin(y: np.ndarray, sr: int, fmin_hz: float = None, fmax_hz: float = None, frame_length: int = 2048, hop_length: int = 256):
+    librosa = _librosa()
     if fmin_hz is None:
         fmin_hz = librosa.note_to_hz('C2')
     if fmax_hz is None:
@@ -167,6 +179,17 @@ def _safe_pyin(y: np.ndarray, sr: int, fmin_hz: float = None, fmax_hz: float = N
         except Exception:
             return np.zeros(1, dtype=np.float32), np.array([False]), None, np.array([0.0])
 
+def _fit_frames(a: np.ndarray, n: int, fill) -> np.ndarray:
+    """Trim / pad a per-frame track to n frames (pitch trackers on the shared grid already return n)."""
+    if len(a) == n:
+        return a
+    if len(a) > n:
+        return a[:n]
+    return np.concatenate((a, np.full(n - len(a), fill, dtype=a.dtype)))
+
+def _voiced_ratio(voiced_flag) -> float:
+    return float(np.mean(voiced_flag)) if voiced_flag is not None and np.size(voiced_flag) else 0.0
+
 def _smooth_array(arr: np.ndarray, window: int = 3) -> np.ndarray:
     if arr is None or arr.size == 0:
         return arr
@@ -175,11 +198,308 @@ def _smooth_array(arr: np.ndarray, window: int = 3) -> np.ndarray:
     kernel = np.ones(window, dtype=np.float32) / float(window)
     return np.convolve(arr, kernel, mode='same')
 
+def _segment_mean_std(values: np.ndarray, seg_start: np.ndarray, seg_len: np.ndarray, with_std: bool = True):
+    """
+    np.mean / np.std of values[s:s + n] for every segment with n >= 1 (others are left at 0).
+    Segments are bucketed by length and each bucket is reduced as one (k, n) window array, which
+    sums in the same pairwise order as a 1-D reduction of length n, so results are bit-identical
+    to per-slice calls (np.add.reduceat / cumsum tricks are not).
+    """
+    mean = np.zeros(len(seg_start), dtype=np.float64)
+    std = np.zeros(len(seg_start), dtype=np.float64)
+    if len(seg_start) == 0:
+        return mean, std
+    order = np.argsort(seg_len, kind="stable")
+    lengths = seg_len[order]
+    bounds = np.flatnonzero(np.diff(lengths)) + 1
+    for rows in np.split(order, bounds):
+        n = int(seg_len[rows[0]])
+        if n <= 0:
+            continue
+        if len(rows) == 1:  # a view is cheaper than building a one-row window array
+            seg = values[int(seg_start[rows[0]]):int(seg_start[rows[0]]) + n]
+            mean[rows] = np.mean(seg)
+            if with_std:
+                std[rows] = np.std(seg)
+            continue
+        windows = np.lib.stride_tricks.as_strided(values, shape=(len(values) - n + 1, n),
+                                                  strides=(values.strides[0],) * 2, writeable=False)[seg_start[rows]]
+        mean[rows] = windows.mean(axis=1)
+        if with_std:
+            std[rows] = windows.std(axis=1)
+    return mean, std
+
+def _segment_counts(mask: np.ndarray, seg_start: np.ndarray, seg_end: np.ndarray) -> np.ndarray:
+    """Number of True entries of mask[s:e] per segment."""
+    c = np.concatenate(([0], np.cumsum(mask, dtype=np.int64)))
+    return c[seg_end] - c[seg_start]
+
+# per-word prosody reliability (tuning knobs)
+MIN_FRAMES = 1
+MIN_VOICED_RATIO = 0.05
+LOW_ENERGY_DB_FOR_VOICED = -50.0
+MIN_F0 = 40.0
+MAX_F0 = 600.0
+MAX_F0_STD = 200.0
+MAX_OUTLIER_PROP = 0.6
+VERY_LOW_ENERGY_DB = -85.0
+
+# up to this many words the per-word loop is cheaper: the vectorized pass carries ~0.15 ms of fixed
+# NumPy overhead and only wins from ~8 words on (python -m benchmarks.word_prosody)
+WORD_PROSODY_LOOP_MAX_WORDS = 6
+
+def _word_prosody(words: List[Dict], times: np.ndarray, f0_raw: np.ndarray, f0_smoothed: np.ndarray,
+                  energy_db_smoothed: np.ndarray, voiced_flag) -> List[Dict]:
+    """
+    Per-word F0 / energy / voicing stats and reliability reasons. Both paths give identical records;
+    short utterances (and StreamingScorer's one-word calls) take the loop.
+    """
+    if len(words) <= WORD_PROSODY_LOOP_MAX_WORDS:
+        return _word_prosody_loop(words, times, f0_raw, f0_smoothed, energy_db_smoothed, voiced_flag)
+    return _word_prosody_vectorized(words, times, f0_raw, f0_smoothed, energy_db_smoothed, voiced_flag)
+
+def _word_prosody_loop(words: List[Dict], times: np.ndarray, f0_raw: np.ndarray, f0_smoothed: np.ndarray,
+                       energy_db_smoothed: np.ndarray, voiced_flag) -> List[Dict]:
+    """_word_prosody one word at a time: slices and scalar reductions, cheapest for a handful of words."""
+    word_prosody = []
+    for w in words:
+        start = w.get("start", None)
+        end = w.get("end", None)
+        if start is None or end is None:
+            word_prosody.append({
+                "f0_mean_hz": None,
+                "f0_std_hz": None,
+                "energy_db_mean": None,
+                "voiced_ratio": None,
+                "prosody_reliable": None,
+                "stress_score": None,
+                "_unreliable_reasons": []
+            })
+            continue
+
+        if times.size == 0:
+            # fallback global stats
+            f0_mean = float(np.nanmean(f0_smoothed)) if f0_smoothed.size > 0 else 0.0
+            f0_std = float(np.nanstd(f0_smoothed)) if f0_smoothed.size > 0 else 0.0
+            energy_mean = float(np.mean(energy_db_smoothed)) if energy_db_smoothed.size > 0 else -120.0
+            voiced_ratio = float(np.mean(voiced_flag)) if voiced_flag is not None else 0.0
+            frames_count = max(1, f0_smoothed.size)
+            f0_vals_voiced = f0_raw[np.isfinite(f0_raw)] if f0_raw.size > 0 else np.array([])
+        else:
+            s_idx = int(np.searchsorted(times, start, side='left'))
+            e_idx = int(np.searchsorted(times, end, side='right'))
+            if e_idx <= s_idx:
+                s_idx = max(0, s_idx - 1)
+                e_idx = min(len(times), s_idx + 1)
+            frames_count = max(1, e_idx - s_idx)
+            f0_slice_raw = f0_raw[s_idx:e_idx] if f0_raw.size > 0 else np.array([])
+            f0_slice_smoothed = f0_smoothed[s_idx:e_idx] if f0_smoothed.size > 0 else np.array([])
+            energy_slice = energy_db_smoothed[s_idx:e_idx] if energy_db_smoothed.size > 0 else np.array([])
+            # voiced ratio using raw un-interpolated detection (if available)
+            if f0_slice_raw.size > 0:
+                voiced_ratio = float(np.sum(np.isfinite(f0_slice_raw)) / float(max(1, f0_slice_raw.size)))
+            else:
+                voiced_ratio = 0.0
+
+            # voiced f0 values (raw)
+            f0_vals_voiced = f0_slice_raw[np.isfinite(f0_slice_raw)] if f0_slice_raw.size > 0 else np.array([])
+
+            # compute f0 stats:
+            if f0_vals_voiced.size > 0:
+                f0_mean = float(np.mean(f0_vals_voiced))
+                f0_std = float(np.std(f0_vals_voiced))
+            elif f0_slice_smoothed.size > 0:
+                # no voiced raw frames: use smoothed interpolation as fallback
+                f0_mean = float(np.mean(f0_slice_smoothed))
+                f0_std = float(np.std(f0_slice_smoothed))
+            else:
+                f0_mean = 0.0
+                f0_std = 0.0
+
+            energy_mean = float(np.mean(energy_slice)) if energy_slice.size > 0 else float(np.mean(energy_db_smoothed) if energy_db_smoothed.size > 0 else -120.0)
+
+        # safe numeric defaults
+        if not np.isfinite(f0_mean):
+            f0_mean = 0.0
+        if not np.isfinite(f0_std):
+            f0_std = 0.0
+        if not np.isfinite(energy_mean):
+            energy_mean = -120.0
+        if not np.isfinite(voiced_ratio):
+            voiced_ratio = 0.0
+
+        # outlier proportion: voiced frames outside plausible bounds
+        outlier_prop = 0.0
+        if f0_vals_voiced.size > 0:
+            outlier_prop = float(np.sum((f0_vals_voiced < MIN_F0) | (f0_vals_voiced > MAX_F0)) / float(f0_vals_voiced.size))
+
+        # Decision rules: collect reasons for unreliability, mark False only if clear problem(s)
+        reasons = []
+        if frames_count < MIN_FRAMES:
+            reasons.append("few_frames")
+        # if little voicing and very low energy => unreliable
+        if voiced_ratio < MIN_VOICED_RATIO and energy_mean < LOW_ENERGY_DB_FOR_VOICED:
+            reasons.append("low_voicing_low_energy")
+        # extremes
+        if (f0_mean < (MIN_F0 - 10)) or (f0_mean > (MAX_F0 + 100)):
+            reasons.append("f0_out_of_range")
+        if f0_std > MAX_F0_STD:
+            reasons.append("high_f0_variability")
+        if outlier_prop > MAX_OUTLIER_PROP:
+            reasons.append("many_outliers")
+        if energy_mean < VERY_LOW_ENERGY_DB:
+            reasons.append("very_low_energy")
+
+        # prosody reliable only if no reasons
+        prosody_reliable = True if len(reasons) == 0 else False
+
+        # create stress score: energy normalized within utterance (nudge small zeros)
+        # We'll fill stress later; put placeholder for now
+        word_prosody.append({
+            "f0_mean_hz": round(f0_mean, 1),
+            "f0_std_hz": round(f0_std, 1),
+            "energy_db_mean": round(energy_mean, 3),
+            "voiced_ratio": round(voiced_ratio, 3),
+            "prosody_reliable": prosody_reliable,
+            "stress_score": None,
+            "_unreliable_reasons": reasons
+        })
+
+    return word_prosody
+
+def _word_prosody_vectorized(words: List[Dict], times: np.ndarray, f0_raw: np.ndarray, f0_smoothed: np.ndarray,
+                             energy_db_smoothed: np.ndarray, voiced_flag) -> List[Dict]:
+    """
+    _word_prosody over all words at once: word boundaries become frame ranges once; every per-word
+    statistic then comes from one vectorized pass.
+    """
+    empty = {"f0_mean_hz": None, "f0_std_hz": None, "energy_db_mean": None, "voiced_ratio": None,
+             "prosody_reliable": None, "stress_score": None, "_unreliable_reasons": []}
+    timed = [i for i, w in enumerate(words) if w.get("start", None) is not None and w.get("end", None) is not None]
+    n_words = len(timed)
+
+    if times.size == 0:
+        # fallback global stats, identical for every word
+        f0_mean = np.full(n_words, float(np.nanmean(f0_smoothed)) if f0_smoothed.size > 0 else 0.0)
+        f0_std = np.full(n_words, float(np.nanstd(f0_smoothed)) if f0_smoothed.size > 0 else 0.0)
+        energy_mean = np.full(n_words, float(np.mean(energy_db_smoothed)) if energy_db_smoothed.size > 0 else -120.0)
+        voiced_ratio = np.full(n_words, float(np.mean(voiced_flag)) if voiced_flag is not None else 0.0)
+        frames_count = np.full(n_words, max(1, f0_smoothed.size))
+        f0_vals_voiced = f0_raw[np.isfinite(f0_raw)] if f0_raw.size > 0 else np.array([])
+        n_voiced = np.full(n_words, f0_vals_voiced.size)
+        n_outliers = np.full(n_words, int(np.sum((f0_vals_voiced < MIN_F0) | (f0_vals_voiced > MAX_F0))))
+    else:
+        # word boundaries -> [s_idx, e_idx) frame ranges
+        starts = np.array([words[i]["start"] for i in timed], dtype=np.float64)
+        ends = np.array([words[i]["end"] for i in timed], dtype=np.float64)
+        s_idx = np.searchsorted(times, starts, side='left')
+        e_idx = np.searchsorted(times, ends, side='right')
+        empty_range = e_idx <= s_idx
+        s_idx = np.where(empty_range, np.maximum(0, s_idx - 1), s_idx)
+        e_idx = np.where(empty_range, np.minimum(len(times), s_idx + 1), e_idx)
+        frames_count = np.maximum(1, e_idx - s_idx)
+
+        def clip(a):  # the same ranges as a[s_idx:e_idx] slicing gives on a possibly shorter contour
+            return np.minimum(s_idx, a.size), np.minimum(e_idx, a.size)
+
+        # voiced ratio using raw un-interpolated detection (if available)
+        rs, re = clip(f0_raw)
+        raw_len = re - rs
+        voiced = np.isfinite(f0_raw)
+        n_voiced = _segment_counts(voiced, rs, re)
+        voiced_ratio = np.where(raw_len > 0, n_voiced / np.maximum(1, raw_len).astype(np.float64), 0.0)
+
+        # f0 stats over voiced raw frames; no voiced raw frames: smoothed interpolation as fallback
+        f0_vals_voiced = f0_raw[voiced]
+        v_start = _segment_counts(voiced, np.zeros_like(rs), rs)
+        f0_mean, f0_std = _segment_mean_std(f0_vals_voiced, v_start, n_voiced)
+        use_smoothed = np.flatnonzero(n_voiced == 0)
+        if use_smoothed.size:
+            ss, se = clip(f0_smoothed)
+            f0_mean[use_smoothed], f0_std[use_smoothed] = _segment_mean_std(
+                f0_smoothed, ss[use_smoothed], se[use_smoothed] - ss[use_smoothed])
+
+        es, ee = clip(energy_db_smoothed)
+        energy_mean, _ = _segment_mean_std(energy_db_smoothed, es, ee - es, with_std=False)
+        energy_fallback = float(np.mean(energy_db_smoothed) if energy_db_smoothed.size > 0 else -120.0)
+        energy_mean = np.where(ee > es, energy_mean, energy_fallback)
+
+        outlier = (f0_vals_voiced < MIN_F0) | (f0_vals_voiced > MAX_F0)
+        n_outliers = _segment_counts(outlier, v_start, v_start + n_voiced)
+
+    # safe numeric defaults
+    f0_mean = np.where(np.isfinite(f0_mean), f0_mean, 0.0)
+    f0_std = np.where(np.isfinite(f0_std), f0_std, 0.0)
+    energy_mean = np.where(np.isfinite(energy_mean), energy_mean, -120.0)
+    voiced_ratio = np.where(np.isfinite(voiced_ratio), voiced_ratio, 0.0)
+
+    # outlier proportion: voiced frames outside plausible bounds
+    outlier_prop = np.where(n_voiced > 0, n_outliers / np.maximum(1, n_voiced).astype(np.float64), 0.0)
+
+    # Decision rules: collect reasons for unreliability, mark False only if clear problem(s)
+    checks = (
+        ("few_frames", frames_count < MIN_FRAMES),
+        # if little voicing and very low energy => unreliable
+        ("low_voicing_low_energy", (voiced_ratio < MIN_VOICED_RATIO) & (energy_mean < LOW_ENERGY_DB_FOR_VOICED)),
+        # extremes
+        ("f0_out_of_range", (f0_mean < (MIN_F0 - 10)) | (f0_mean > (MAX_F0 + 100))),
+        ("high_f0_variability", f0_std > MAX_F0_STD),
+        ("many_outliers", outlier_prop > MAX_OUTLIER_PROP),
+        ("very_low_energy", energy_mean < VERY_LOW_ENERGY_DB),
+    )
+    flagged = [(name, np.flatnonzero(hit)) for name, hit in checks if hit.any()]
+    reasons = [[] for _ in range(n_words)]
+    for name, rows in flagged:
+        for r in rows.tolist():
+            reasons[r].append(name)
+
+    word_prosody = [dict(empty, _unreliable_reasons=[]) for _ in words]
+    for k, (i, fm, fs, em, vr) in enumerate(zip(timed, f0_mean.tolist(), f0_std.tolist(),
+                                                energy_mean.tolist(), voiced_ratio.tolist())):
+        # prosody reliable only if no reasons; stress_score is filled in after utterance-level normalization
+        word_prosody[i] = {
+            "f0_mean_hz": round(fm, 1),
+            "f0_std_hz": round(fs, 1),
+            "energy_db_mean": round(em, 3),
+            "voiced_ratio": round(vr, 3),
+            "prosody_reliable": len(reasons[k]) == 0,
+            "stress_score": None,
+            "_unreliable_reasons": reasons[k]
+        }
+    return word_prosody
+
 # ---------- Main Scorer ----------
+@dataclass
+class ScorerConfig:
+    pitch_backend: str = "pyin"        # "pyin" | "yin" | "nccf" (scoring/pitch.py); ~50x faster than pyin but
+                                       # voice far fewer frames (agreement with pyin ~62% yin, ~74% nccf)
+    speaker_capacity: int = 1024       # per-speaker F0 profiles kept in memory (scoring/speaker.py)
+    speaker_store_path: Optional[str] = None  # SQLite file so profiles survive restarts
+    phoneme_index_path: Optional[str] = None  # pickled word -> phones index (scoring/phonemes.py); None -> shared default
+    template_bank_path: Optional[str] = None  # reference MFCC templates (scoring/templates.py); None -> models/templates
+
 class Scorer:
-    def __init__(self, azure_tts: AzureTTS | None = None, sample_rate: int = 16000):
+    def __init__(self, azure_tts: AzureTTS | None = None, sample_rate: int = 16000, cfg: ScorerConfig = ScorerConfig()):
         self.azure_tts = azure_tts
         self.sample_rate = sample_rate
+        self.cfg = cfg
+        self.pitch = get_pitch_backend(cfg.pitch_backend)
+        self.speakers = SpeakerProfileStore(capacity=cfg.speaker_capacity, disk_path=cfg.speaker_store_path)
+        self.phonemes = get_phoneme_index(cfg.phoneme_index_path)
+        # memory-mapped; None (acoustic_score stays None) until `python -m scoring.build_templates` has run
+        self.templates = TemplateBank.load(cfg.template_bank_path or DEFAULT_BANK_PATH)
+        self.pool: Optional[ScorerPool] = None
+
+    def _track_pitch(self, ff: FeatureFrames, speaker_id: Optional[str]):
+        """Pitch track on ff's frame grid, over the speaker's profile range when there is one; the full
+        range for unknown speakers and whenever voicing collapses inside the narrowed range."""
+        grid = dict(frame_length=ff.frame_length, hop_length=ff.hop_length, features=ff)
+        rng = self.speakers.pitch_range(speaker_id) if speaker_id is not None else None
+        if rng is not None:
+            track = self.pitch.track(ff.y, ff.sr, fmin_hz=rng[0], fmax_hz=rng[1], **grid)
+            if not self.speakers.collapsed(speaker_id, _voiced_ratio(track[1])):
+                return track
+        return self.pitch.track(ff.y, ff.sr, **grid)
 
     def score_utterance(self,
                        expected_text: str,
@@ -187,33 +507,39 @@ class Scorer:
                        audio_np: np.ndarray,
                        audio_sr: int,
                        asr_hypothesis: Optional[str] = None,
-                       debug: bool = False) -> dict:
+                       debug: bool = False,
+                       time_map: Optional[Callable] = None,
+                       speaker_id: Optional[str] = None) -> dict:
+        """
+        time_map: optional time_map(t_seconds, end=False) -> seconds, used when audio_np is a trimmed
+        view of a longer recording (asr.trim_silence). Prosody is measured on audio_np; reported word
+        times, durations and pauses are mapped back to the original recording.
+        speaker_id: optional user id; pitch tracking is narrowed to that speaker's F0 profile and the
+        profile is updated from this attempt's reliable words.
+        aligned_result["emissions"] (WhisperXAligner, keep_emissions=True) adds a per-letter "gop" to each
+        spoken word; without it "gop" is None.
+        """
 
         words = flatten_whisperx_words(aligned_result, asr_hypothesis)
         actual_tokens = [normalize_text(w["word"]) for w in words]
         expected_tokens = tokens_from_text(expected_text)
         mapping = simple_word_alignment(expected_tokens, actual_tokens)
 
-        actual_word_times = {i: {"word": words[i]["word"], "start": words[i]["start"], "end": words[i]["end"], "confidence": words[i]["confidence"]} for i in range(len(words))}
+        # words in original-recording time for everything reported (per_word times, wpm, pauses)
+        out_words = words
+        if time_map is not None and words:
+            out_words = [{**w, "start": time_map(w["start"]), "end": time_map(w["end"], end=True)} for w in words]
+
+        actual_word_times = {i: {"word": out_words[i]["word"], "start": out_words[i]["start"], "end": out_words[i]["end"], "confidence": out_words[i]["confidence"]} for i in range(len(out_words))}
 
         # ----- Prosody: compute utterance-level contours (F0 + energy) -----
-        y = _to_float_audio(audio_np)
-        frame_length = 2048
-        hop_length = 256
-
-        # constants (tuning knobs)
-        MIN_FRAMES = 1
-        MIN_VOICED_RATIO = 0.05
-        LOW_ENERGY_DB_FOR_VOICED = -50.0
-        MIN_F0 = 40.0
-        MAX_F0 = 600.0
-        MAX_F0_STD = 200.0
-        MAX_OUTLIER_PROP = 0.6
-        VERY_LOW_ENERGY_DB = -85.0
-
-        f0_raw, voiced_flag, voiced_probs, times = _safe_pyin(y, sr=audio_sr, frame_length=frame_length, hop_length=hop_length)
-        f0_raw = np.asarray(f0_raw, dtype=np.float32)
-        times = np.asarray(times, dtype=np.float32)
+        # one framing shared by pitch, energy and spectral features (every contour has ff.n_frames entries)
+        ff = FeatureFrames(_to_float_audio(audio_np), audio_sr, frame_length=2048, hop_length=256)
+
+        f0_raw, voiced_flag, voiced_probs, _ = self._track_pitch(ff, speaker_id)
+        f0_raw = _fit_frames(np.asarray(f0_raw, dtype=np.float32), ff.n_frames, np.nan)
+        voiced_flag = _fit_frames(np.asarray(voiced_flag, dtype=bool), ff.n_frames, False)
+        times = ff.times.astype(np.float32)
 
         # fill NaNs by linear interpolation (if possible)
         if f0_raw.size == 0:
@@ -235,124 +561,16 @@ class Scorer:
         # smoothing (light)
         f0_smoothed = _smooth_array(f0_filled, window=3) if f0_filled.size > 0 else f0_filled
 
-        # compute energy (RMS -> dB) and smooth lightly
-        try:
-            rms = librosa.feature.rms(y=y, frame_length=frame_length, hop_length=hop_length)[0]
-            if len(rms) != len(times):
-                minlen = min(len(rms), len(times))
-                rms = rms[:minlen]
-                f0_smoothed = f0_smoothed[:minlen]
-                times = times[:minlen]
-            energy_db = 20.0 * np.log10(rms + 1e-9)
-        except Exception:
-            energy_db = np.zeros(len(times), dtype=np.float32) - 120.0
+        # compute energy (RMS -> dB, on the pitch track's frames) and smooth lightly
+        energy_db = 20.0 * np.log10(ff.rms + 1e-9)
 
         energy_db_smoothed = _smooth_array(energy_db, window=3) if energy_db.size > 0 else energy_db
 
-        # per-word prosody computation (robust + reliability checks)
-        word_prosody = []
-        for w in words:
-            start = w.get("start", None)
-            end = w.get("end", None)
-            if start is None or end is None:
-                word_prosody.append({
-                    "f0_mean_hz": None,
-                    "f0_std_hz": None,
-                    "energy_db_mean": None,
-                    "voiced_ratio": None,
-                    "prosody_reliable": None,
-                    "stress_score": None,
-                    "_unreliable_reasons": []
-                })
-                continue
-
-            if times.size == 0:
-                # fallback global stats
-                f0_mean = float(np.nanmean(f0_smoothed)) if f0_smoothed.size > 0 else 0.0
-                f0_std = float(np.nanstd(f0_smoothed)) if f0_smoothed.size > 0 else 0.0
-                energy_mean = float(np.mean(energy_db_smoothed)) if energy_db_smoothed.size > 0 else -120.0
-                voiced_ratio = float(np.mean(voiced_flag)) if voiced_flag is not None else 0.0
-                frames_count = max(1, f0_smoothed.size)
-                f0_vals_voiced = f0_raw[np.isfinite(f0_raw)] if f0_raw.size > 0 else np.array([])
-            else:
-                s_idx = int(np.searchsorted(times, start, side='left'))
-                e_idx = int(np.searchsorted(times, end, side='right'))
-                if e_idx <= s_idx:
-                    s_idx = max(0, s_idx - 1)
-                    e_idx = min(len(times), s_idx + 1)
-                frames_count = max(1, e_idx - s_idx)
-                f0_slice_raw = f0_raw[s_idx:e_idx] if f0_raw.size > 0 else np.array([])
-                f0_slice_smoothed = f0_smoothed[s_idx:e_idx] if f0_smoothed.size > 0 else np.array([])
-                energy_slice = energy_db_smoothed[s_idx:e_idx] if energy_db_smoothed.size > 0 else np.array([])
-                # voiced ratio using raw un-interpolated detection (if available)
-                if f0_slice_raw.size > 0:
-                    voiced_ratio = float(np.sum(np.isfinite(f0_slice_raw)) / float(max(1, f0_slice_raw.size)))
-                else:
-                    voiced_ratio = 0.0
-
-                # voiced f0 values (raw)
-                f0_vals_voiced = f0_slice_raw[np.isfinite(f0_slice_raw)] if f0_slice_raw.size > 0 else np.array([])
-
-                # compute f0 stats:
-                if f0_vals_voiced.size > 0:
-                    f0_mean = float(np.mean(f0_vals_voiced))
-                    f0_std = float(np.std(f0_vals_voiced))
-                elif f0_slice_smoothed.size > 0:
-                    # no voiced raw frames: use smoothed interpolation as fallback
-                    f0_mean = float(np.mean(f0_slice_smoothed))
-                    f0_std = float(np.std(f0_slice_smoothed))
-                else:
-                    f0_mean = 0.0
-                    f0_std = 0.0
-
-                energy_mean = float(np.mean(energy_slice)) if energy_slice.size > 0 else float(np.mean(energy_db_smoothed) if energy_db_smoothed.size > 0 else -120.0)
-
-            # safe numeric defaults
-            if not np.isfinite(f0_mean):
-                f0_mean = 0.0
-            if not np.isfinite(f0_std):
-                f0_std = 0.0
-            if not np.isfinite(energy_mean):
-                energy_mean = -120.0
-            if not np.isfinite(voiced_ratio):
-                voiced_ratio = 0.0
-
-            # outlier proportion: voiced frames outside plausible bounds
-            outlier_prop = 0.0
-            if f0_vals_voiced.size > 0:
-                outlier_prop = float(np.sum((f0_vals_voiced < MIN_F0) | (f0_vals_voiced > MAX_F0)) / float(f0_vals_voiced.size))
-
-            # Decision rules: collect reasons for unreliability, mark False only if clear problem(s)
-            reasons = []
-            if frames_count < MIN_FRAMES:
-                reasons.append("few_frames")
-            # if little voicing and very low energy => unreliable
-            if voiced_ratio < MIN_VOICED_RATIO and energy_mean < LOW_ENERGY_DB_FOR_VOICED:
-                reasons.append("low_voicing_low_energy")
-            # extremes
-            if (f0_mean < (MIN_F0 - 10)) or (f0_mean > (MAX_F0 + 100)):
-                reasons.append("f0_out_of_range")
-            if f0_std > MAX_F0_STD:
-                reasons.append("high_f0_variability")
-            if outlier_prop > MAX_OUTLIER_PROP:
-                reasons.append("many_outliers")
-            if energy_mean < VERY_LOW_ENERGY_DB:
-                reasons.append("very_low_energy")
-
-            # prosody reliable only if no reasons
-            prosody_reliable = True if len(reasons) == 0 else False
-
-            # create stress score: energy normalized within utterance (nudge small zeros)
-            # We'll fill stress later; put placeholder for now
-            word_prosody.append({
-                "f0_mean_hz": round(f0_mean, 1),
-                "f0_std_hz": round(f0_std, 1),
-                "energy_db_mean": round(energy_mean, 3),
-                "voiced_ratio": round(voiced_ratio, 3),
-                "prosody_reliable": prosody_reliable,
-                "stress_score": None,
-                "_unreliable_reasons": reasons
-            })
+        # per-word prosody computation (robust + reliability checks), vectorized over words
+        word_prosody = _word_prosody(words, times, f0_raw, f0_smoothed, energy_db_smoothed, voiced_flag)
+        if speaker_id is not None:
+            self.speakers.update(speaker_id, [wp["f0_mean_hz"] for wp in word_prosody if wp["prosody_reliable"]],
+                                 voiced_ratio=_voiced_ratio(voiced_flag))
 
         # compute stress normalization across words (energy-based)
         energy_vals = [wp["energy_db_mean"] for wp in word_prosody if wp["energy_db_mean"] is not None]
@@ -377,91 +595,26 @@ class Scorer:
                 wp["stress_score"] = round(stress_norm, 3)
 
         # ---------- Now original scoring pipeline (word-level acoustic + DTW) ----------
+        emissions = CTCEmissions.coerce(aligned_result.get("emissions"))
         per_word = []
         for entry in mapping:
-            rec = {
-                "op": entry["op"],
-                "expected_idx": entry["expected_idx"],
-                "expected": entry["expected"],
-                "actual_idx": entry["actual_idx"],
-                "actual": entry["actual"],
-                "word_confidence": None,
-                "start": None,
-                "end": None,
-                "word_score": None,
-                "phonemes": None,
-                "acoustic_score": None,
-                "notes": []
-            }
-            if entry["actual_idx"] is not None:
-                ai = entry["actual_idx"]
-                info = actual_word_times.get(ai)
-                if info:
-                    rec["start"] = float(info["start"])
-                    rec["end"] = float(info["end"])
-                    rec["word_confidence"] = float(info["confidence"]) if info.get("confidence") is not None else None
-                    rec["actual"] = info["word"]
-
-            if entry["op"] == "equal":
-                rec["word_score"] = 1.0
-            elif entry["op"] in ("insert", "delete"):
-                rec["word_score"] = 0.0
-            else:  # replace
-                rec["word_score"] = rec["word_confidence"] if rec["word_confidence"] is not None else 0.4
-
-            if rec["expected"] and pronouncing is not None:
-                phones = pronouncing.phones_for_word(rec["expected"])
-                rec["phonemes"] = phones[0] if phones else None
-
-            # Acoustic check: disabled for speed
-            if rec["start"] is not None and rec["end"] is not None and self.azure_tts is not None:
-                # Acoustic scoring skipped for speed: TTS reference synthesis is too slow.
-                # Instead, rely on ASR confidence + prosody for per-word scoring.
-                rec["acoustic_score"] = None
-                # word_score stays as set by alignment/ASR confidence.
-            
-            # attach prosody for this actual word if computed
-            if entry["actual_idx"] is not None:
-                ai = entry["actual_idx"]
-                if ai < len(word_prosody):
-                    rec_pros = word_prosody[ai]
-                    rec["prosody"] = {
-                        "f0_mean_hz": rec_pros["f0_mean_hz"],
-                        "f0_std_hz": rec_pros["f0_std_hz"],
-                        "energy_db_mean": rec_pros["energy_db_mean"],
-                        "voiced_ratio": rec_pros["voiced_ratio"],
-                        "stress_score": rec_pros["stress_score"],
-                        "prosody_reliable": rec_pros["prosody_reliable"]
-                    }
-                    # if unreliable, append reason to notes (keeps API shape)
-                    if rec_pros.get("_unreliable_reasons"):
-                        rec["notes"].append("prosody_unreliable:" + ",".join(rec_pros["_unreliable_reasons"]))
-                else:
-                    rec["prosody"] = {
-                        "f0_mean_hz": None,
-                        "f0_std_hz": None,
-                        "energy_db_mean": None,
-                        "voiced_ratio": None,
-                        "stress_score": None,
-                        "prosody_reliable": None
-                    }
-            else:
-                rec["prosody"] = {
-                    "f0_mean_hz": None,
-                    "f0_std_hz": None,
-                    "energy_db_mean": None,
-                    "voiced_ratio": None,
-                    "stress_score": None,
-                    "prosody_reliable": None
-                }
-
-            per_word.append(rec)
+            ai = entry["actual_idx"]
+            word_mfcc, gop = None, None
+            if ai is not None:
+                a, b = ff.frame_range(words[ai]["start"], words[ai]["end"])
+                word_mfcc = lambda a=a, b=b: ff.mfcc(N_MFCC)[:, a:b]
+                # expected word's letters against the alignment's own posteriors over the spoken word
+                if emissions is not None and entry["expected"]:
+                    gop = word_gop(emissions, entry["expected"], words[ai]["start"], words[ai]["end"])
+            per_word.append(self.word_record(entry, actual_word_times.get(ai) if ai is not None else None,
+                                             word_prosody[ai] if ai is not None and ai < len(word_prosody) else None,
+                                             word_mfcc, gop))
 
         total_expected = len(expected_tokens)
         correct = sum(1 for r in per_word if r["op"] == "equal")
         word_acc = float(correct) / total_expected if total_expected > 0 else 0.0
 
-        flat_words = words
+        flat_words = out_words
         if flat_words:
             utt_start = flat_words[0]["start"]
             utt_end = flat_words[-1]["end"]
@@ -519,3 +672,123 @@ class Scorer:
             out["_debug_segments_preview"] = aligned_result.get("segments", [])[:4]
             out["_debug_prosody_words"] = word_prosody[:8]
         return out
+
+    def word_record(self, entry: Dict, info: Optional[Dict], prosody: Optional[Dict],
+                    word_mfcc: Optional[Callable[[], np.ndarray]] = None, gop: Optional[Dict] = None) -> Dict:
+        """
+        One per_word record from an alignment entry (simple_word_alignment), the actual word's reported
+        times / confidence (None for deletes), its _word_prosody stats, a callable returning its MFCC
+        slice for the acoustic check (only called when the expected word has reference templates) and
+        its gop.word_gop result.
+        """
+        rec = {
+            "op": entry["op"],
+            "expected_idx": entry["expected_idx"],
+            "expected": entry["expected"],
+            "actual_idx": entry["actual_idx"],
+            "actual": entry["actual"],
+            "word_confidence": None,
+            "start": None,
+            "end": None,
+            "word_score": None,
+            "phonemes": None,
+            "acoustic_score": None,
+            "gop": gop,
+            "notes": []
+        }
+        if info:
+            rec["start"] = float(info["start"])
+            rec["end"] = float(info["end"])
+            rec["word_confidence"] = float(info["confidence"]) if info.get("confidence") is not None else None
+            rec["actual"] = info["word"]
+
+        if entry["op"] == "equal":
+            rec["word_score"] = 1.0
+        elif entry["op"] in ("insert", "delete"):
+            rec["word_score"] = 0.0
+        else:  # replace
+            rec["word_score"] = rec["word_confidence"] if rec["word_confidence"] is not None else 0.4
+
+        if rec["expected"]:
+            rec["phonemes"], guessed = self.phonemes.pronounce(rec["expected"])
+            if guessed:
+                rec["notes"].append("phonemes_guessed")
+
+        # Acoustic check: the word's slice of the utterance MFCC vs its prebuilt reference templates
+        # (no TTS on this path); word_score stays as set by alignment/ASR confidence.
+        if self.templates is not None and word_mfcc is not None and rec["expected"] in self.templates:
+            score = self.templates.acoustic_score(rec["expected"], word_mfcc())
+            rec["acoustic_score"] = round(score, 3) if score is not None else None
+
+        if gop is not None:
+            weak = [g["char"] for g in gop["graphemes"] if g["gop"] < GOP_WEAK]
+            if weak:
+                rec["notes"].append("gop_weak:" + ",".join(weak))
+
+        # attach prosody for this actual word if computed
+        if prosody is not None:
+            rec["prosody"] = {
+                "f0_mean_hz": prosody["f0_mean_hz"],
+                "f0_std_hz": prosody["f0_std_hz"],
+                "energy_db_mean": prosody["energy_db_mean"],
+                "voiced_ratio": prosody["voiced_ratio"],
+                "stress_score": prosody["stress_score"],
+                "prosody_reliable": prosody["prosody_reliable"]
+            }
+            # if unreliable, append reason to notes (keeps API shape)
+            if prosody.get("_unreliable_reasons"):
+                rec["notes"].append("prosody_unreliable:" + ",".join(prosody["_unreliable_reasons"]))
+        else:
+            rec["prosody"] = {
+                "f0_mean_hz": None,
+                "f0_std_hz": None,
+                "energy_db_mean": None,
+                "voiced_ratio": None,
+                "stress_score": None,
+                "prosody_reliable": None
+            }
+        return rec
+
+    def stream(self, expected_text: str, audio_sr: int = 16000, speaker_id: Optional[str] = None,
+               time_map: Optional[Callable] = None, **kwargs):
+        """
+        Incremental scoring of one long attempt (scoring/streaming.py): feed audio chunks and aligned words
+        as they arrive, get per_word records as each word's window closes, finish() for the summary.
+        """
+        from .streaming import StreamingScorer
+        return StreamingScorer(self, expected_text, audio_sr, speaker_id=speaker_id, time_map=time_map, **kwargs)
+
+    # ----- parallel scoring -----
+
+    def start_pool(self, workers: Optional[int] = None,
+                   attempt_timeout_s: Optional[float] = ATTEMPT_TIMEOUT_S) -> ScorerPool:
+        """Persistent worker processes with this scorer's config (reused by score_batch until close())."""
+        if self.pool is None or (workers is not None and workers != self.pool.size):
+            self.close()
+            # build a missing phoneme index here, once, rather than in every worker on its first attempt
+            self.phonemes.load()
+            self.pool = ScorerPool(workers, self.cfg, self.sample_rate, attempt_timeout_s)
+        return self.pool
+
+    def score_batch(self, items: List[Dict[str, Any]], workers: Optional[int] = None) -> List[Any]:
+        """
+        Score many attempts in parallel. items are score_utterance keyword arguments
+        ({"expected_text", "aligned_result", "audio_np", "audio_sr", optional "asr_hypothesis", "time_map",
+        "speaker_id"}). Results come back in input order; an attempt that fails holds its exception instead of
+        a dict. workers=0 scores in this process, one after another; otherwise the persistent pool is used
+        (started on first call, default size half the cores).
+        """
+        if workers == 0:
+            out = []
+            for item in items:
+                try:
+                    out.append(self.score_utterance(**item))
+                except Exception as e:
+                    out.append(e)
+            return out
+        return self.start_pool(workers).score_batch(items)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+            self.pool = None
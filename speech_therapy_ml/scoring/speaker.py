@@ -0,0 +1,150 @@
+"""
+speech_therapy_ml/scoring/speaker.py
+
+SpeakerProfileStore:
+  - Per-speaker F0 profile: recent F0 means of words the scorer marked prosody-reliable, plus a
+    running voiced-frame ratio of the speaker's attempts
+  - .pitch_range(speaker_id) -> (fmin_hz, fmax_hz) around the profile's robust percentiles, so pitch
+    tracking searches a narrow band instead of C2-C6 (fewer pyin candidates, fewer octave errors)
+  - .collapsed(speaker_id, voiced_ratio) -> True when a narrowed track lost most of its voicing
+    (the caller re-tracks with the full range)
+  - Bounded in-memory LRU keyed by user id, optional SQLite file tier that survives restarts
+
+Usage:
+  store = SpeakerProfileStore(capacity=1024, disk_path="models/speakers.sqlite3")
+  rng = store.pitch_range("user-42")        # None until the profile has enough words
+  store.update("user-42", [182.0, 176.5, 190.2], voiced_ratio=0.61)
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .pitch import FMAX_HZ, FMIN_HZ
+
+
+@dataclass
+class ProfileConfig:
+    min_words: int = 8               # reliable words before a profile narrows the search range
+    history: int = 200               # most recent word F0 means kept per speaker
+    low_pct: float = 10.0            # robust range of the speaker's word F0 means ...
+    high_pct: float = 90.0
+    margin_octaves: float = 0.6      # ... widened by this much on both sides (frames swing more than word means)
+    min_span_octaves: float = 1.5    # never search a narrower band than this
+    collapse_ratio: float = 0.5      # narrowed voiced ratio below this fraction of the usual one -> full range
+    voiced_ema: float = 0.2          # weight of the newest attempt in the running voiced ratio
+
+
+@dataclass
+class SpeakerF0Profile:
+    f0_words: List[float] = field(default_factory=list)  # reliable word F0 means (Hz), oldest first
+    voiced_ratio: Optional[float] = None                 # running voiced-frame ratio of attempts
+    attempts: int = 0
+
+    def percentiles(self, *pcts: float) -> List[float]:
+        return [float(v) for v in np.percentile(np.asarray(self.f0_words, dtype=np.float64), pcts)]
+
+
+class SpeakerProfileStore:
+    def __init__(self, capacity: int = 1024, disk_path: Optional[str] = None, cfg: ProfileConfig = ProfileConfig()):
+        self.capacity = max(1, capacity)
+        self.cfg = cfg
+        self._mem: "OrderedDict[str, SpeakerF0Profile]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if disk_path:
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS speakers (speaker_id TEXT PRIMARY KEY, profile TEXT)")
+            self._db.commit()
+        self._counters = {"narrowed": 0, "full_range": 0, "fallbacks": 0, "updates": 0}
+
+    # ----- lookup -----
+
+    def _load(self, speaker_id: str) -> Optional[SpeakerF0Profile]:
+        """Caller holds the lock."""
+        profile = self._mem.get(speaker_id)
+        if profile is not None:
+            self._mem.move_to_end(speaker_id)
+            return profile
+        if self._db is not None:
+            row = self._db.execute("SELECT profile FROM speakers WHERE speaker_id = ?", (speaker_id,)).fetchone()
+            if row is not None:
+                profile = SpeakerF0Profile(**json.loads(row[0]))
+                self._remember(speaker_id, profile)
+                return profile
+        return None
+
+    def _remember(self, speaker_id: str, profile: SpeakerF0Profile):
+        self._mem[speaker_id] = profile
+        self._mem.move_to_end(speaker_id)
+        while len(self._mem) > self.capacity:
+            self._mem.popitem(last=False)
+
+    def get(self, speaker_id: str) -> Optional[SpeakerF0Profile]:
+        with self._lock:
+            profile = self._load(speaker_id)
+            return SpeakerF0Profile(list(profile.f0_words), profile.voiced_ratio, profile.attempts) if profile else None
+
+    # ----- pitch range -----
+
+    def pitch_range(self, speaker_id: Optional[str]) -> Optional[Tuple[float, float]]:
+        """(fmin_hz, fmax_hz) for this speaker, or None (unknown speaker / too few words yet) for the full range."""
+        profile = self.get(speaker_id) if speaker_id is not None else None
+        if profile is None or len(profile.f0_words) < self.cfg.min_words:
+            with self._lock:
+                self._counters["full_range"] += 1
+            return None
+        lo, hi = profile.percentiles(self.cfg.low_pct, self.cfg.high_pct)
+        fmin = lo * 2.0 ** -self.cfg.margin_octaves
+        fmax = hi * 2.0 ** self.cfg.margin_octaves
+        short = self.cfg.min_span_octaves - np.log2(fmax / fmin)
+        if short > 0:  # widen symmetrically (in octaves) up to the minimum span
+            fmin, fmax = fmin * 2.0 ** (-short / 2), fmax * 2.0 ** (short / 2)
+        fmin, fmax = max(FMIN_HZ, float(fmin)), min(FMAX_HZ, float(fmax))
+        with self._lock:
+            self._counters["narrowed"] += 1
+        return fmin, fmax
+
+    def collapsed(self, speaker_id: str, voiced_ratio: float) -> bool:
+        """True if a narrowed track voiced far fewer frames than this speaker usually does."""
+        profile = self.get(speaker_id)
+        usual = profile.voiced_ratio if profile is not None else None
+        if usual is None or voiced_ratio >= self.cfg.collapse_ratio * usual:
+            return False
+        with self._lock:
+            self._counters["fallbacks"] += 1
+        return True
+
+    # ----- update -----
+
+    def update(self, speaker_id: str, word_f0s: Iterable[float], voiced_ratio: Optional[float] = None):
+        """Add one attempt: F0 means of its reliable words and its voiced-frame ratio."""
+        values = [float(f) for f in word_f0s if f is not None and FMIN_HZ <= float(f) <= FMAX_HZ]
+        with self._lock:
+            profile = self._load(speaker_id) or SpeakerF0Profile()
+            profile.f0_words = (profile.f0_words + values)[-self.cfg.history:]
+            if voiced_ratio is not None:
+                a = self.cfg.voiced_ema
+                profile.voiced_ratio = voiced_ratio if profile.voiced_ratio is None else (1 - a) * profile.voiced_ratio + a * voiced_ratio
+            profile.attempts += 1
+            self._remember(speaker_id, profile)
+            self._counters["updates"] += 1
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO speakers (speaker_id, profile) VALUES (?, ?)",
+                                 (speaker_id, json.dumps(asdict(profile))))
+                self._db.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            out = dict(self._counters)
+            out["profiles"] = len(self._mem)
+            out["capacity"] = self.capacity
+            out["disk"] = self._db is not None
+        return out
@@ -0,0 +1,450 @@
+"""
+speech_therapy_ml/scoring/streaming.py
+
+StreamingScorer:
+  - Scores a long reading (story pages) while it is being read: audio chunks and aligned words are fed
+    as they arrive, and each per_word record is returned as soon as its word's audio window has closed
+  - Running contours: pitch, voicing, RMS energy (and MFCC when a template bank is loaded) are tracked
+    block by block on the scorer's frame grid (frame 2048 / hop 256, center=True); frames no pending
+    word can reach any more are dropped, so memory stays bounded however long the passage is
+  - Incremental expected-vs-actual alignment: an actual word settles against the expected text as soon
+    as a match anchors it (bounded lookahead), into the same equal / replace / delete / insert entries,
+    in the same order, as simple_word_alignment
+  - .summary() / .finish(): the score_utterance summary from running accumulators (counts, first / last
+    word times, Welford means and stds), with no second pass over words or frames
+
+Differences from Scorer.score_utterance (close, not identical):
+  - the pitch tracker runs per block: pyin's HMM, the yin / nccf loudness gate and nccf's octave centre
+    see one block instead of the whole utterance
+  - stress_score normalizes against the energy range of the words emitted so far
+  - a word without voiced frames falls back to the last voiced F0 instead of interpolating to the next one
+  - empty word texts become "<unk>" (there is no full ASR hypothesis to fill them in from)
+  - "gop" is only filled when feed() is given the emissions of the aligned segment its words came from
+
+Usage:
+  stream = scorer.stream("Once upon a time there was a fox", audio_sr=16000, speaker_id="user-42")
+  for chunk, words in source:               # audio chunks; words of newly aligned segments
+      for rec in stream.feed(chunk, words):
+          send(rec)
+  result = stream.finish()                  # score_utterance shape: per_word (all records) + summary
+"""
+
+from __future__ import annotations
+
+import math
+from collections import deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .features import FeatureFrames
+from .gop import CTCEmissions, word_gop
+from .scorer import (_fit_frames, _to_float_audio, _word_prosody, flat_word, normalize_text, simple_word_alignment,
+                     tokens_from_text)
+from .templates import N_MFCC
+
+FRAME_LENGTH = 2048
+HOP_LENGTH = 256
+CONTEXT_FRAMES = -(-(FRAME_LENGTH // 2) // HOP_LENGTH)  # frames of left context a block needs for real (not zero) padding
+COLLAPSE_CHECK_S = 1.0  # audio tracked in a speaker's profile range before checking that voicing did not collapse
+
+
+class _IncrementalAlignment:
+    """
+    simple_word_alignment one actual token at a time. Tokens that do not match the next expected word
+    wait in `pending` until a match anchors them: a match at most one word past the gap settles at once,
+    a longer jump (a skipped line) only once the following token matches too, and of those the one with
+    the fewest gap words wins. Everything up to an anchor is settled with simple_word_alignment itself,
+    so within that bounded stretch the entries are exactly the batch ones.
+    """
+
+    def __init__(self, expected: List[str], lookahead: int = 8, max_pending: int = 4):
+        self.expected = expected
+        self.lookahead = lookahead
+        self.max_pending = max_pending
+        self.ei = 0
+        self.pending: List[Tuple[int, str]] = []
+
+    def _gap(self, j: int, p: int) -> List[Dict]:
+        """simple_word_alignment of expected[ei:j] against pending[:p], in utterance indices; consumes both."""
+        out = simple_word_alignment(self.expected[self.ei:j], [tok for _, tok in self.pending[:p]])
+        for e in out:
+            if e["expected_idx"] is not None:
+                e["expected_idx"] += self.ei
+            if e["actual_idx"] is not None:
+                e["actual_idx"] = self.pending[e["actual_idx"]][0]
+        self.ei = j
+        self.pending = self.pending[p:]
+        return out
+
+    def _anchor(self, final: bool) -> Optional[Tuple[int, int]]:
+        """(pending position, expected index) of the settleable match with the smallest gap before it."""
+        stop = min(len(self.expected), self.ei + self.lookahead + len(self.pending))
+        best, best_gap = None, None
+        for p, (_, tok) in enumerate(self.pending):
+            for j in range(self.ei, stop):
+                gap = p + j - self.ei
+                if self.expected[j] != tok or (best_gap is not None and gap >= best_gap):
+                    continue
+                if (final or j - self.ei <= p + 1
+                        or (p + 1 < len(self.pending) and j + 1 < len(self.expected)
+                            and self.pending[p + 1][1] == self.expected[j + 1])):
+                    best, best_gap = (p, j), gap
+        return best
+
+    def _settle(self, final: bool) -> List[Dict]:
+        out = []
+        while self.pending:
+            hit = self._anchor(final)
+            if hit is None:
+                break
+            p, j = hit
+            out += self._gap(j + 1, p + 1)  # the anchor itself comes out as the gap's trailing "equal"
+        if final or self.ei >= len(self.expected):
+            out += self._gap(len(self.expected), len(self.pending))
+        elif len(self.pending) > self.max_pending:
+            out += self._gap(self.ei + 1, 1)  # give up waiting: the oldest token replaces the next expected word
+        return out
+
+    def push(self, actual_idx: int, token: str) -> List[Dict]:
+        """Add the next actual token; returns the entries that settled."""
+        self.pending.append((actual_idx, token))
+        return self._settle(final=False)
+
+    def flush(self) -> List[Dict]:
+        """No more tokens: settle everything (remaining expected words are deletes)."""
+        return self._settle(final=True)
+
+
+class _Running:
+    """Count, mean and population std of a stream of values (Welford)."""
+    __slots__ = ("n", "mean", "_m2")
+
+    def __init__(self):
+        self.n, self.mean, self._m2 = 0, 0.0, 0.0
+
+    def add(self, x: float):
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self._m2 += d * (x - self.mean)
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self._m2 / self.n) if self.n else 0.0
+
+
+class StreamingScorer:
+    def __init__(self, scorer, expected_text: str, audio_sr: int = 16000, speaker_id: Optional[str] = None,
+                 time_map: Optional[Callable] = None, block_s: float = 0.25, lookahead: int = 8,
+                 max_pending: int = 4, max_word_lag_s: float = 30.0):
+        """
+        scorer: the Scorer whose pitch backend, speaker profiles, phoneme index and templates are used.
+        block_s: audio tracked per pitch / feature block (a block also closes early when the next word's
+        window is complete). max_word_lag_s: how far behind the audio aligned words may arrive and still
+        find their frames.
+        """
+        self.scorer = scorer
+        self.expected_text = expected_text
+        self.sr = audio_sr
+        self.speaker_id = speaker_id
+        self.time_map = time_map
+        self.block_frames = max(1, int(round(block_s * audio_sr / HOP_LENGTH)))
+        self.max_lag_frames = int(max_word_lag_s * audio_sr / HOP_LENGTH)
+        self.per_word: List[Dict] = []
+        self._align = _IncrementalAlignment(tokens_from_text(expected_text), lookahead, max_pending)
+        self._queue: Deque[Dict] = deque()   # settled entries waiting for their word's window, in order
+        self._words: Dict[int, Tuple[Dict, Dict, int, int]] = {}  # actual_idx -> (word, reported word, s, e)
+        self._emissions: Dict[int, CTCEmissions] = {}              # actual_idx -> its segment's CTC emissions
+        self._finished = False
+
+        # pitch search range: the speaker's profile when there is one (full range once voicing collapses)
+        self._range = scorer.speakers.pitch_range(speaker_id) if speaker_id is not None else None
+        self._range_checked = self._range is None
+
+        # audio from the left context of the next block on; running contours for frames [_frame_base, _n_frames)
+        self._audio = np.zeros(0, dtype=np.float32)
+        self._audio_base = 0
+        self._n_samples = 0
+        self._frame_base = 0
+        self._n_frames = 0
+        self._f0 = np.zeros(0, dtype=np.float32)
+        self._voiced = np.zeros(0, dtype=bool)
+        self._energy_db = np.zeros(0, dtype=np.float32)
+        self._mfcc = np.zeros((N_MFCC, 0), dtype=np.float32) if scorer.templates is not None else None
+        self._hold: Optional[Tuple[int, float]] = None  # last voiced (frame, F0) before _frame_base
+        self._n_voiced = 0
+
+        # summary accumulators
+        self._n_actual = 0
+        self._actual_words: List[str] = []
+        self._first_start: Optional[float] = None
+        self._last_end: Optional[float] = None
+        self._last_s = 0
+        self._pauses = _Running()
+        self._correct = 0
+        self._f0_all, self._f0_rel = _Running(), _Running()
+        self._energy_all, self._energy_rel = _Running(), _Running()
+        self._energy_min = self._energy_max = None
+        self._n_prosody = 0
+        self._n_reliable = 0
+        self._reliable_f0s: List[float] = []
+
+    # ----- input -----
+
+    def feed(self, audio: Optional[np.ndarray] = None, words: Optional[Iterable[Dict]] = None,
+             emissions=None) -> List[Dict]:
+        """
+        audio: the next chunk of the recording (float or int16, mono, audio_sr). words: newly aligned word
+        dicts (whisperx / whisper keys, times in seconds from the start of the recording), in order.
+        emissions: the aligned result's "emissions" those words came with (optional; enables "gop").
+        Returns the per_word records finalized by this call.
+        """
+        assert not self._finished, "StreamingScorer.feed after finish()"
+        if audio is not None:
+            chunk = _to_float_audio(audio)
+            self._audio = np.concatenate((self._audio, chunk)) if self._audio.size else chunk.copy()
+            self._n_samples += len(chunk)
+        emissions = CTCEmissions.coerce(emissions)
+        for w in words or ():
+            if emissions is not None:
+                self._emissions[self._n_actual] = emissions
+            self._add_word(flat_word(w))
+        return self._advance()
+
+    def finish(self) -> Dict:
+        """End of the attempt: finalize every remaining word, update the speaker profile, return the full result."""
+        if not self._finished:
+            self._finished = True
+            self._queue.extend(self._align.flush())
+            self._advance()
+            if self.speaker_id is not None:
+                self.scorer.speakers.update(self.speaker_id, self._reliable_f0s,
+                                            voiced_ratio=self._n_voiced / max(1, self._n_frames))
+        return {
+            "expected_text": self.expected_text,
+            "actual_text": " ".join(self._actual_words).strip(),
+            "per_word": self.per_word,
+            "summary": self.summary(),
+        }
+
+    def _add_word(self, w: Dict):
+        if not w["word"]:
+            w["word"] = "<unk>"
+        out_w = w
+        if self.time_map is not None:
+            out_w = {**w, "start": self.time_map(w["start"]), "end": self.time_map(w["end"], end=True)}
+        if self._last_end is None:
+            self._first_start = out_w["start"]
+        else:
+            self._pauses.add(max(0.0, out_w["start"] - self._last_end))
+        self._last_end = out_w["end"]
+        self._actual_words.append(out_w["word"])
+
+        ai = self._n_actual
+        self._n_actual += 1
+        s, e = self._word_frames(w["start"], w["end"])
+        self._words[ai] = (w, out_w, s, e)
+        self._last_s = s
+        self._queue.extend(self._align.push(ai, normalize_text(w["word"])))
+
+    def _word_frames(self, start: float, end: float) -> Tuple[int, int]:
+        """[s, e) frames of a word on the utterance grid, as _word_prosody / FeatureFrames.frame_range pick them."""
+        k0 = max(0, int(start * self.sr / HOP_LENGTH) - 2)
+        k1 = max(k0 + 1, int(end * self.sr / HOP_LENGTH) + 3)
+        times = ((np.arange(k0, k1) * HOP_LENGTH) / float(self.sr)).astype(np.float32)
+        s = k0 + int(np.searchsorted(times, start, side="left"))
+        e = k0 + int(np.searchsorted(times, end, side="right"))
+        if e <= s:
+            s = max(0, s - 1)
+            e = s + 1
+        return s, e
+
+    # ----- contours -----
+
+    def _ready_frames(self) -> int:
+        """Frames whose whole window has arrived (every frame, zero-padded at the end, once finished)."""
+        if self._finished:
+            return 1 + self._n_samples // HOP_LENGTH if self._n_samples else 0
+        pad = FRAME_LENGTH // 2
+        return (self._n_samples - pad) // HOP_LENGTH + 1 if self._n_samples >= pad else 0
+
+    def _closes(self, entry: Dict, n_frames: int) -> bool:
+        """A word's window is closed once the frame after it (energy smoothing's right neighbour) is tracked."""
+        ai = entry["actual_idx"]
+        return ai is None or self._finished or self._words[ai][3] + 1 <= n_frames
+
+    def _pitch(self, ff: FeatureFrames):
+        grid = dict(frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH, features=ff)
+        if self._range is not None:
+            return self.scorer.pitch.track(ff.y, ff.sr, fmin_hz=self._range[0], fmax_hz=self._range[1], **grid)
+        return self.scorer.pitch.track(ff.y, ff.sr, **grid)
+
+    def _track(self):
+        ready = self._ready_frames()
+        k = ready - self._n_frames
+        if k <= 0:
+            return
+        if not self._finished and k < self.block_frames and not (self._queue and self._closes(self._queue[0], ready)):
+            return
+        c = min(self._n_frames, CONTEXT_FRAMES)
+        seg_start = (self._n_frames - c) * HOP_LENGTH
+        ff = FeatureFrames(self._audio[seg_start - self._audio_base:], self.sr, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH)
+        f0, voiced, _, _ = self._pitch(ff)
+        block = slice(c, c + k)
+        f0 = _fit_frames(np.asarray(f0, dtype=np.float32), ff.n_frames, np.nan)[block]
+        voiced = _fit_frames(np.asarray(voiced, dtype=bool), ff.n_frames, False)[block]
+
+        self._f0 = np.concatenate((self._f0, f0))
+        self._voiced = np.concatenate((self._voiced, voiced))
+        self._energy_db = np.concatenate((self._energy_db, 20.0 * np.log10(ff.rms[block] + 1e-9)))
+        if self._mfcc is not None:
+            self._mfcc = np.concatenate((self._mfcc, ff.mfcc(N_MFCC)[:, block]), axis=1)
+        self._n_frames = ready
+        self._n_voiced += int(np.count_nonzero(voiced))
+
+        # the audio the next block needs starts CONTEXT_FRAMES frames back
+        keep = max(0, (self._n_frames - CONTEXT_FRAMES) * HOP_LENGTH)
+        if keep > self._audio_base:
+            self._audio = self._audio[keep - self._audio_base:]
+            self._audio_base = keep
+
+        if not self._range_checked and self._n_frames * HOP_LENGTH >= COLLAPSE_CHECK_S * self.sr:
+            self._range_checked = True
+            if self.scorer.speakers.collapsed(self.speaker_id, self._n_voiced / self._n_frames):
+                self._range = None  # narrowed range lost the voicing: full range from the next block on
+
+    def _trim(self):
+        """Drop contour frames that no pending or future word can reach."""
+        starts = [s for _, _, s, _ in self._words.values()]
+        keep = min(starts + [self._last_s, self._n_frames]) - 2
+        keep = max(keep, self._n_frames - self.max_lag_frames)
+        drop = keep - self._frame_base
+        if drop <= 0:
+            return
+        last = np.flatnonzero(self._voiced[:drop])
+        if last.size:
+            self._hold = (self._frame_base + int(last[-1]), float(self._f0[last[-1]]))
+        self._f0, self._voiced, self._energy_db = self._f0[drop:], self._voiced[drop:], self._energy_db[drop:]
+        if self._mfcc is not None:
+            self._mfcc = self._mfcc[:, drop:]
+        self._frame_base = keep
+
+    def _window(self, track: np.ndarray, lo: int, hi: int, fill: float) -> np.ndarray:
+        """track[lo - 1:hi + 1] on the utterance grid; `fill` outside the tracked frames."""
+        out = np.full(hi - lo + 2, fill, dtype=track.dtype)
+        a, b = max(lo - 1, self._frame_base), min(hi + 1, self._n_frames)
+        out[a - (lo - 1):b - (lo - 1)] = track[a - self._frame_base:b - self._frame_base]
+        return out
+
+    def _filled_f0(self, lo: int, hi: int) -> np.ndarray:
+        """F0 over frames [lo - 1, hi + 1) with unvoiced frames interpolated (held after the last voiced one)."""
+        raw = self._window(self._f0, lo, hi, np.nan)
+        x = np.arange(lo - 1, hi + 1)
+        valid = np.isfinite(raw)
+        before = np.flatnonzero(self._voiced[:max(0, lo - 1 - self._frame_base)])
+        hold = (self._frame_base + int(before[-1]), float(self._f0[before[-1]])) if before.size else self._hold
+        xp, fp = x[valid], raw[valid]
+        if hold is not None:
+            xp, fp = np.concatenate(([hold[0]], xp)), np.concatenate(([hold[1]], fp))
+        if xp.size == 0:
+            return np.zeros_like(raw)
+        return np.interp(x, xp, fp).astype(np.float32)
+
+    # ----- output -----
+
+    def _advance(self) -> List[Dict]:
+        self._track()
+        out = []
+        while self._queue and self._closes(self._queue[0], self._n_frames):
+            out.append(self._emit(self._queue.popleft()))
+        self._trim()
+        return out
+
+    def _prosody(self, w: Dict, s: int, e: int) -> Optional[Dict]:
+        lo = max(self._frame_base, s - 1, 0)
+        if e <= lo:
+            return None  # no audio, or its frames were dropped (word arrived more than max_word_lag_s late)
+        kernel = np.ones(3, dtype=np.float32) / 3.0  # _smooth_array's window, on real neighbours
+        energy_sm = np.convolve(self._window(self._energy_db, lo, e, 0.0), kernel, mode="valid")
+        f0_sm = np.convolve(self._filled_f0(lo, e), kernel, mode="valid")
+        b = self._frame_base
+        times = ((np.arange(lo, e) * HOP_LENGTH) / float(self.sr)).astype(np.float32)
+        wp = _word_prosody([w], times, self._f0[lo - b:e - b], f0_sm, energy_sm, self._voiced[lo - b:e - b])[0]
+
+        # stress against the energy range of the words so far (score_utterance: of the whole utterance)
+        em = wp["energy_db_mean"]
+        self._energy_min = em if self._energy_min is None else min(self._energy_min, em)
+        self._energy_max = em if self._energy_max is None else max(self._energy_max, em)
+        energy_range = self._energy_max - self._energy_min if (self._energy_max - self._energy_min) > 1e-6 else 1.0
+        stress_norm = float(max(0.0, min(1.0, (em - self._energy_min) / energy_range)))
+        wp["stress_score"] = round(stress_norm if stress_norm != 0.0 else 0.02, 3)
+        return wp
+
+    def _emit(self, entry: Dict) -> Dict:
+        ai = entry["actual_idx"]
+        if ai is None:
+            rec = self.scorer.word_record(entry, None, None)
+        else:
+            w, out_w, s, e = self._words.pop(ai)
+            if s >= self._n_frames:  # word past the end of the audio: its last frame, as searchsorted clips
+                s = max(0, self._n_frames - 1)
+            e = min(e, self._n_frames)
+            wp = self._prosody(w, s, e)
+            word_mfcc = None
+            if self._mfcc is not None and e > max(s, self._frame_base):
+                word_mfcc = lambda: self._mfcc[:, max(s, self._frame_base) - self._frame_base:e - self._frame_base]
+            emissions = self._emissions.pop(ai, None)
+            gop = word_gop(emissions, entry["expected"], w["start"], w["end"]) \
+                if emissions is not None and entry["expected"] else None
+            rec = self.scorer.word_record(entry, out_w, wp, word_mfcc, gop)
+            if wp is not None:
+                self._n_prosody += 1
+                self._f0_all.add(wp["f0_mean_hz"])
+                self._energy_all.add(wp["energy_db_mean"])
+                if wp["prosody_reliable"]:
+                    self._n_reliable += 1
+                    self._f0_rel.add(wp["f0_mean_hz"])
+                    self._energy_rel.add(wp["energy_db_mean"])
+                    self._reliable_f0s.append(wp["f0_mean_hz"])
+        if entry["op"] == "equal":
+            self._correct += 1
+        self.per_word.append(rec)
+        return rec
+
+    def summary(self) -> Dict:
+        """score_utterance's summary for the words finalized so far (complete after finish())."""
+        total_expected = len(self._align.expected)
+        if self._n_actual:
+            duration_s = max(0.001, self._last_end - self._first_start)
+            wpm = (self._n_actual / duration_s) * 60.0
+            avg_pause = self._pauses.mean if self._pauses.n else 0.0
+        else:
+            duration_s = wpm = avg_pause = 0.0
+        f0 = self._f0_rel if self._f0_rel.n else self._f0_all
+        energy = self._energy_rel if self._energy_rel.n else self._energy_all
+        return {
+            "expected_words": total_expected,
+            "correct_words": self._correct,
+            "word_accuracy": round(float(self._correct) / total_expected if total_expected > 0 else 0.0, 3),
+            "wpm": round(wpm, 1),
+            "avg_pause_s": round(avg_pause, 3),
+            "utterance_duration_s": round(duration_s, 3),
+            "prosody": {
+                "avg_f0_hz": round(f0.mean if f0.n else 0.0, 1),
+                "f0_std_hz_over_words": round(f0.std, 1),
+                "avg_energy_db": round(energy.mean if energy.n else -120.0, 3),
+                "prosody_coverage": round(self._n_reliable / max(1, self._n_prosody), 3)
+            }
+        }
+
+    def stats(self) -> Dict:
+        return {
+            "audio_s": round(self._n_samples / self.sr, 3),
+            "frames": self._n_frames,
+            "frames_held": self._n_frames - self._frame_base,
+            "samples_held": int(self._audio.size),
+            "words_in": self._n_actual,
+            "words_out": sum(1 for r in self.per_word if r["actual_idx"] is not None),
+            "pending": len(self._queue) + len(self._align.pending),
+        }
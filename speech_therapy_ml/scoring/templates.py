@@ -0,0 +1,170 @@
+"""
+speech_therapy_ml/scoring/templates.py
+
+TemplateBank:
+  - Reference MFCC templates for the exercise words, built offline (Azure TTS or recorded wavs) so
+    acoustic scoring never synthesizes speech on the request path
+  - Two files: <path>.npy holds every template's frames back to back, (total_frames, n_mfcc) float32,
+    opened with mmap_mode="r" (pages are read on first use and shared between processes);
+    <path>.json maps word -> [[offset, n_frames], ...] plus the feature settings and the score scale
+  - Templates use the scorer's framing (FeatureFrames, frame 2048 / hop 256) and cepstral mean
+    normalization, so a word slice of the utterance MFCC compares directly against them
+  - .acoustic_score(word, mfcc_slice) -> exp(-min DTW distance / scale) in (0, 1], or None when the
+    word has no template; scale is the median distance between templates of different words
+
+Build (once per exercise-bank change; run from speech_therapy_ml/):
+  python -m scoring.build_templates --tts                      # Azure TTS, AZURE_SPEECH_KEY / AZURE_REGION
+  python -m scoring.build_templates --wav-dir refs/            # refs/<word>.wav, refs/<word>-<n>.wav
+  python -m scoring.build_templates --tts --words zebra tiger --out models/templates
+
+Usage:
+  bank = TemplateBank.load("models/templates")
+  s, e = ff.frame_range(0.42, 0.91)
+  bank.acoustic_score("sheep", ff.mfcc()[:, s:e])
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .dtw import dtw_min
+
+DEFAULT_BANK_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "models", "templates")
+BANK_VERSION = 1
+N_MFCC = 13
+FRAME_LENGTH = 2048
+HOP_LENGTH = 256
+
+
+def normalize_mfcc(mfcc: np.ndarray) -> np.ndarray:
+    """Cepstral mean normalization over the word: removes the channel / speaker offset shared by all frames."""
+    m = np.asarray(mfcc, dtype=np.float32)
+    return m - m.mean(axis=1, keepdims=True)
+
+
+def reference_mfcc(y: np.ndarray, sr: int, top_db: float = 30.0) -> np.ndarray:
+    """Template features of one reference recording: silence-trimmed, scorer framing, (n_mfcc, n_frames)."""
+    from .features import FeatureFrames
+    import librosa
+    y = np.asarray(y, dtype=np.float32)
+    if sr != 16000:
+        y, sr = librosa.resample(y, orig_sr=sr, target_sr=16000), 16000
+    y, _ = librosa.effects.trim(y, top_db=top_db)
+    return normalize_mfcc(FeatureFrames(y, sr, frame_length=FRAME_LENGTH, hop_length=HOP_LENGTH).mfcc(N_MFCC))
+
+
+class TemplateBank:
+    def __init__(self, data: np.ndarray, words: Dict[str, List[Tuple[int, int]]], scale: float, path: Optional[str] = None):
+        self.data = data
+        self.words = words
+        self.scale = scale
+        self.path = path
+        self._counters = {"scored": 0, "missing": 0}
+
+    @staticmethod
+    def _paths(path: str) -> Tuple[str, str]:
+        base = os.path.splitext(path)[0] if path.endswith((".npy", ".json")) else path
+        return base + ".npy", base + ".json"
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_BANK_PATH) -> Optional["TemplateBank"]:
+        """Memory-map a built bank; None if it has not been built."""
+        npy, meta_path = cls._paths(path)
+        if not (os.path.exists(npy) and os.path.exists(meta_path)):
+            return None
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        if meta.get("version") != BANK_VERSION or meta.get("n_mfcc") != N_MFCC or meta.get("hop_length") != HOP_LENGTH:
+            print(f"[templates] {meta_path} was built with other settings; rebuild it")
+            return None
+        words = {w: [tuple(span) for span in spans] for w, spans in meta["words"].items()}
+        return cls(np.load(npy, mmap_mode="r"), words, float(meta["scale"]), path)
+
+    @classmethod
+    def build(cls, templates: Dict[str, List[np.ndarray]], path: str = DEFAULT_BANK_PATH) -> "TemplateBank":
+        """Write word -> list of (n_mfcc, n_frames) templates and return the memory-mapped bank."""
+        npy, meta_path = cls._paths(path)
+        os.makedirs(os.path.dirname(os.path.abspath(npy)), exist_ok=True)
+        words: Dict[str, List[Tuple[int, int]]] = {}
+        chunks, offset = [], 0
+        for word in sorted(templates):
+            for m in templates[word]:
+                n = int(m.shape[1])
+                if n == 0:
+                    continue
+                chunks.append(np.ascontiguousarray(m.T, dtype=np.float32))
+                words.setdefault(word, []).append((offset, n))
+                offset += n
+        data = np.concatenate(chunks) if chunks else np.zeros((0, N_MFCC), dtype=np.float32)
+        bank = cls(data, words, 1.0)
+        bank.scale = bank._calibrate()
+        np.save(npy, data)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump({"version": BANK_VERSION, "n_mfcc": N_MFCC, "sr": 16000, "frame_length": FRAME_LENGTH,
+                       "hop_length": HOP_LENGTH, "scale": bank.scale, "words": words}, f)
+        return cls.load(path)
+
+    def _calibrate(self, max_pairs: int = 2000) -> float:
+        """Median DTW distance between templates of different words (a clear mismatch scores ~exp(-1))."""
+        from .scorer import dtw_distance
+        firsts = [self.templates(w)[0] for w in sorted(self.words)]
+        dists = []
+        for i in range(len(firsts)):
+            for j in range(i + 1, len(firsts)):
+                dists.append(dtw_distance(firsts[i], firsts[j]))
+                if len(dists) >= max_pairs:
+                    break
+            if len(dists) >= max_pairs:
+                break
+        return float(np.median(dists)) if dists else 1.0
+
+    def __contains__(self, word: str) -> bool:
+        return word in self.words
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def templates(self, word: str) -> List[np.ndarray]:
+        """(n_mfcc, n_frames) views into the mapped file, one per reference of word."""
+        return [self.data[off:off + n].T for off, n in self.words.get(word, ())]
+
+    def distance(self, word: str, mfcc: np.ndarray) -> Optional[float]:
+        """Smallest normalized DTW distance between mfcc (already normalize_mfcc'ed) and word's templates."""
+        refs = self.templates(word)
+        if not refs or mfcc.shape[1] == 0:
+            return None
+        # all of the word's templates in one batched wavefront, LB_Keogh-ordered with early abandon
+        return dtw_min(refs, mfcc)[1]
+
+    def acoustic_score(self, word: str, mfcc_slice: np.ndarray) -> Optional[float]:
+        d = self.distance(word, normalize_mfcc(mfcc_slice))
+        if d is None:
+            self._counters["missing"] += 1
+            return None
+        self._counters["scored"] += 1
+        return float(np.exp(-d / max(self.scale, 1e-6)))
+
+    def stats(self) -> Dict:
+        out = dict(self._counters)
+        out["words"] = len(self.words)
+        out["frames"] = int(self.data.shape[0])
+        out["path"] = self.path
+        return out
+
+
+def exercise_words(extra: Iterable[str] = ()) -> List[str]:
+    """Unique expected words of interactive/state.EXERCISES plus extra, in first-seen order."""
+    from interactive.state import EXERCISES
+    from .scorer import tokens_from_text
+    seen: Dict[str, None] = {}
+    for ex in EXERCISES:
+        for w in tokens_from_text(ex["expected_text"]):
+            seen.setdefault(w, None)
+    for w in extra:
+        for t in tokens_from_text(w):
+            seen.setdefault(t, None)
+    return list(seen)
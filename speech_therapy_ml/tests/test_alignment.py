@@ -0,0 +1,29 @@
+"""
+simple_word_alignment on reading-passage lengths.
+
+Run from speech_therapy_ml/:
+  python -m pytest tests/test_alignment.py
+
+A story passage repeats its common words ("the", "a", "and") far more than 1% of the time. From 200
+actual words on, difflib's autojunk heuristic would treat them as junk and never match them, so the
+alignment of a whole page collapses.
+"""
+
+import numpy as np
+
+from scoring.scorer import simple_word_alignment
+
+VOCAB = ("once upon a time there was a little fox who lived by the river and every morning "
+         "she ran along the bank to look for fish in the cold clear water").split()
+
+
+def test_long_reading_matches_every_read_word():
+    expected = [VOCAB[i] for i in np.random.default_rng(0).integers(0, len(VOCAB), 600)]
+    actual = [w for k, w in enumerate(expected) if k % 20 != 7]  # the reader skips every 20th word
+    out = simple_word_alignment(expected, actual)
+    equal = [e for e in out if e["op"] == "equal"]
+    assert len(equal) == len(actual)
+    assert [e["actual_idx"] for e in equal] == list(range(len(actual)))
+    assert all(e["expected"] == e["actual"] for e in equal)
+    assert sum(e["op"] == "delete" for e in out) == 600 - len(actual)
+    assert not [e for e in out if e["op"] in ("replace", "insert")]
@@ -0,0 +1,75 @@
+"""
+scoring/dtw.py against librosa.sequence.dtw, the implementation it replaced (D[-1, -1] / path length).
+
+Run from speech_therapy_ml/:
+  python -m pytest tests/test_dtw.py
+
+Random MFCC-like pairs, plus binary 1-D pairs where most cells tie, so the tie-break has to prefer
+the (1,1) step over (0,1) / (1,0) as librosa does for the path length to come out equal (any other
+order misses on most of the tie pairs).
+Both engines are checked: the numba row kernel (dtw_cost) and the NumPy wavefront fallback.
+"""
+
+import numpy as np
+import pytest
+
+from scoring import dtw
+
+librosa = pytest.importorskip("librosa")
+
+RTOL = 1e-9
+
+
+def _librosa_distance(ref, test):
+    D, wp = librosa.sequence.dtw(X=ref, Y=test, metric="euclidean")
+    return float(D[-1, -1]) / len(wp)
+
+
+def _pairs(seed: int, ties: bool, count: int = 40):
+    rng = np.random.default_rng(seed)
+    out = []
+    for _ in range(count):
+        m, n = rng.integers(1, 40, 2)
+        if ties:  # few distinct values: equal costs and equal-cost predecessors everywhere
+            ref, test = rng.integers(0, 2, (1, m)).astype(np.float64), rng.integers(0, 2, (1, n)).astype(np.float64)
+        else:
+            ref, test = rng.normal(0, 10, (13, m)), rng.normal(0, 10, (13, n))
+        out.append((ref, test))
+    return out
+
+
+def _wavefront(ref, test):
+    # what _pair runs when numba is missing: longer sequence on the rows, tie order swapped if transposed
+    if ref.shape[1] < test.shape[1]:
+        return float(dtw._wavefront(test[None], np.array([test.shape[1]]), ref, None, np.inf, up_first=True)[0])
+    return float(dtw._wavefront(ref[None], np.array([ref.shape[1]]), test, None, np.inf)[0])
+
+
+@pytest.mark.parametrize("ties", [False, True], ids=["random", "ties"])
+def test_numba_kernel_matches_librosa(ties):
+    if dtw._kernels()[0] is None:
+        pytest.skip("numba not available")
+    for ref, test in _pairs(0, ties):
+        expect = _librosa_distance(ref, test)
+        assert dtw.dtw_cost(ref, test) == pytest.approx(expect, rel=RTOL, abs=1e-12)
+
+
+@pytest.mark.parametrize("ties", [False, True], ids=["random", "ties"])
+def test_wavefront_matches_librosa(ties):
+    for ref, test in _pairs(1, ties):
+        expect = _librosa_distance(ref, test)
+        assert _wavefront(ref, test) == pytest.approx(expect, rel=RTOL, abs=1e-12)
+
+
+@pytest.mark.parametrize("ties", [False, True], ids=["random", "ties"])
+def test_batched_wavefront_matches_librosa(ties, monkeypatch):
+    # dtw_many / dtw_min without numba: every template in one zero-padded wavefront
+    monkeypatch.setattr(dtw, "_KERNELS", (None, dtw._lb_pair))
+    pairs = _pairs(2, ties, count=12)
+    test = pairs[0][1]
+    refs = [ref for ref, _ in pairs]
+    expect = np.array([_librosa_distance(ref, test) for ref in refs])
+    np.testing.assert_allclose(dtw.dtw_many(refs, test), expect, rtol=RTOL, atol=1e-12)
+    best_idx, best = dtw.dtw_min(refs, test)
+    assert expect[best_idx] == pytest.approx(expect.min(), rel=RTOL, abs=1e-12)
+    assert best == pytest.approx(expect.min(), rel=RTOL, abs=1e-12)
@@ -0,0 +1,27 @@
+"""
+Cold-start import budget of the service modules (the check behind python -m benchmarks.import_time).
+
+Run from speech_therapy_ml/:
+  python -m pytest tests/test_import_time.py
+
+Each module is imported in a fresh interpreter. A module whose own dependencies are missing in this
+environment is skipped; over budget, or pulling in a heavy runtime dependency at import, fails.
+"""
+
+import os
+
+import pytest
+
+from benchmarks.import_time import DEFAULT_MODULES, measure
+
+BUDGET_MS = float(os.getenv("IMPORT_BUDGET_MS", "1000"))
+
+
+@pytest.mark.parametrize("module", DEFAULT_MODULES)
+def test_import_budget(module):
+    res, err = measure(module)
+    if res is None:
+        pytest.skip(f"cannot import here: {err}")
+    assert not res["loaded"], f"{module} imports heavy dependencies eagerly: {', '.join(res['loaded'])}"
+    slowest = ", ".join(f"{name} {us / 1000:.0f} ms" for us, name in res["top"][:3])
+    assert res["wall_ms"] <= BUDGET_MS, f"{module} took {res['wall_ms']:.0f} ms to import (budget {BUDGET_MS:.0f}); slowest: {slowest}"
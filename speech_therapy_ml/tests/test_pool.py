@@ -0,0 +1,111 @@
+"""
+ScorerPool failure handling: a dead worker, a hung worker, per-item errors in score_batch.
+
+Run from speech_therapy_ml/:
+  python -m pytest tests/test_pool.py
+
+Failures are injected through time_map, which score_utterance calls inside the worker: _Exit kills
+the worker process, _Sleep hangs it, _Raise fails just that attempt. The classes live in this module
+so the spawned workers can unpickle them.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+import pytest
+
+from scoring.pool import ScorerPool
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+AUDIO = np.random.default_rng(0).normal(0.0, 0.01, 16000).astype(np.float32)
+ALIGNED = {"segments": [{"words": [{"word": "hello", "start": 0.1, "end": 0.6, "score": 0.9}]}]}
+RESULT_S = 120  # first attempt on a fresh worker pays for imports
+
+
+class _Exit:
+    def __call__(self, t, end=False):
+        os._exit(1)
+
+
+class _Sleep:
+    def __call__(self, t, end=False):
+        time.sleep(3600)
+
+
+class _Raise:
+    def __call__(self, t, end=False):
+        raise ValueError("bad time map")
+
+
+def _item(time_map=None):
+    return {"expected_text": "hello", "aligned_result": ALIGNED, "audio_np": AUDIO, "audio_sr": 16000,
+            "time_map": time_map}
+
+
+def _gone(pid: int, timeout: float = 10.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return True
+        time.sleep(0.1)
+    return False
+
+
+@pytest.fixture
+def pool(request):
+    p = ScorerPool(1, attempt_timeout_s=getattr(request, "param", None))
+    yield p
+    p.close(wait=False)
+
+
+def test_dead_worker_fails_only_the_running_attempt(pool):
+    futures = [pool.submit(**_item()), pool.submit(**_item(_Exit())), pool.submit(**_item()), pool.submit(**_item())]
+    assert "summary" in futures[0].result(timeout=RESULT_S)
+    with pytest.raises(BrokenProcessPool):
+        futures[1].result(timeout=RESULT_S)
+    for fut in futures[2:]:  # queued behind it: resubmitted to the replacement
+        assert "summary" in fut.result(timeout=RESULT_S)
+    stats = pool.stats()
+    assert stats["restarts"] == 1 and stats["failed"] == [1] and stats["in_flight"] == [0]
+
+
+# long enough for the replacement worker's first attempt (lazy imports, compiles)
+@pytest.mark.parametrize("pool", [8.0], indirect=True)
+def test_hung_worker_is_killed_after_the_timeout(pool):
+    pid = pool.worker_stats(timeout=RESULT_S)[0]["pid"]
+    hung, queued = pool.submit(**_item(_Sleep())), pool.submit(**_item())
+    with pytest.raises(TimeoutError):
+        hung.result(timeout=RESULT_S)
+    assert "summary" in queued.result(timeout=RESULT_S)
+    assert _gone(pid), f"hung worker {pid} is still running"
+    assert pool.worker_stats(timeout=RESULT_S)[0]["pid"] != pid
+    assert pool.stats()["timeouts"] == 1
+
+
+def test_interpreter_exits_after_a_timeout():
+    # the old executor's manager thread must not keep waiting on the hung process at exit
+    code = ("from test_pool import ScorerPool, _Sleep, _item\n"
+            "pool = ScorerPool(1, attempt_timeout_s=2.0)\n"
+            "try:\n"
+            "    pool.submit(**_item(_Sleep())).result(timeout=120)\n"
+            "except TimeoutError:\n"
+            "    pass\n"
+            "pool.close()\n")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.path.join(ROOT, "tests"),
+                                                                     os.environ.get("PYTHONPATH")])))
+    proc = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, timeout=180, capture_output=True)
+    assert proc.returncode == 0, proc.stderr.decode(errors="replace")[-2000:]
+
+
+def test_score_batch_keeps_errors_in_their_slots(pool):
+    bad_audio = dict(_item(), audio_np=[object()])  # fails in submit, before reaching a worker
+    results = pool.score_batch([_item(), bad_audio, _item(_Raise()), _item()])
+    assert "summary" in results[0] and "summary" in results[3]
+    assert isinstance(results[1], Exception)
+    assert isinstance(results[2], ValueError) and "bad time map" in str(results[2])
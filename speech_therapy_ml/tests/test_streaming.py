@@ -0,0 +1,81 @@
+"""
+StreamingScorer against Scorer.score_utterance on a short synthetic reading (the check behind
+python -m benchmarks.streaming, without the recording).
+
+Run from speech_therapy_ml/:
+  python -m pytest tests/test_streaming.py
+
+A harmonic tone with a gliding F0 and per-word loudness stands in for speech; one word is skipped
+and one misread. Audio is fed in 100 ms chunks and each word's alignment arrives 0.3 s after it
+ends. Alignment, timings, energy and the summary must match batch scoring; pitch is tracked per
+block when streaming, so F0 only has to agree closely (stress uses the running energy range and
+is not compared).
+"""
+
+import numpy as np
+import pytest
+
+from scoring.scorer import Scorer, ScorerConfig
+
+SR = 16000
+WORDS = "the little fox ran along the bank to look for fish".split()
+STEP_S = 0.4
+CHUNK = SR // 10
+WORD_LAG_S = 0.3
+F0_HZ_TOL = 2.0
+
+
+def _reading():
+    t = np.arange(int(SR * (len(WORDS) * STEP_S + 0.3))) / SR
+    phase = 2 * np.pi * np.cumsum(140 + 25 * np.sin(2 * np.pi * 0.7 * t)) / SR
+    env = np.zeros_like(t)
+    aligned = []
+    for i, w in enumerate(WORDS):
+        start, end = i * STEP_S + 0.05, i * STEP_S + 0.35
+        env[(t >= start) & (t < end)] = 0.2 + 0.1 * (i % 3)
+        if i == 4:
+            continue  # skipped
+        aligned.append({"word": "a" if i == 7 else w, "start": round(start, 3), "end": round(end, 3), "score": 0.9})
+    audio = env * sum(np.sin(k * phase) / k for k in range(1, 6))
+    audio += np.random.default_rng(0).normal(0, 1e-3, len(audio))
+    return " ".join(WORDS), aligned, audio.astype(np.float32)
+
+
+def test_finish_matches_score_utterance():
+    expected, words, audio = _reading()
+    scorer = Scorer(sample_rate=SR, cfg=ScorerConfig(pitch_backend="nccf"))
+    batch = scorer.score_utterance(expected, {"segments": [{"words": words}]}, audio, SR)
+
+    stream = scorer.stream(expected, audio_sr=SR)
+    emitted, nxt = [], 0
+    for pos in range(0, len(audio), CHUNK):
+        fed_s = min(len(audio), pos + CHUNK) / SR
+        new = []
+        while nxt < len(words) and words[nxt]["end"] + WORD_LAG_S <= fed_s:
+            new.append(words[nxt])
+            nxt += 1
+        emitted += stream.feed(audio[pos:pos + CHUNK], new)
+    assert emitted, "no word record was emitted before the end of the audio"
+    stream.feed(words=words[nxt:])
+    result = stream.finish()
+
+    b, s = batch["per_word"], result["per_word"]
+    assert s[:len(emitted)] == emitted
+    assert len(s) == len(b)
+    for rb, rs in zip(b, s):
+        for key in ("op", "expected_idx", "expected", "actual_idx", "actual", "start", "end"):
+            assert rs[key] == rb[key], (key, rb, rs)
+        pb, ps = rb["prosody"], rs["prosody"]
+        assert ps["energy_db_mean"] == pb["energy_db_mean"]
+        if pb["f0_mean_hz"] is None:
+            assert ps["f0_mean_hz"] is None
+        else:
+            assert ps["f0_mean_hz"] == pytest.approx(pb["f0_mean_hz"], abs=F0_HZ_TOL)
+
+    sb, ss = batch["summary"], result["summary"]
+    for key in ("expected_words", "correct_words", "word_accuracy", "wpm", "avg_pause_s", "utterance_duration_s"):
+        assert ss[key] == sb[key], key
+    for key in ("avg_energy_db", "prosody_coverage"):
+        assert ss["prosody"][key] == sb["prosody"][key], key
+    for key in ("avg_f0_hz", "f0_std_hz_over_words"):
+        assert ss["prosody"][key] == pytest.approx(sb["prosody"][key], abs=F0_HZ_TOL), key